@@ -3,28 +3,44 @@
 ABCDBET Customer Service Bot - Bot de atendimento ao cliente
 """
 
+import asyncio
+import functools
 import logging
+import os
+import re
 import sys
-import importlib
+import itertools
 import signal
-from datetime import datetime
-from typing import Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from string import Template
+from typing import Optional, Tuple
 from telegram import (  # pyright: ignore[reportMissingImports]
     Update, InlineKeyboardButton, InlineKeyboardMarkup, BotCommand, Bot, BotCommandScopeChat
 )
 from telegram.constants import ParseMode
+from telegram.error import BadRequest, RetryAfter
+from telegram.request import HTTPXRequest
 from telegram.ext import (  # pyright: ignore[reportMissingImports]
     Application, CommandHandler, CallbackQueryHandler,
     ContextTypes, MessageHandler, filters
 )
 import bot_config
 
+try:
+    import orjson  # Tùy chọn: parse JSON phản hồi của Bot API nhanh hơn
+except ImportError:
+    orjson = None
+
 from google_sheets import GoogleSheetsManager
 from notification_system import (
     init_notification_system, get_notification_manager
 )
 from bulk_messaging import BulkMessagingManager
 from scheduled_forward import ScheduledForwardManager
+from utils.cache import TTLDict
+from utils.rate_limiter import AsyncTokenBucket
 # from form_builder import get_form_builder
 # from ecosystem_integration import (
 #     init_ecosystem_integration, get_ecosystem_manager
@@ -37,72 +53,492 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Số kết nối HTTP giữ sẵn tới Bot API (phải >= số request forward chạy song song)
+TELEGRAM_CONNECTION_POOL_SIZE = 64
+
+
+class OrjsonHTTPXRequest(HTTPXRequest):
+    """HTTPXRequest dùng orjson để parse phản hồi của Bot API"""
+
+    @staticmethod
+    def parse_json_payload(payload: bytes):
+        try:
+            return orjson.loads(payload)
+        except orjson.JSONDecodeError:
+            # Để bản gốc xử lý payload lỗi (log + TelegramError)
+            return HTTPXRequest.parse_json_payload(payload)
+
+
+def make_telegram_request(**kwargs):
+    """Tạo request object cho Bot API, dùng orjson nếu đã được cài đặt"""
+    request_class = OrjsonHTTPXRequest if orjson else HTTPXRequest
+    return request_class(**kwargs)
+
+
 # Inicializar managers
 sheets_manager = GoogleSheetsManager()
 # Khởi tạo bot và bulk messaging manager
-bot = Bot(token=bot_config.TELEGRAM_TOKEN)
+bot = Bot(
+    token=bot_config.TELEGRAM_TOKEN,
+    request=make_telegram_request(connection_pool_size=TELEGRAM_CONNECTION_POOL_SIZE)
+)
 bulk_messaging_manager = BulkMessagingManager(bot, sheets_manager)
 scheduled_forward_manager = ScheduledForwardManager(bot, sheets_manager)
 # form_builder = get_form_builder()
 
+# Giới hạn state tạm theo user: tối đa USER_STATE_MAX_SIZE user, hết hạn sau USER_STATE_TTL giây
+USER_STATE_MAX_SIZE = 10000
+USER_STATE_TTL = 86400
+
 # Armazenamento temporário de dados
-user_data = {}
+user_data = TTLDict(max_size=USER_STATE_MAX_SIZE, ttl=USER_STATE_TTL)
+
+# State chờ xác nhận/hẹn giờ của admin (str(user_id) -> dict), tự hết hạn sau PENDING_STATE_TTL giây
+PENDING_STATE_TTL = 600
+_PENDING_FORWARDS = TTLDict(max_size=USER_STATE_MAX_SIZE, ttl=PENDING_STATE_TTL)
+_SCHEDULE_MESSAGES = TTLDict(max_size=USER_STATE_MAX_SIZE, ttl=PENDING_STATE_TTL)
 
 # Biến global để lưu trữ application
 current_application = None
 
-# Biến global để lưu trữ kênh được chọn cho từng admin
-admin_selected_channels = {}
+# Cờ yêu cầu restart, main() kiểm tra sau khi run_polling kết thúc
+_RESTART_REQUESTED = False
+
+# Hàng đợi ghi tương tác người dùng vào Google Sheets (xử lý nền theo lô)
+_LOG_QUEUE = asyncio.Queue(maxsize=10000)
+LOG_BATCH_SIZE = 100
+LOG_FLUSH_INTERVAL = 2.0
+
+# Biến global để lưu trữ kênh được chọn cho từng admin (str(user_id) -> set kênh)
+admin_selected_channels = TTLDict(max_size=USER_STATE_MAX_SIZE, ttl=USER_STATE_TTL)
+
+# Snapshot FORWARD_CHANNELS (tuple + frozenset + số lượng + danh sách dạng text), làm mới khi thêm/xóa kênh
+_FORWARD_CHANNELS = ()
+_FORWARD_CHANNELS_SET = frozenset()
+_FORWARD_CHANNELS_COUNT = 0
+_FORWARD_CHANNELS_TEXT = ''
+# Số kênh tối đa liệt kê trong một tin nhắn (Telegram giới hạn 4096 ký tự)
+CHANNEL_LIST_LIMIT = 50
 
 # Biến global để lưu trữ trạng thái chọn kênh
-channel_selection_state = {}
+channel_selection_state = TTLDict(max_size=USER_STATE_MAX_SIZE, ttl=USER_STATE_TTL)
+
+# Số request forward chạy song song (Telegram giới hạn ~30 tin nhắn/giây)
+CUSTOMER_FORWARD_CONCURRENCY = 30
+CHANNEL_FORWARD_CONCURRENCY = 5
+
+# Số luồng của executor mặc định (asyncio.to_thread) dùng cho các lệnh gọi Google Sheets đồng bộ
+SHEETS_EXECUTOR_WORKERS = 16
+
+# Giới hạn tốc độ gửi: toàn bot 28 tin nhắn/giây (chừa khoảng trống dưới mức 30 của Telegram), mỗi chat 1 tin nhắn/giây
+_GLOBAL_LIMITER = AsyncTokenBucket(28, 1.0)
+# Limiter theo chat trong TTLDict: chat im lặng quá PER_CHAT_LIMITER_TTL giây bị xóa (bucket đã đầy lại từ lâu)
+PER_CHAT_LIMITER_TTL = 60
+_PER_CHAT_LIMITERS = TTLDict(max_size=100000, ttl=PER_CHAT_LIMITER_TTL)
+FORWARD_MAX_RETRIES = 3
+
+# Hàng đợi gửi tin nhắn hàng loạt: callback đưa từng người nhận vào, một worker duy nhất gửi lần lượt.
+# Nhịp gửi chỉ đặt ở đây, giữ như bản gửi tuần tự trước đây: tối đa BULK_BATCH_LIMIT người nhận mỗi lần gửi,
+# mỗi tin cách nhau BULK_SEND_INTERVAL giây (chạy lại để gửi tiếp phần còn lại)
+_BULK_SEND_QUEUE = asyncio.Queue(maxsize=10000)
+BULK_BATCH_LIMIT = 20
+BULK_SEND_INTERVAL = 4.0
+_BULK_LIMITER = AsyncTokenBucket(1, BULK_SEND_INTERVAL)
+_BULK_SEND_STATS = {'queued': 0, 'sent': 0, 'failed': 0, 'skipped': 0}
+
+# Hàng đợi forward tin nhắn của admin đến khách hàng: (job_id, chat_id, from_chat_id, message_id)
+_FORWARD_QUEUE = asyncio.Queue(maxsize=10000)
+FORWARD_WORKERS = 30
+
+# Thống kê theo từng đợt gửi template (job_id -> bộ đếm), tiến độ được cập nhật vào tin nhắn của admin
+_BROADCAST_JOBS = TTLDict(max_size=1000, ttl=86400)
+_BROADCAST_SEQ = itertools.count(1)
+BULK_PROGRESS_INTERVAL = 3.0
+
+# Hàng đợi edit tin nhắn từ nút bấm: khóa (chat_id, message_id), nội dung mới nhất nằm trong _PENDING_EDITS
+# (edit mới thay edit cũ chưa gửi của cùng tin nhắn); EDIT_WORKERS worker gửi qua rate limiter
+_EDIT_QUEUE = asyncio.Queue()
+_PENDING_EDITS = {}
+EDIT_WORKERS = 4
+
+# Hash (text, markup) của lần sửa tin nhắn gần nhất theo (chat_id, message_id), bỏ qua lần sửa không đổi
+_LAST_EDITS = TTLDict(max_size=10000, ttl=3600)
+
+# Chuỗi thời gian hiện tại, chỉ format lại khi sang giây mới
+_NOW_CACHE = {'t': 0, 's': ''}
+
+# Cache tên hiển thị của kênh (xóa khi danh sách kênh thay đổi)
+_CHANNEL_DISPLAY_CACHE = {}
+
+# Cache template tin nhắn: (thời điểm hết hạn, tuple template); bot không sửa template nên chỉ hết hạn theo TTL
+TEMPLATES_CACHE_TTL = 300
+_TEMPLATES_CACHE = None
+
+# Snapshot danh sách khách hàng dùng chung cho các lần gửi hàng loạt; lock để chỉ một coroutine đọc Sheets
+CUSTOMERS_CACHE_TTL = 60
+_CUSTOMERS_CACHE = {'value': None, 'ts': 0.0}
+_CUSTOMERS_LOCK = asyncio.Lock()
+
+# Cache thống kê khách hàng (giới hạn số lần gọi Google Sheets)
+STATS_CACHE_TTL = 30
+_STATS_CACHE = {'value': None, 'ts': 0.0}
+
+# callback_query.id đã xử lý trong 60 giây gần nhất (Telegram gửi lại / user bấm liên tiếp)
+_SEEN_CALLBACK_IDS = TTLDict(max_size=65536, ttl=60)
+
+# Cache danh sách lịch hẹn giờ theo ('list', user_id) (đọc file JSON), xóa khi có lịch mới
+SCHEDULE_CACHE_TTL = 15
+_SCHEDULE_CACHE = TTLDict(max_size=1000, ttl=SCHEDULE_CACHE_TTL)
+
+# Snapshot thống kê lịch hẹn giờ, làm mới nền mỗi SCHEDULE_STATS_REFRESH_INTERVAL giây
+SCHEDULE_STATS_REFRESH_INTERVAL = 5
+_SCHEDULE_STATS_SNAPSHOT = None
+
+# Tập admin ID dạng int cho kiểm tra quyền O(1) trên mỗi update (ID dạng chuỗi thì so bằng int(user_id))
+ADMIN_USER_IDS_SET = frozenset(bot_config.ADMIN_USER_IDS)
+
+
+def _unique_channels(channels):
+    """Chuẩn hóa ID kênh (số -> int, username giữ nguyên) và bỏ trùng, giữ thứ tự"""
+    normalized = []
+    for channel in channels:
+        channel = str(channel).strip()
+        normalized.append(int(channel) if channel.lstrip('-').isdigit() else channel)
+    unique = tuple(dict.fromkeys(normalized))
+    if len(unique) != len(normalized):
+        logger.debug("Gộp kênh trùng: %d -> %d", len(normalized), len(unique))
+    return unique
+
+
+def _channel_bullets(channels, limit=CHANNEL_LIST_LIMIT):
+    """Danh sách kênh dạng '• kênh', tối đa limit dòng, phần còn lại gộp thành một dòng '+N kênh khác'"""
+    text = '\n'.join(f'• {ch}' for ch in channels[:limit])
+    if len(channels) > limit:
+        text += f'\n• ... +{len(channels) - limit} kênh khác'
+    return text
 
 
-def get_admin_selected_channels(user_id: int) -> list:
-    """Lấy danh sách kênh được chọn của admin"""
-    return admin_selected_channels.get(str(user_id), [])
+def refresh_forward_channels():
+    """Đọc lại FORWARD_CHANNELS từ bot_config vào snapshot"""
+    global _FORWARD_CHANNELS, _FORWARD_CHANNELS_SET, _FORWARD_CHANNELS_COUNT, _FORWARD_CHANNELS_TEXT
+    # Bỏ kênh trùng trong cấu hình (giữ thứ tự) để không forward hai lần
+    _FORWARD_CHANNELS = tuple(dict.fromkeys(getattr(bot_config, 'FORWARD_CHANNELS', [])))
+    _FORWARD_CHANNELS_SET = frozenset(_FORWARD_CHANNELS)
+    _FORWARD_CHANNELS_COUNT = len(_FORWARD_CHANNELS)
+    _FORWARD_CHANNELS_TEXT = '\n'.join(f'- {c}' for c in _FORWARD_CHANNELS)
 
 
-def set_admin_selected_channels(user_id: int, channels: list):
-    """Đặt danh sách kênh được chọn cho admin"""
-    admin_selected_channels[str(user_id)] = channels
+def set_forward_channels(channels):
+    """Cập nhật FORWARD_CHANNELS trong bot_config và snapshot"""
+    setattr(bot_config, 'FORWARD_CHANNELS', list(channels))
+    refresh_forward_channels()
+    _CHANNEL_DISPLAY_CACHE.clear()
+
+
+refresh_forward_channels()
+
+
+def get_admin_selected_channels(user_id: int) -> set:
+    """Lấy tập kênh được chọn của admin"""
+    return admin_selected_channels.get(str(user_id), set())
+
+
+def set_admin_selected_channels(user_id: int, channels):
+    """Đặt tập kênh được chọn cho admin"""
+    admin_selected_channels[str(user_id)] = set(channels)
 
 
 def toggle_channel_selection(user_id: int, channel_id: str):
     """Chuyển đổi trạng thái chọn kênh"""
-    current_channels = get_admin_selected_channels(user_id)
+    current_channels = admin_selected_channels.setdefault(str(user_id), set())
 
     if channel_id in current_channels:
-        current_channels.remove(channel_id)
+        current_channels.discard(channel_id)
     else:
-        current_channels.append(channel_id)
+        current_channels.add(channel_id)
 
-    set_admin_selected_channels(user_id, current_channels)
     return current_channels
 
 
 def select_all_channels(user_id: int):
     """Chọn tất cả kênh"""
-    all_channels = getattr(bot_config, 'FORWARD_CHANNELS', [])
-    set_admin_selected_channels(user_id, all_channels.copy())
+    all_channels = _FORWARD_CHANNELS
+    set_admin_selected_channels(user_id, all_channels)
     return all_channels
 
 
 def deselect_all_channels(user_id: int):
     """Bỏ chọn tất cả kênh"""
-    set_admin_selected_channels(user_id, [])
-    return []
+    set_admin_selected_channels(user_id, ())
+    return set()
+
+
+def _chat_limiter(chat_id):
+    """Token bucket 1 tin nhắn/giây của chat_id, tạo khi cần và gia hạn TTL mỗi lần dùng"""
+    try:
+        limiter = _PER_CHAT_LIMITERS[chat_id]
+    except KeyError:
+        limiter = AsyncTokenBucket(1, 1.0)
+    _PER_CHAT_LIMITERS[chat_id] = limiter
+    return limiter
+
+
+async def _rate_limited_call(chat_id, send, **kwargs):
+    """await send(**kwargs) qua rate limiter toàn bot và theo chat_id, tự chờ và thử lại khi Telegram trả về RetryAfter"""
+    for attempt in range(FORWARD_MAX_RETRIES + 1):
+        async with _chat_limiter(chat_id), _GLOBAL_LIMITER:
+            try:
+                return await send(**kwargs)
+            except RetryAfter as e:
+                if attempt >= FORWARD_MAX_RETRIES:
+                    raise
+                retry_after = e.retry_after
+                if hasattr(retry_after, 'total_seconds'):
+                    retry_after = retry_after.total_seconds()
+                logger.warning("RetryAfter khi gửi đến %s, chờ %s giây", chat_id, retry_after)
+        await asyncio.sleep(retry_after)
+
+
+async def _rate_limited_forward(bot_instance, chat_id, from_chat_id, message_id, copy=False):
+    """forward_message (hoặc copy_message nếu copy=True) qua rate limiter, tự chờ và thử lại khi Telegram trả về RetryAfter
+
+    copy_message giữ nguyên nội dung và entities (kể cả emoji động) nhưng không kèm header "Forwarded from".
+    """
+    send = bot_instance.copy_message if copy else bot_instance.forward_message
+    return await _rate_limited_call(
+        chat_id, send,
+        chat_id=chat_id,
+        from_chat_id=from_chat_id,
+        message_id=message_id
+    )
+
+
+async def _forward_to_channels(bot_instance, channel_ids, from_chat_id, message_id, copy=False):
+    """Forward (hoặc copy nếu copy=True) một tin nhắn đến nhiều kênh song song (tối đa CHANNEL_FORWARD_CONCURRENCY cùng lúc)
+
+    Trả về (success_count, failed_channels) với failed_channels dạng "channel_id (lỗi)".
+    """
+    semaphore = asyncio.Semaphore(CHANNEL_FORWARD_CONCURRENCY)
+
+    async def _fwd(channel_id):
+        async with semaphore:
+            await _rate_limited_forward(bot_instance, channel_id, from_chat_id, message_id, copy=copy)
+
+    results = await asyncio.gather(*[_fwd(cid) for cid in channel_ids], return_exceptions=True)
+    success_count = 0
+    failed_channels = []
+    for channel_id, result in zip(channel_ids, results):
+        if isinstance(result, Exception):
+            failed_channels.append(f"{channel_id} ({str(result)})")
+            logger.error("❌ Lỗi forward đến kênh %s: %s", channel_id, result)
+        else:
+            success_count += 1
+            logger.info("✅ Đã forward đến kênh %s (giữ emoji động)", channel_id)
+    return success_count, failed_channels
+
+
+async def _flush_forward_sheets(status_ids, logs):
+    """Ghi trạng thái và log của một đợt forward/gửi hàng loạt vào Google Sheets theo lô (2 request song song)"""
+    if not status_ids and not logs:
+        return
+    results = await asyncio.gather(
+        _sheets(sheets_manager.batch_update_message_status, status_ids, True),
+        _sheets(sheets_manager.batch_add_message_logs, logs),
+        return_exceptions=True
+    )
+    for result in results:
+        if isinstance(result, Exception):
+            logger.error("Lỗi ghi Google Sheets theo lô: %s", result)
+
+
+def _channel_result_message(title, success_count, failed_channels, note):
+    """Dựng báo cáo kết quả gửi đến kênh (chỉ liệt kê 5 kênh lỗi đầu tiên)"""
+    parts = [title, '**Kết quả:**\n', f'✅ **Thành công:** {success_count} kênh\n']
+    if failed_channels:
+        parts.append(f'❌ **Thất bại:** {len(failed_channels)} kênh\n')
+        parts.append('**Kênh lỗi:**\n')
+        parts.extend(f'• {failed}\n' for failed in failed_channels[:5])
+        if len(failed_channels) > 5:
+            parts.append(f'• ... và {len(failed_channels) - 5} kênh khác\n')
+    parts.append(f'\n**Lưu ý:** {note}')
+    return ''.join(parts)
+
+
+def _channel_display_name(channel_id: str) -> str:
+    """Tên hiển thị ngắn gọn của kênh (có cache)"""
+    display_name = _CHANNEL_DISPLAY_CACHE.get(channel_id)
+    if display_name is None:
+        if channel_id.startswith('-100'):
+            display_name = f"📢 Kênh {channel_id[-8:]}"
+        else:
+            display_name = f"📢 {channel_id}"
+        _CHANNEL_DISPLAY_CACHE[channel_id] = display_name
+    return display_name
+
+
+def now_str():
+    """Thời gian hiện tại dạng '%Y-%m-%d %H:%M:%S' (cache theo giây)"""
+    t = int(time.time())
+    if _NOW_CACHE['t'] != t:
+        _NOW_CACHE['t'] = t
+        _NOW_CACHE['s'] = datetime.fromtimestamp(t).strftime('%Y-%m-%d %H:%M:%S')
+    return _NOW_CACHE['s']
+
+
+async def edit_message_text_if_changed(query, text, reply_markup=None, **kwargs):
+    """edit_message_text nhưng bỏ qua khi nội dung và keyboard không đổi (tránh lỗi 'message is not modified')"""
+    message = query.message
+    key = (message.chat_id, message.message_id) if message else query.inline_message_id
+    edit_hash = hash((text, reply_markup.to_json() if reply_markup else None))
+    if _LAST_EDITS.get(key) == edit_hash and message and message.text == text:
+        return None
+    try:
+        result = await query.edit_message_text(text, reply_markup=reply_markup, **kwargs)
+    except BadRequest as e:
+        if 'not modified' not in str(e).lower():
+            raise
+        result = None
+    _LAST_EDITS[key] = edit_hash
+    return result
+
+
+async def enqueue_edit(query, text, **kwargs):
+    """Xếp hàng edit_message_text cho tin nhắn của query rồi chờ kết quả; gộp với edit chưa gửi của cùng tin nhắn
+
+    Lỗi của lần edit được ném lại cho người gọi (để các nhánh try/except vẫn hiển thị được thông báo lỗi).
+    """
+    message = query.message
+    if message is None:
+        # Tin nhắn inline không có chat_id để giới hạn theo chat: edit trực tiếp
+        return await query.edit_message_text(text, **kwargs)
+    key = (message.chat_id, message.message_id)
+    future = asyncio.get_running_loop().create_future()
+    pending = _PENDING_EDITS.get(key)
+    if pending is None:
+        _EDIT_QUEUE.put_nowait(key)
+        futures = [future]
+    else:
+        # Edit cũ chưa gửi bị thay bằng nội dung mới nhất; mọi người gọi nhận chung kết quả
+        futures = pending[3]
+        futures.append(future)
+    _PENDING_EDITS[key] = (query, text, kwargs, futures)
+    return await future
+
+
+async def _edit_worker():
+    """Lấy edit từ _EDIT_QUEUE và gửi nội dung mới nhất, tôn trọng giới hạn toàn bot và theo chat"""
+    while True:
+        key = await _EDIT_QUEUE.get()
+        query, text, kwargs, futures = _PENDING_EDITS.pop(key)
+        try:
+            result = await _rate_limited_call(key[0], edit_message_text_if_changed, query=query, text=text, **kwargs)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for future in futures:
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            _EDIT_QUEUE.task_done()
+
+
+def _cached_templates():
+    """Template tin nhắn của bulk_messaging_manager (có cache theo TEMPLATES_CACHE_TTL)"""
+    global _TEMPLATES_CACHE
+    now = time.monotonic()
+    if _TEMPLATES_CACHE is None or _TEMPLATES_CACHE[0] <= now:
+        templates = tuple(bulk_messaging_manager.get_message_templates())
+        _TEMPLATES_CACHE = (now + TEMPLATES_CACHE_TTL, templates)
+    return _TEMPLATES_CACHE[1]
+
+
+async def _sheets(fn, *args, **kwargs):
+    """Chạy một lệnh gọi Google Sheets đồng bộ trong thread pool để không chặn event loop"""
+    return await asyncio.to_thread(fn, *args, **kwargs)
+
+
+async def get_customers_cached():
+    """Danh sách khách hàng có cache CUSTOMERS_CACHE_TTL giây, đọc Sheets trong thread"""
+    async with _CUSTOMERS_LOCK:
+        customers = _CUSTOMERS_CACHE['value']
+        if customers is None or time.monotonic() - _CUSTOMERS_CACHE['ts'] >= CUSTOMERS_CACHE_TTL:
+            customers = await _sheets(sheets_manager.get_all_customers)
+            _CUSTOMERS_CACHE.update(value=customers, ts=time.monotonic())
+        return customers
+
+
+def invalidate_customers_cache():
+    """Xóa snapshot khách hàng, gọi sau khi thêm/sửa khách hàng"""
+    _CUSTOMERS_CACHE['value'] = None
+
+
+async def get_customer_stats_cached():
+    """Thống kê khách hàng có cache STATS_CACHE_TTL giây, dùng lại giá trị cũ khi Sheets lỗi"""
+    if _STATS_CACHE['value'] is not None and time.monotonic() - _STATS_CACHE['ts'] < STATS_CACHE_TTL:
+        return _STATS_CACHE['value']
+    try:
+        stats = await _sheets(sheets_manager.get_customer_stats)
+    except Exception as e:
+        logger.error("Lỗi lấy thống kê khách hàng: %s", e)
+        stats = None
+    if stats:
+        _STATS_CACHE.update(value=stats, ts=time.monotonic())
+        return stats
+    return _STATS_CACHE['value']
+
+
+async def _schedule_cached(key, fn, *args):
+    """Gọi fn của scheduled_forward_manager trong thread, dùng lại kết quả trong SCHEDULE_CACHE_TTL giây"""
+    try:
+        return _SCHEDULE_CACHE[key]
+    except KeyError:
+        pass
+    value = await asyncio.to_thread(fn, *args)
+    _SCHEDULE_CACHE[key] = value
+    return value
+
+
+async def get_scheduled_forwards_cached():
+    """Danh sách lịch hẹn giờ (dùng chung cho mọi admin), có cache"""
+    return await _schedule_cached(('list',), scheduled_forward_manager.get_scheduled_forwards)
+
+
+async def get_schedule_stats_cached():
+    """Thống kê lịch hẹn giờ từ snapshot nền; chưa có snapshot thì lấy trực tiếp"""
+    global _SCHEDULE_STATS_SNAPSHOT
+    stats = _SCHEDULE_STATS_SNAPSHOT
+    if stats is None:
+        stats = _SCHEDULE_STATS_SNAPSHOT = await asyncio.to_thread(scheduled_forward_manager.get_schedule_stats)
+    return stats
+
+
+async def _refresh_schedule_stats_loop():
+    """Tác vụ nền: tính lại thống kê lịch hẹn giờ định kỳ để nút thống kê chỉ đọc snapshot"""
+    global _SCHEDULE_STATS_SNAPSHOT
+    while True:
+        try:
+            _SCHEDULE_STATS_SNAPSHOT = await asyncio.to_thread(scheduled_forward_manager.get_schedule_stats)
+        except Exception as e:
+            logger.error("Lỗi làm mới thống kê lịch hẹn giờ: %s", e)
+        await asyncio.sleep(SCHEDULE_STATS_REFRESH_INTERVAL)
+
+
+def invalidate_schedule_cache():
+    """Xóa cache lịch hẹn giờ, gọi sau khi thêm/hủy lịch"""
+    global _SCHEDULE_STATS_SNAPSHOT
+    _SCHEDULE_CACHE.clear()
+    _SCHEDULE_STATS_SNAPSHOT = None
 
 
 def create_channel_selection_keyboard(user_id: int):
     """Tạo keyboard chọn kênh"""
-    all_channels = getattr(bot_config, 'FORWARD_CHANNELS', [])
+    all_channels = _FORWARD_CHANNELS
     selected_channels = get_admin_selected_channels(user_id)
 
     if not all_channels:
-        return InlineKeyboardMarkup([[
-            InlineKeyboardButton("❌ Không có kênh nào", callback_data="no_channels")
-        ]])
+        return NO_CHANNELS_KB
 
     keyboard = []
 
@@ -124,19 +560,10 @@ def create_channel_selection_keyboard(user_id: int):
 
     # Danh sách từng kênh
     for channel_id in all_channels:
-        is_selected = channel_id in selected_channels
-        status_icon = "✅" if is_selected else "❌"
-
-        # Hiển thị tên kênh ngắn gọn
-        if channel_id.startswith('-100'):
-            display_name = f"📢 Kênh {channel_id[-8:]}"
-        elif channel_id.startswith('@'):
-            display_name = f"📢 {channel_id}"
-        else:
-            display_name = f"📢 {channel_id}"
+        status_icon = "✅" if channel_id in selected_channels else "❌"
 
         keyboard.append([InlineKeyboardButton(
-            f"{status_icon} {display_name}",
+            f"{status_icon} {_channel_display_name(channel_id)}",
             callback_data=f"toggle_channel:{channel_id}"
         )])
 
@@ -155,72 +582,36 @@ def create_channel_selection_keyboard(user_id: int):
     return InlineKeyboardMarkup(keyboard)
 
 
-def reload_bot_modules():
-    """Tự động reload các modules của bot"""
-    try:
-        # Reload bot_config
-        importlib.reload(bot_config)
-        print("✅ Reloaded bot_config")
-
-        # Reload các modules khác nếu cần
-        try:
-            importlib.reload(sys.modules['google_sheets'])
-            print("✅ Reloaded google_sheets")
-        except Exception:
-            pass
-
-        try:
-            importlib.reload(sys.modules['notification_system'])
-            print("✅ Reloaded notification_system")
-        except Exception:
-            pass
-
-        try:
-            importlib.reload(sys.modules['bulk_messaging'])
-            print("✅ Reloaded bulk_messaging")
-        except Exception:
-            pass
-
-        return True
-    except Exception as e:
-        print(f"❌ Error reloading modules: {e}")
-        return False
-
-
 def graceful_restart(signum=None, frame=None):
-    """Restart bot gracefully"""
-    global current_application  # noqa: F824
+    """Yêu cầu restart bot: dừng polling, main() sẽ exec lại process mới"""
+    global _RESTART_REQUESTED
 
     print("🔄 Starting graceful restart...")
+    _RESTART_REQUESTED = True
 
     try:
-        # Reload modules
-        if reload_bot_modules():
-            print("✅ Modules reloaded successfully")
-
-            # Stop current application
-            if current_application:
-                print("🛑 Stopping current application...")
-                current_application.stop()
-
-            # Start new application
-            print("🚀 Starting new application...")
-            main()
-
-        else:
-            print("❌ Failed to reload modules, keeping current version")
-
+        if current_application and current_application.running:
+            print("🛑 Stopping current application...")
+            current_application.stop_running()
     except Exception as e:
         print(f"❌ Error during restart: {e}")
 
 
+def _exec_restart():
+    """Thay process hiện tại bằng process mới (nạp lại toàn bộ code và config)"""
+    print("🚀 Starting new process...")
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os.execv(sys.executable, [sys.executable] + sys.argv)
+
+
 def setup_signal_handlers():
     """Setup signal handlers for graceful restart"""
     if sys.platform != "win32":
         signal.signal(signal.SIGUSR1, graceful_restart)
 
 
-def get_bulk_messaging_menu_keyboard(language='pt'):
+def _build_bulk_messaging_menu_keyboard(language='pt'):
     """Tạo keyboard cho menu bulk messaging theo ngôn ngữ"""
     if language == 'zh':
         # Tiếng Trung giản thể
@@ -276,19 +667,20 @@ def get_bulk_messaging_menu_keyboard(language='pt'):
         ]
 
 
+_BULK_MESSAGING_TITLES = {
+    'zh': '📢 **批量消息系统**\n\n请选择您要使用的功能:',
+    'en': '📢 **BULK MESSAGING SYSTEM**\n\nSelect the function you want to use:',
+    'vi': '📢 **HỆ THỐNG GỬI TIN NHẮN HÀNG LOẠT**\n\nChọn chức năng bạn muốn sử dụng:',
+    'pt': '📢 **SISTEMA DE MENSAGENS EM MASSA**\n\nSelecione a função que deseja usar:'
+}
+
+
 def get_bulk_messaging_title(language='pt'):
     """Lấy tiêu đề menu bulk messaging theo ngôn ngữ"""
-    if language == 'zh':
-        return '📢 **批量消息系统**\n\n请选择您要使用的功能:'
-    elif language == 'en':
-        return '📢 **BULK MESSAGING SYSTEM**\n\nSelect the function you want to use:'
-    elif language == 'vi':
-        return '📢 **HỆ THỐNG GỬI TIN NHẮN HÀNG LOẠT**\n\nChọn chức năng bạn muốn sử dụng:'
-    else:
-        return '📢 **SISTEMA DE MENSAGENS EM MASSA**\n\nSelecione a função que deseja usar:'
+    return _BULK_MESSAGING_TITLES.get(language, _BULK_MESSAGING_TITLES['pt'])
 
 
-def get_scheduled_forward_menu_keyboard(language='pt'):
+def _build_scheduled_forward_menu_keyboard(language='pt'):
     """Tạo keyboard cho menu hẹn giờ chuyển tiếp theo ngôn ngữ"""
     if language == 'zh':
         return [
@@ -324,44 +716,44 @@ def get_scheduled_forward_menu_keyboard(language='pt'):
         ]
 
 
+_SCHEDULED_FORWARD_TITLES = {
+    'zh': '⏰ **定时转发系统**\n\n请选择您要使用的功能:',
+    'en': '⏰ **SCHEDULED FORWARD SYSTEM**\n\nSelect the function you want to use:',
+    'vi': '⏰ **HỆ THỐNG HẸN GIỜ CHUYỂN TIẾP**\n\nChọn chức năng bạn muốn sử dụng:',
+    'pt': '⏰ **SISTEMA DE ENCAMINHAMENTO AGENDADO**\n\nSelecione a função que deseja usar:'
+}
+
+
 def get_scheduled_forward_title(language='pt'):
     """Lấy tiêu đề menu hẹn giờ chuyển tiếp theo ngôn ngữ"""
-    if language == 'zh':
-        return '⏰ **定时转发系统**\n\n请选择您要使用的功能:'
-    elif language == 'en':
-        return '⏰ **SCHEDULED FORWARD SYSTEM**\n\nSelect the function you want to use:'
-    elif language == 'vi':
-        return '⏰ **HỆ THỐNG HẸN GIỜ CHUYỂN TIẾP**\n\nChọn chức năng bạn muốn sử dụng:'
-    else:
-        return '⏰ **SISTEMA DE ENCAMINHAMENTO AGENDADO**\n\nSelecione a função que deseja usar:'
+    return _SCHEDULED_FORWARD_TITLES.get(language, _SCHEDULED_FORWARD_TITLES['pt'])
 
 
-async def update_admin_commands_for_user(context, language):
+async def update_admin_commands_for_user(context, language, user_id):
     """Cập nhật admin commands cho user theo ngôn ngữ mới"""
     try:
-        user_id = context.user_data.get('user_id') or context.effective_user.id
-
         # Kiểm tra xem user có phải admin không
-        if str(user_id) in bot_config.ADMIN_USER_IDS:
-            # Lấy admin commands theo ngôn ngữ mới
-            admin_commands = get_admin_commands(language)
+        user_id = int(user_id)
+        if user_id in ADMIN_USER_IDS_SET:
+            if _LAST_USER_LANG.get(user_id) == language:
+                return
 
             # Cập nhật commands cho user này
             await context.bot.set_my_commands(
-                [BotCommand(command, description) for command, description in admin_commands],
-                scope=BotCommandScopeChat(chat_id=int(user_id))
+                get_admin_command_objects(language),
+                scope=BotCommandScopeChat(chat_id=user_id)
             )
+            _LAST_USER_LANG[user_id] = language
 
-            logger.info(f"✅ Đã cập nhật admin commands cho user {user_id} sang ngôn ngữ {language}")
+            logger.info("✅ Đã cập nhật admin commands cho user %s sang ngôn ngữ %s", user_id, language)
         else:
-            logger.info(f"User {user_id} không phải admin, không cần cập nhật commands")
+            logger.info("User %s không phải admin, không cần cập nhật commands", user_id)
 
     except Exception as e:
-        logger.error(f"❌ Lỗi khi cập nhật admin commands: {e}")
-        print(f"❌ Lỗi khi cập nhật admin commands: {e}")
+        logger.error("❌ Lỗi khi cập nhật admin commands: %s", e)
 
 
-def get_admin_commands(language='pt'):
+def _build_admin_commands(language='pt'):
     """Lấy danh sách lệnh admin theo ngôn ngữ"""
     if language == 'zh':
         return [
@@ -398,65 +790,817 @@ def get_admin_commands(language='pt'):
         ]
 
 
+_BULK_ALL_TITLES = {
+    'zh': '📢 **发送消息给所有客户**\n\n选择输入消息的方式:',
+    'en': '📢 **SEND MESSAGE TO ALL CUSTOMERS**\n\nSelect how to input message:',
+    'vi': '📢 **GỬI TIN NHẮN ĐẾN TẤT CẢ KHÁCH HÀNG**\n\nChọn cách nhập tin nhắn:',
+    'pt': '📢 **ENVIAR MENSAGEM PARA TODOS OS CLIENTES**\n\nSelecione como inserir a mensagem:'
+}
+
+
 def get_bulk_all_title(language='pt'):
     """Lấy tiêu đề menu gửi tin nhắn đến tất cả theo ngôn ngữ"""
-    if language == 'zh':
-        return '📢 **发送消息给所有客户**\n\n选择输入消息的方式:'
-    elif language == 'en':
-        return '📢 **SEND MESSAGE TO ALL CUSTOMERS**\n\nSelect how to input message:'
-    elif language == 'vi':
-        return '📢 **GỬI TIN NHẮN ĐẾN TẤT CẢ KHÁCH HÀNG**\n\nChọn cách nhập tin nhắn:'
-    else:
-        return '📢 **ENVIAR MENSAGEM PARA TODOS OS CLIENTES**\n\nSelecione como inserir a mensagem:'
+    return _BULK_ALL_TITLES.get(language, _BULK_ALL_TITLES['pt'])
+
+
+_BULK_FILTER_TITLES = {
+    'zh': '🎯 **按筛选条件发送消息**\n\n选择筛选类型:',
+    'en': '🎯 **SEND MESSAGE BY FILTER**\n\nSelect filter type:',
+    'vi': '🎯 **GỬI TIN NHẮN THEO BỘ LỌC**\n\nChọn loại bộ lọc:',
+    'pt': '🎯 **ENVIAR MENSAGEM POR FILTRO**\n\nSelecione o tipo de filtro:'
+}
 
 
 def get_bulk_filter_title(language='pt'):
     """Lấy tiêu đề menu gửi tin nhắn theo bộ lọc theo ngôn ngữ"""
-    if language == 'zh':
-        return '🎯 **按筛选条件发送消息**\n\n选择筛选类型:'
-    elif language == 'en':
-        return '🎯 **SEND MESSAGE BY FILTER**\n\nSelect filter type:'
-    elif language == 'vi':
-        return '🎯 **GỬI TIN NHẮN THEO BỘ LỌC**\n\nChọn loại bộ lọc:'
-    else:
-        return '🎯 **ENVIAR MENSAGEM POR FILTRO**\n\nSelecione o tipo de filtro:'
+    return _BULK_FILTER_TITLES.get(language, _BULK_FILTER_TITLES['pt'])
+
+
+_BULK_SCHEDULE_TITLES = {
+    'zh': '📅 **安排发送消息**\n\n此功能将在下一版本中开发。\n\n请使用即时发送消息功能。',
+    'en': '📅 **SCHEDULE MESSAGE**\n\nThis feature will be developed in the next version.\n\nPlease use the instant message sending feature.',
+    'vi': '📅 **LÊN LỊCH GỬI TIN NHẮN**\n\nTính năng này sẽ được phát triển trong phiên bản tiếp theo.\n\nVui lòng sử dụng tính năng gửi tin nhắn ngay lập tức.',
+    'pt': '📅 **AGENDAR MENSAGEM**\n\nEste recurso será desenvolvido na próxima versão.\n\nPor favor, use o recurso de envio de mensagem instantânea.'
+}
 
 
 def get_bulk_schedule_title(language='pt'):
     """Lấy tiêu đề menu lên lịch gửi tin nhắn theo ngôn ngữ"""
-    if language == 'zh':
-        return '📅 **安排发送消息**\n\n此功能将在下一版本中开发。\n\n请使用即时发送消息功能。'
-    elif language == 'en':
-        return '📅 **SCHEDULE MESSAGE**\n\nThis feature will be developed in the next version.\n\nPlease use the instant message sending feature.'
-    elif language == 'vi':
-        return '📅 **LÊN LỊCH GỬI TIN NHẮN**\n\nTính năng này sẽ được phát triển trong phiên bản tiếp theo.\n\nVui lòng sử dụng tính năng gửi tin nhắn ngay lập tức.'
-    else:
-        return '📅 **AGENDAR MENSAGEM**\n\nEste recurso será desenvolvido na próxima versão.\n\nPor favor, use o recurso de envio de mensagem instantânea.'
+    return _BULK_SCHEDULE_TITLES.get(language, _BULK_SCHEDULE_TITLES['pt'])
+
+
+_BULK_TEMPLATES_TITLES = {
+    'zh': '📋 **消息模板**\n\n',
+    'en': '📋 **MESSAGE TEMPLATES**\n\n',
+    'vi': '📋 **TEMPLATE TIN NHẮN MẪU**\n\n'
+}
 
 
 def get_bulk_templates_title(language='vi'):
     """Lấy tiêu đề menu template tin nhắn theo ngôn ngữ"""
-    if language == 'zh':
-        return '📋 **消息模板**\n\n'
-    elif language == 'en':
-        return '📋 **MESSAGE TEMPLATES**\n\n'
-    else:
-        return '📋 **TEMPLATE TIN NHẮN MẪU**\n\n'
+    return _BULK_TEMPLATES_TITLES.get(language, _BULK_TEMPLATES_TITLES['vi'])
+
+
+_BULK_STATS_TITLES = {
+    'zh': '📊 **客户统计**\n\n',
+    'en': '📊 **CUSTOMER STATISTICS**\n\n',
+    'vi': '📊 **THỐNG KÊ KHÁCH HÀNG**\n\n',
+    'pt': '📊 **ESTATÍSTICAS DE CLIENTES**\n\n'
+}
 
 
 def get_bulk_stats_title(language='pt'):
     """Lấy tiêu đề menu thống kê theo ngôn ngữ"""
-    if language == 'zh':
-        return '📊 **客户统计**\n\n'
-    elif language == 'en':
-        return '📊 **CUSTOMER STATISTICS**\n\n'
-    elif language == 'vi':
-        return '📊 **THỐNG KÊ KHÁCH HÀNG**\n\n'
-    else:
-        return '📊 **ESTATÍSTICAS DE CLIENTES**\n\n'
+    return _BULK_STATS_TITLES.get(language, _BULK_STATS_TITLES['pt'])
+
+
+# Mẫu thống kê khách hàng cho callback bulk_stats, biên dịch một lần khi import
+_BULK_STATS_TEMPLATES = {
+    'zh': Template(
+        '${title}👥 **总客户数:** $total\n'
+        '📅 **今天:** $today\n'
+        '📆 **本周:** $week\n'
+        '🗓️ **本月:** $month\n\n'
+        '🔄 **最后更新:** $ts'
+    ),
+    'en': Template(
+        '${title}👥 **Total customers:** $total\n'
+        '📅 **Today:** $today\n'
+        '📆 **This week:** $week\n'
+        '🗓️ **This month:** $month\n\n'
+        '🔄 **Last updated:** $ts'
+    ),
+    'vi': Template(
+        '${title}👥 **Tổng số khách hàng:** $total\n'
+        '📅 **Hôm nay:** $today\n'
+        '📆 **Tuần này:** $week\n'
+        '🗓️ **Tháng này:** $month\n\n'
+        '🔄 **Cập nhật lần cuối:** $ts'
+    )
+}
+
+
+# Nhãn nút quay lại dùng chung cho mọi ngôn ngữ (mặc định tiếng Việt)
+BACK_LABEL = {
+    'zh': '⬅️ 返回',
+    'en': '⬅️ Back',
+    'vi': '⬅️ Quay lại',
+    'pt': '⬅️ Voltar'
+}
+
+
+def _back(language, callback_data):
+    """Nút quay lại theo ngôn ngữ (mặc định tiếng Việt)"""
+    return InlineKeyboardButton(BACK_LABEL.get(language, BACK_LABEL['vi']), callback_data=callback_data)
+
+
+@functools.lru_cache(maxsize=None)
+def back_markup(language, callback_data):
+    """Markup chỉ có một nút quay lại, cache theo (ngôn ngữ, callback đích)"""
+    return InlineKeyboardMarkup([[_back(language, callback_data)]])
+
+
+# Chuỗi giao diện tĩnh của các callback gửi hàng loạt: callback -> ngôn ngữ -> tiêu đề
+I18N = {
+    'bulk_stop': {
+        'zh': '🛑 **已停止批量发送消息!**\n\n机器人将在完成当前消息后停止发送消息。\n\n您可以通过发送命令 /stop_bulk 来检查状态',
+        'en': '🛑 **BULK MESSAGING STOPPED!**\n\nBot will stop sending messages after completing the current message.\n\nYou can check status by sending command /stop_bulk',
+        'vi': '🛑 **ĐÃ DỪNG GỬI TIN NHẮN HÀNG LOẠT!**\n\nBot sẽ dừng gửi tin nhắn sau khi hoàn thành tin nhắn hiện tại.\n\nBạn có thể kiểm tra trạng thái bằng cách gửi lệnh /stop_bulk'
+    },
+    'bulk_input_message': {
+        'zh': '📝 **发送消息或媒体到帖子**\n\n**允许的媒体:**\n• 图片、视频、相册、文件\n• 贴纸、GIF、音频\n• 语音消息、圆形视频\n\n💡 **要将媒体附加到消息，请在此处发送**\n\n**现在请发送您的消息或媒体:**',
+        'en': '📝 **SEND MESSAGE OR MEDIA TO POST**\n\n**Allowed media:**\n• Images, videos, albums, files\n• Stickers, GIFs, audio\n• Voice messages, video notes\n\n💡 **To attach media to message, send here**\n\n**Now please send your message or media:**',
+        'vi': '📝 **GỬI TIN NHẮN HOẶC PHƯƠNG TIỆN VÀO BÀI ĐĂNG**\n\n**Phương tiện được phép:**\n• Ảnh, video, album, tệp\n• Nhãn dán, GIF, âm thanh\n• Tin nhắn thoại, video tròn\n\n💡 **Để đính kèm phương tiện vào tin nhắn, hãy gửi tại đây**\n\n**Bây giờ hãy gửi tin nhắn hoặc media của bạn:**'
+    },
+    'bulk_forward_to_channel': {
+        'zh': '📢 **转发消息到频道**\n\n**使用方法:**\n• 发送任意文本消息 → 机器人将转发到频道\n• 发送媒体 (图片、视频、文件、音频) → 机器人将转发媒体\n• 无需选择消息类型，机器人自动识别!\n\n**请发送要转发到频道的消息或媒体:**',
+        'en': '📢 **FORWARD MESSAGE TO CHANNEL**\n\n**How to use:**\n• Send any text message → Bot will forward to channel\n• Send media (image, video, file, audio) → Bot will forward media\n• No need to select message type, bot automatically detects!\n\n**Please send message or media to forward to channel:**',
+        'vi': '📢 **CHUYỂN TIẾP TIN NHẮN ĐẾN KÊNH**\n\n**Cách sử dụng:**\n• Gửi tin nhắn text bất kỳ → Bot sẽ chuyển tiếp đến kênh\n• Gửi media (ảnh, video, file, audio) → Bot sẽ chuyển tiếp media\n• Không cần chọn loại tin nhắn, bot tự động nhận diện!\n\n**Hãy gửi tin nhắn hoặc media để chuyển tiếp đến kênh:**'
+    },
+    'bulk_text_only': {
+        'zh': '📝 **输入文本消息**\n\n请输入您要发送给客户的消息。\n\n**注意:** 您可以使用以下占位符:\n• `{username}` - 用户名\n• `{full_name}` - 全名\n• `{action}` - 客户操作\n• `{date}` - 日期\n\n**现在请输入您的消息:**',
+        'en': '📝 **INPUT TEXT MESSAGE**\n\nPlease enter the message you want to send to customers.\n\n**Note:** You can use the following placeholders:\n• `{username}` - Username\n• `{full_name}` - Full name\n• `{action}` - Customer action\n• `{date}` - Date\n\n**Now please enter your message:**',
+        'vi': '📝 **NHẬP TIN NHẮN TEXT**\n\nVui lòng nhập tin nhắn bạn muốn gửi đến khách hàng.\n\n**Lưu ý:** Bạn có thể sử dụng các placeholder sau:\n• `{username}` - Tên người dùng\n• `{full_name}` - Họ tên đầy đủ\n• `{action}` - Hành động của khách hàng\n• `{date}` - Ngày tháng\n\n**Bây giờ hãy nhập tin nhắn của bạn:**'
+    },
+    'bulk_with_photo': {
+        'zh': '🖼️ **发送文本+图片**\n\n**步骤1:** 发送您要使用的图片\n**步骤2:** 然后为图片输入说明文字\n\n**注意:** 您可以使用以下占位符:\n• `{username}` - 用户名\n• `{full_name}` - 全名\n• `{action}` - 客户操作\n• `{date}` - 日期\n\n**现在发送图片:**',
+        'en': '🖼️ **SEND TEXT + PHOTO**\n\n**Step 1:** Send the photo you want to use\n**Step 2:** Then enter caption (text) for the photo\n\n**Note:** You can use the following placeholders:\n• `{username}` - Username\n• `{full_name}` - Full name\n• `{action}` - Customer action\n• `{date}` - Date\n\n**Send photo now:**',
+        'vi': '🖼️ **GỬI TEXT + HÌNH ẢNH**\n\n**Bước 1:** Gửi hình ảnh bạn muốn sử dụng\n**Bước 2:** Sau đó nhập caption (text) cho hình ảnh\n\n**Lưu ý:** Bạn có thể sử dụng các placeholder sau:\n• `{username}` - Tên người dùng\n• `{full_name}` - Họ tên đầy đủ\n• `{action}` - Hành động của khách hàng\n• `{date}` - Ngày tháng\n\n**Gửi hình ảnh ngay bây giờ:**'
+    },
+    'bulk_with_video': {
+        'zh': '🎥 **发送文本+视频**\n\n**步骤1:** 发送您要使用的视频\n**步骤2:** 然后为视频输入说明文字\n\n**注意:** 您可以使用以下占位符:\n• `{username}` - 用户名\n• `{full_name}` - 全名\n• `{action}` - 客户操作\n• `{date}` - 日期\n\n**现在发送视频:**',
+        'en': '🎥 **SEND TEXT + VIDEO**\n\n**Step 1:** Send the video you want to use\n**Step 2:** Then enter caption (text) for the video\n\n**Note:** You can use the following placeholders:\n• `{username}` - Username\n• `{full_name}` - Full name\n• `{action}` - Customer action\n• `{date}` - Date\n\n**Send video now:**',
+        'vi': '🎥 **GỬI TEXT + VIDEO**\n\n**Bước 1:** Gửi video bạn muốn sử dụng\n**Bước 2:** Sau đó nhập caption (text) cho video\n\n**Lưu ý:** Bạn có thể sử dụng các placeholder sau:\n• `{username}` - Tên người dùng\n• `{full_name}` - Họ tên đầy đủ\n• `{action}` - Hành động của khách hàng\n• `{date}` - Ngày tháng\n\n**Gửi video ngay bây giờ:**'
+    },
+    'bulk_with_document': {
+        'zh': '📄 **发送文本+文件**\n\n**步骤1:** 发送您要使用的文件\n**步骤2:** 然后为文件输入说明文字\n\n**注意:** 您可以使用以下占位符:\n• `{username}` - 用户名\n• `{full_name}` - 全名\n• `{action}` - 客户操作\n• `{date}` - 日期\n\n**现在发送文件:**',
+        'en': '📄 **SEND TEXT + FILE**\n\n**Step 1:** Send the file you want to use\n**Step 2:** Then enter caption (text) for the file\n\n**Note:** You can use the following placeholders:\n• `{username}` - Username\n• `{full_name}` - Full name\n• `{action}` - Customer action\n• `{date}` - Date\n\n**Send file now:**',
+        'vi': '📄 **GỬI TEXT + FILE**\n\n**Bước 1:** Gửi file bạn muốn sử dụng\n**Bước 2:** Sau đó nhập caption (text) cho file\n\n**Lưu ý:** Bạn có thể sử dụng các placeholder sau:\n• `{username}` - Tên người dùng\n• `{full_name}` - Họ tên đầy đủ\n• `{action}` - Hành động của khách hàng\n• `{date}` - Ngày tháng\n\n**Gửi file ngay bây giờ:**'
+    },
+    'bulk_with_audio': {
+        'zh': '🎵 **发送文本+音频**\n\n**步骤1:** 发送您要使用的音频\n**步骤2:** 然后为音频输入说明文字\n\n**注意:** 您可以使用以下占位符:\n• `{username}` - 用户名\n• `{full_name}` - 全名\n• `{action}` - 客户操作\n• `{date}` - 日期\n\n**现在发送音频:**',
+        'en': '🎵 **SEND TEXT + AUDIO**\n\n**Step 1:** Send the audio you want to use\n**Step 2:** Then enter caption (text) for the audio\n\n**Note:** You can use the following placeholders:\n• `{username}` - Username\n• `{full_name}` - Full name\n• `{action}` - Customer action\n• `{date}` - Date\n\n**Send audio now:**',
+        'vi': '🎵 **GỬI TEXT + AUDIO**\n\n**Bước 1:** Gửi audio bạn muốn sử dụng\n**Bước 2:** Sau đó nhập caption (text) cho audio\n\n**Lưu ý:** Bạn có thể sử dụng các placeholder sau:\n• `{username}` - Tên người dùng\n• `{full_name}` - Họ tên đầy đủ\n• `{action}` - Hành động của khách hàng\n• `{date}` - Ngày tháng\n\n**Gửi audio ngay bây giờ:**'
+    },
+    'bulk_use_template': {
+        'zh': '📋 **选择消息模板**\n\n',
+        'en': '📋 **SELECT MESSAGE TEMPLATE**\n\n',
+        'vi': '📋 **CHỌN TEMPLATE TIN NHẮN**\n\n'
+    },
+    'bulk_template_invalid': {
+        'zh': '❌ 模板无效。',
+        'en': '❌ Invalid template.',
+        'vi': '❌ Template không hợp lệ.'
+    },
+    'bulk_template_missing': {
+        'zh': '❌ 找不到模板。',
+        'en': '❌ Template not found.',
+        'vi': '❌ Không tìm thấy template.'
+    },
+    'bulk_filter_date': {
+        'zh': '📅 **按日期筛选**\n\n请输入日期 (格式: YYYY-MM-DD)\n例如: 2025-08-24',
+        'en': '📅 **FILTER BY DATE**\n\nPlease enter date (format: YYYY-MM-DD)\nExample: 2025-08-24',
+        'vi': '📅 **LỌC THEO NGÀY**\n\nVui lòng nhập ngày (định dạng: YYYY-MM-DD)\nVí dụ: 2025-08-24'
+    },
+    'bulk_filter_action': {
+        'zh': '🎯 **按操作筛选**\n\n请输入需要筛选的操作:\n例如: deposit, withdraw, register',
+        'en': '🎯 **FILTER BY ACTION**\n\nPlease enter the action to filter:\nExample: deposit, withdraw, register',
+        'vi': '🎯 **LỌC THEO HÀNH ĐỘNG**\n\nVui lòng nhập hành động cần lọc:\nVí dụ: deposit, withdraw, register'
+    },
+    'bulk_filter_username': {
+        'zh': '👤 **按用户名筛选**\n\n请输入需要筛选的用户名:',
+        'en': '👤 **FILTER BY USERNAME**\n\nPlease enter the username to filter:',
+        'vi': '👤 **LỌC THEO USERNAME**\n\nVui lòng nhập username cần lọc:'
+    },
+    'bulk_unknown': {
+        'zh': '❌ 选项无法识别。',
+        'en': '❌ Option not recognized.',
+        'vi': '❌ Tùy chọn không được nhận diện.'
+    },
+    'bulk_error': {
+        'zh': '❌ 发生错误。请重试。',
+        'en': '❌ An error occurred. Please try again.',
+        'vi': '❌ Đã xảy ra lỗi. Vui lòng thử lại.'
+    }
+}
+
+
+def get_i18n(callback, language='vi'):
+    """Lấy tiêu đề đã dựng sẵn cho callback theo ngôn ngữ"""
+    texts = I18N[callback]
+    return texts.get(language, texts['vi'])
+
+
+# Callback đích của nút quay lại cho các màn hình chỉ có một nút quay lại
+_BACK_TARGETS = {
+    'bulk_schedule': 'bulk_back',
+    'bulk_stop': 'bulk_back',
+    'bulk_input_message': 'bulk_back',
+    'bulk_forward_to_channel': 'bulk_back',
+    'bulk_text_only': 'bulk_input_message',
+    'bulk_with_photo': 'bulk_input_message',
+    'bulk_with_video': 'bulk_input_message',
+    'bulk_with_document': 'bulk_input_message',
+    'bulk_with_audio': 'bulk_input_message',
+    'bulk_template_invalid': 'bulk_use_template',
+    'bulk_template_missing': 'bulk_all',
+    'bulk_filter_date': 'bulk_filter',
+    'bulk_filter_action': 'bulk_filter',
+    'bulk_filter_username': 'bulk_filter',
+    'bulk_unknown': 'bulk_back',
+    'bulk_error': 'bulk_back'
+}
+
+
+def get_back_markup(callback, language='vi'):
+    """Markup nút quay lại cho callback theo ngôn ngữ, đích lấy từ _BACK_TARGETS"""
+    return back_markup(language, _BACK_TARGETS[callback])
+
+
+# Bàn phím tĩnh dùng lại cho mọi lần gọi (markup không mang trạng thái theo request)
+CONFIRM_CANCEL_KB = InlineKeyboardMarkup([[
+    InlineKeyboardButton('✅ XÁC NHẬN', callback_data='confirm_forward'),
+    InlineKeyboardButton('❌ HỦY', callback_data='cancel_forward')
+]])
+SEND_OTHER_KB = {
+    'zh': InlineKeyboardMarkup([[InlineKeyboardButton('📢 发送其他消息', callback_data='bulk_all')]]),
+    'en': InlineKeyboardMarkup([[InlineKeyboardButton('📢 Send other message', callback_data='bulk_all')]]),
+    'vi': InlineKeyboardMarkup([[InlineKeyboardButton('📢 Gửi tin nhắn khác', callback_data='bulk_all')]])
+}
+CANCEL_CHANNEL_SELECTION_KB = InlineKeyboardMarkup([[
+    InlineKeyboardButton("❌ Hủy", callback_data="cancel_channel_selection")
+]])
+NO_CHANNELS_KB = InlineKeyboardMarkup([[
+    InlineKeyboardButton("❌ Không có kênh nào", callback_data="no_channels")
+]])
+UNKNOWN_OPTION_KB = InlineKeyboardMarkup([[
+    InlineKeyboardButton('⬅️ Quay lại Menu', callback_data='back')
+]])
+ERROR_MENU_KB = InlineKeyboardMarkup([[
+    InlineKeyboardButton('⬅️ Voltar ao Menu', callback_data='back')
+]])
+
+# Menu chính của khách hàng (show_main_menu)
+MAIN_MENU_KB = InlineKeyboardMarkup([
+    [
+        InlineKeyboardButton(
+            '📝 Cadastrar Conta',
+            callback_data='register'
+        ),
+        InlineKeyboardButton(
+            '💰 Problema de Depósito',
+            callback_data='deposit'
+        )
+    ],
+    [
+        InlineKeyboardButton(
+            '💸 Problema de Saque',
+            callback_data='withdraw'
+        ),
+        InlineKeyboardButton(
+            '🎁 Programas Promocionais',
+            callback_data='promotions'
+        )
+    ],
+    [
+        InlineKeyboardButton(
+            '🆘 Atendimento ao Cliente Online',
+            callback_data='support'
+        ),
+        InlineKeyboardButton(
+            '💬 Atendimento ao Cliente Telegram',
+            callback_data='telegram_support'
+        )
+    ]
+])
+
+# Link atendimento ao cliente online, dùng chung cho mọi nút hỗ trợ
+SUPPORT_URL = 'https://vm.vondokua.com/1kdzfz0cdixxg0k59medjggvhv'
+
+# Markup dùng chung cho nhiều trang menu (cùng nút, chỉ khác trang gọi)
+BACK_PROMOTIONS_KB = InlineKeyboardMarkup([
+    [InlineKeyboardButton('⬅️ Voltar', callback_data='promotions')]
+])
+SUPPORT_BACK_DEPOSIT_KB = InlineKeyboardMarkup([
+    [InlineKeyboardButton(
+        '🆘 Atendimento ao cliente online',
+        url=SUPPORT_URL
+    )],
+    [InlineKeyboardButton('⬅️ Voltar', callback_data='deposit')]
+])
+SUPPORT_BACK_WITHDRAW_KB = InlineKeyboardMarkup([
+    [InlineKeyboardButton(
+        '🆘 Atendimento ao cliente online',
+        url=SUPPORT_URL
+    )],
+    [InlineKeyboardButton('⬅️ Voltar', callback_data='withdraw')]
+])
+
+# Bàn phím của các menu khách hàng trong button_handler, dựng một lần theo callback_data
+MENUS = {
+    'promotions': InlineKeyboardMarkup([
+        [InlineKeyboardButton('👑 VIP Club',
+                              callback_data='vip_club')],
+        [InlineKeyboardButton('🤝 Programa de Referência',
+                              callback_data='referral')],
+
+        [InlineKeyboardButton('💳 Pacotes de Depósito',
+                              callback_data='deposit_packages')],
+        [InlineKeyboardButton('🌅 Primeiro Depósito do Dia',
+                              callback_data='daily_first_deposit')],
+        [InlineKeyboardButton('🎡 Roda da Fortuna',
+                              callback_data='lucky_wheel')],
+        [InlineKeyboardButton('🎰 Roleta VIP',
+                              callback_data='vip_roulette')],
+        [InlineKeyboardButton('📱 Baixar App Promocional',
+                              callback_data='download_app')],
+        [InlineKeyboardButton('🆘 Compensação de Perda',
+                              callback_data='loss_compensation')],
+        [InlineKeyboardButton('⬅️ Voltar',
+                              callback_data='back')]
+    ]),
+    'deposit': InlineKeyboardMarkup([
+        [InlineKeyboardButton(
+            '❌ Depósito não creditado',
+            callback_data='deposit_not_credited'
+        )],
+        [InlineKeyboardButton(
+            '🚫 Não consegue depositar',
+            callback_data='deposit_failed'
+        )],
+        [InlineKeyboardButton(
+            '⬅️ Voltar',
+            callback_data='back'
+        )]
+    ]),
+    'deposit_not_credited': SUPPORT_BACK_DEPOSIT_KB,
+    'withdraw': InlineKeyboardMarkup([
+        [InlineKeyboardButton(
+            '❌ Saque não recebido',
+            callback_data='withdraw_not_received'
+        )],
+        [InlineKeyboardButton(
+            '🚫 Não consegue sacar',
+            callback_data='withdraw_failed'
+        )],
+        [InlineKeyboardButton(
+            '⬅️ Voltar',
+            callback_data='back'
+        )]
+    ]),
+    'register': InlineKeyboardMarkup([
+        [InlineKeyboardButton(
+            '🌐 Abrir página de cadastro',
+            url=('https://www.abcd.bet/v2/index.html?'
+                 'appName=0&pid=0&click_id=0&pixel_id=0&t=0#/Center')
+        )],
+        [InlineKeyboardButton(
+            '📱 Baixar APP ABCD.BET',
+            url='https://www.abcd.bet/app'
+        )],
+        [InlineKeyboardButton(
+            '⬅️ Voltar',
+            callback_data='back'
+        )]
+    ]),
+    'support': InlineKeyboardMarkup([
+        [InlineKeyboardButton(
+            '🌐 Abrir Atendimento ao cliente online',
+            url=SUPPORT_URL
+        )],
+        [InlineKeyboardButton(
+            '⬅️ Voltar',
+            callback_data='back'
+        )]
+    ]),
+    'deposit_failed': SUPPORT_BACK_DEPOSIT_KB,
+    'withdraw_not_received': SUPPORT_BACK_WITHDRAW_KB,
+    'withdraw_failed': SUPPORT_BACK_WITHDRAW_KB,
+    'vip_club': BACK_PROMOTIONS_KB,
+    'referral': BACK_PROMOTIONS_KB,
+    'deposit_packages': BACK_PROMOTIONS_KB,
+    'daily_first_deposit': BACK_PROMOTIONS_KB,
+    'vip_roulette': BACK_PROMOTIONS_KB,
+    'download_app': BACK_PROMOTIONS_KB,
+    'lucky_wheel': BACK_PROMOTIONS_KB,
+    'loss_compensation': BACK_PROMOTIONS_KB,
+    'telegram_support': InlineKeyboardMarkup([
+        [InlineKeyboardButton(
+            '📱 Abrir @ABCDBETONLINE',
+            url='https://t.me/ABCDBETONLINE'
+        )],
+        [InlineKeyboardButton(
+            '⬅️ Voltar',
+            callback_data='back'
+        )]
+    ])
+}
+
+# Texto dos menus de cliente (mesma chave de MENUS), enviado direto pelo button_handler
+MENU_TEXTS = {
+    'promotions': (
+        '🎁 **Programas Promocionais ABCD.BET**\n\n'
+        'Escolha o programa promocional que você gostaria de conhecer:'
+    ),
+    'deposit': (
+        '💰 **PROBLEMA DE DEPÓSITO**\n\n'
+        'Escolha o problema que você está enfrentando:'
+    ),
+    'deposit_not_credited': (
+        '❌ **DEPÓSITO NÃO CREDITADO**\n\n'
+        '💡 **Informação:**\n'
+        'Devido ao grande volume de depósitos, o processamento de\n'
+        'transações pode estar atrasado.\n\n'
+        '⏰ **Tempo de processamento:**\n'
+        'Se após 1-10 minutos não foi creditado, entre em contato\n'
+        'com o atendimento ao cliente online para orientação\n'
+        'específica.\n\n'
+        '📞 **Contato de suporte:**\n'
+        'Clique em "Atendimento ao cliente online" para obter suporte imediatamente.'
+    ),
+    'withdraw': (
+        '💸 **PROBLEMA DE SAQUE**\n\n'
+        'Escolha o problema que você está enfrentando:'
+    ),
+    'register': (
+        '📝 **CADASTRAR CONTA ABCDBET**\n\n'
+        '🎯 **Bem-vindo ao ABCD.BET!**\n\n'
+        '🎁 **PROMOÇÃO DE DEPÓSITO INCRÍVEL:**\n'
+        '• 🔥 Presente 100% do valor do primeiro depósito\n'
+        '• 💰 Reembolso de 10% todos os dias sem limite\n'
+        '• 🎰 Rodadas grátis 50 vezes para jogos de slot\n'
+        '• 🏆 Receba R$ 500 imediatamente após cadastro\n\n'
+        '📱 **BAIXE O APP ABCD.BET:**\n'
+        '• Baixe o app para receber mais R$ 200\n'
+        '• Experiência suave e rápida\n'
+        '• Atualizações promocionais em tempo real\n\n'
+        '🚀 **Comece agora:**\n'
+        'Clique em "Abrir página de cadastro" para receber ofertas!'
+    ),
+    'support': (
+        '🆘 **Atendimento ao Cliente Online**\n\n'
+        '🌐 **Link de Suporte:** Clique no botão abaixo para abrir a página de\n'
+        'suporte\n\n'
+        '👆 **Clique em "Abrir Suporte Online" para acessar agora!**'
+    ),
+    'deposit_failed': (
+        '🚫 **NÃO CONSEGUE DEPOSITAR**\n\n'
+        '💡 **Possíveis causas:**\n'
+        '• Problemas de conexão com a internet\n'
+        '• Limite de cartão atingido\n'
+        '• Problemas temporários do sistema\n'
+        '• Bloqueio de transação pelo banco\n\n'
+        '📞 **Solução:**\n'
+        'Entre em contato com o suporte para orientação específica.'
+    ),
+    'withdraw_not_received': (
+        '❌ **SAQUE NÃO RECEBIDO**\n\n'
+        '💡 **Informação:**\n'
+        'O processamento de saques pode levar de 1-24 horas\n'
+        'dependendo do método de pagamento escolhido.\n\n'
+        '⏰ **Tempo de processamento:**\n'
+        '• PIX: 1-2 horas\n'
+        '• Transferência bancária: 1-24 horas\n'
+        '• Criptomoedas: 1-6 horas\n\n'
+        '📞 **Se não recebeu após 24h:**\n'
+        'Entre em contato com o suporte imediatamente.'
+    ),
+    'withdraw_failed': (
+        '🚫 **NÃO CONSEGUE SACAR**\n\n'
+        '💡 **Possíveis causas:**\n'
+        '• Saldo insuficiente na conta\n'
+        '• Limite de saque diário atingido\n'
+        '• Conta não verificada\n'
+        '• Problemas temporários do sistema\n\n'
+        '📞 **Solução:**\n'
+        'Entre em contato com o suporte para verificar o status da sua conta.'
+    ),
+    'vip_club': (
+        '👑 **Clube VIP ABCD.BET**\n\n'
+        '🌟 **Participar do clube VIP:**\n\n'
+        '📊 **Programa VIP com níveis de Novice até King.**\n'
+        'Benefícios crescem a cada nível: prêmios em dinheiro (BRL), '
+        'moedas NOW, valor de giros grátis e quantidade de giros '
+        'por dia.\n\n'
+        '🎯 **Atendimento ao cliente:** começa como Padrão e passa '
+        'a Prioridade a partir do nível Platinum.\n\n'
+        '💎 **Bônus exclusivo:** vai de 0% nos níveis iniciais '
+        'até 60% extra no nível King.\n\n'
+        '🏆 **Destaques:**\n\n'
+        '🥉 **Bronze:** 25 BRL, 250 NOW, 2 giros/dia.\n\n'
+        '🥈 **Silver:** 150 BRL, 1500 NOW, 20% extra.\n\n'
+        '🥇 **Gold:** 1000 BRL, 10.000 NOW, 30% extra.\n\n'
+        '💎 **Diamond:** 3125 BRL, 31.250 NOW, suporte '
+        'prioritário, 50% extra.\n\n'
+        '👑 **King:** 25.000 BRL, 250.000 NOW, 3 giros/dia, '
+        '60% extra.\n\n'
+        '🚀 **Suba de nível VIP e desfrute de benefícios '
+        'exclusivos!**'
+    ),
+    'referral': (
+        '🤝 **Programa de Referência ABCD.BET**\n\n'
+        '💰 **Convide seus amigos para receber recompensas:**\n\n'
+        '➡️ **Compartilhe o link da sua conta com seus amigos para '
+        'se registrar e receber os bônus correspondentes! Os detalhes '
+        'específicos são os seguintes:**\n\n'
+        '✔️ **Convide 1 amigo válido e ganhe R$24,8**\n'
+        '✔️ **Convide 5 amigos válidos e ganhe R$158,88**\n\n'
+        '➡️ **Como convidar amigos de forma eficaz:**\n\n'
+        '✔️ **Seu amigo completa o cadastro da conta e você recebe '
+        '0.2 real**\n\n'
+        '✔️ **O amigo que você convidar vem até a plataforma para '
+        'recarregar 30reais, e você ganhará 9,8 reais.**\n\n'
+        '✔️ **O valor total da aposta dos amigos que você convidar '
+        'para a plataforma é de R$ 700, e você receberá R$ 14,8.**\n\n'
+        '➡️➡️ **5 amigos cadastrados receberão um bônus adicional '
+        'de R$ 34,88 💰ao apostar**\n\n'
+        '🚀 **Comece a convidar amigos e ganhe recompensas '
+        'incríveis!**'
+    ),
+    'deposit_packages': (
+        '💳 **Pacotes de Depósito ABCD.BET**\n\n'
+        '🎁 **Pacote de primeiro depósito:**\n'
+        'Por exemplo: Valor máximo de depósito é de 1000 BRL. '
+        'Deposite BRL 1000, e ganhe BRL 1000 de bônus.\n\n'
+        '🎁 **Pacote de Segundo Depósito:**\n'
+        'Por exemplo: Valor máximo de depósito é de 750 BRL. '
+        'Deposite BRL 750, e ganhe 375 BRL de bônus.\n\n'
+        '🎁 **Pacote de Terceiro Depósito:**\n'
+        'Por exemplo: Valor máximo de depósito é de 500 BRL. '
+        'Deposite BRL 500, e ganhe 375 BRL de bônus.\n\n'
+        '🚀 **Comece agora e aproveite nossos pacotes exclusivos!**'
+    ),
+    'daily_first_deposit': (
+        '💎 **PROMOÇÃO ESPECIAL – DEPOSITE E RECEBA BÔNUS TODOS OS DIAS!** 💎\n\n'
+        '👉 **Válido somente para o primeiro depósito do dia na ABCD.BET**\n\n'
+        '🔹 **Deposite de R$ 20 a R$ 99** → Bônus de **+2%** diretamente na conta\n'
+        '🔹 **Deposite de R$ 100 ou mais** → Bônus de **+3%** extremamente atrativo\n\n'
+        '⚡ **O bônus será adicionado automaticamente após o depósito ser efetuado!**\n\n'
+        '📌 **Observação importante:**\n\n'
+        '• Cada conta pode receber apenas **1 bônus por dia**.\n'
+        '• O bônus precisa ser apostado **10 vezes** para ser liberado e pode ser sacado ou continuado jogando.\n\n'
+        '🔥 **Não perca a oportunidade de maximizar sua renda diária com a ABCD.BET!**\n\n'
+        '⏰ **Cadastre-se agora!**'
+    ),
+    'vip_roulette': (
+        '🎰 **Roleta VIP ABCD.BET**\n\n'
+        '🎯 **Como participar:**\n\n'
+        '✅ Basta concluir o cadastro para se tornar um jogador em '
+        'nossa plataforma ABCD.BET e você terá a oportunidade de '
+        'girar a roleta **uma vez por dia**.\n\n'
+        '💳 **Depósito e apostas:**\n'
+        'Você pode acessar a plataforma normalmente para depositar '
+        'dinheiro e apostar no jogo.\n\n'
+        '🚀 **Benefícios VIP:**\n'
+        'No futuro, quanto maior for o seu nível VIP, mais vezes '
+        'você poderá girar a roleta por dia.\n\n'
+        '🎁 **Recompensas VIP:**\n'
+        'As recompensas VIP da roleta são alocadas de acordo com '
+        'o seu nível VIP. Quanto maior o seu nível, mais rodadas '
+        'grátis você pode obter.\n\n'
+        '📈 **Upgrades VIP:**\n'
+        'À medida que seus upgrades VIP, as recompensas e bônus '
+        'na roda da roleta também aumentarão.\n\n'
+        '🎯 **Probabilidade:**\n'
+        'Você pode obter A probabilidade também é maior, '
+        'obrigado!\n\n'
+        '🌟 **Comece agora e suba de nível VIP para mais '
+        'recompensas!**'
+    ),
+    'download_app': (
+        '🎉 **FAÇA LOGIN NO EVENTO PARA GANHAR BÔNUS – GANHE R$ 50 AGORA!** 🎉\n\n'
+        '👉 **Basta:**\n\n'
+        '1️⃣ **Depositar e registrar-se** para participar do evento.\n\n'
+        '2️⃣ **Baixar a versão mais recente** do jogo e fazer login continuamente por 3 dias.\n\n'
+        '💰 **Recompensas super fáceis:**\n\n'
+        '✅ **Dia 1:** Faça login e receba **R$ 10** imediatamente\n\n'
+        '✅ **Dia 2:** Continue fazendo login para receber mais **R$ 10**\n\n'
+        '✅ **Dia 3:** Faça login com o conjunto completo e receba **R$ 30** imediatamente\n\n'
+        '🔥 **No total, você receberá R$ 50 grátis** imediatamente com apenas 3 dias de login!\n\n'
+        '⏳ **Corra e participe para não perder a chance!**'
+    ),
+    'lucky_wheel': (
+        '🎡 **RODA DA FORTUNA ABCD.BET**\n\n'
+        '🎯 **Como participar:**\n\n'
+        '✅ **Cadastro automático:** Basta se cadastrar na plataforma ABCD.BET\n'
+        '✅ **Acesso diário:** Gire a roda **uma vez por dia** gratuitamente\n'
+        '✅ **Sem depósito:** Não é necessário depositar para participar\n\n'
+        '🎁 **Prêmios possíveis:**\n\n'
+        '💰 **Prêmios em dinheiro:** R$ 5, R$ 10, R$ 20, R$ 50, R$ 100\n'
+        '🎰 **Rodadas grátis:** 10x, 25x, 50x, 100x para jogos de slot\n'
+        '🎁 **Bônus especiais:** Multiplicadores, cashback, e muito mais\n\n'
+        '🚀 **Benefícios VIP:**\n'
+        '• Níveis VIP mais altos = mais giros por dia\n'
+        '• Prêmios exclusivos para membros VIP\n'
+        '• Acesso prioritário a eventos especiais\n\n'
+        '⏰ **Horário:** Disponível 24/7\n'
+        '🎯 **Probabilidade:** Todos têm chance de ganhar!\n\n'
+        '🌟 **Comece agora e teste sua sorte na Roda da Fortuna!**'
+    ),
+    'loss_compensation': (
+        '🆘 **Compensação de Perda ABCD.BET**\n\n'
+        '📋 **Detalhes da Promoção:**\n\n'
+        '1️⃣ **O Acampamento feliz é uma promoção que recompensa '
+        'suas perdas no jogo seguindo a tabela acima;**\n\n'
+        '2️⃣ **A participação dos membros nas atividades é '
+        'registrada automaticamente pelo sistema. Em caso de '
+        'disputa, a decisão resultante da consulta com a '
+        'ABCDBET prevalecerá;**\n\n'
+        '3️⃣ **Se você esquecer a sua conta/senha, você pode '
+        'restaurar em {Esquecer senha] na página de log-in ou '
+        'entrar em contato com o atendimento ao cliente '
+        'on-line 24 horas para ajudá-lo a recuperar as '
+        'informações da sua conta;**\n\n'
+        '4️⃣ **Participar desta oferta significa concordar com '
+        'as Regras e Termos da Oferta.**\n\n'
+        '🚀 **Aproveite nossa promoção de compensação e '
+        'recupere suas perdas!**'
+    ),
+    'telegram_support': (
+        '💬 **Atendimento ao Cliente Telegram**\n\n'
+        '🚀 **Conecte-se diretamente com o ABCD Support!**\n\n'
+        '📞 **Canal oficial:** @ABCDBETONLINE\n'
+        '⏰ **Funcionamento:** 24/7 - Sem parar\n'
+        '⚡ **Resposta:** Instantânea e profissional\n'
+        '🎯 **Suporte:** Depósito/Saque, Promoções, Dúvidas\n\n'
+        '👆 **Clique no botão abaixo para abrir o Telegram agora!**'
+    )
+}
+# Gửi dạng văn bản thuần (không parse_mode): bỏ '**' một lần lúc import thay vì để lọt ra tin nhắn
+MENU_TEXTS = {key: text.replace('**', '') for key, text in MENU_TEXTS.items()}
+
+# Văn bản /help và /commands, dùng chung cho lệnh và nút cmd_help / cmd_commands
+HELP_TEXT = (
+    '🤖 **ABCDBET Customer Service Bot - Ajuda**\n\n'
+    '📋 **Comandos principais:**\n'
+    '/start - 🚀 Iniciar bot\n'
+    '/help - ❓ Ajuda e comandos\n'
+    '/menu - 📋 Menu Principal\n'
+    '/commands - 📋 Lista de comandos\n'
+    '/quick - ⚡ Comandos rápidos\n'
+    '/hint - 💡 Dicas de comandos\n\n'
+    '🎁 **Promoções e Bônus:**\n'
+    '/promotions - 🎁 Promoções e bônus\n'
+    '/deposit_packages - 💳 Pacotes de Depósito\n'
+    '/daily_first_deposit - 🌅 Primeiro Depósito do Dia\n'
+    '/vip - 👑 VIP Club\n'
+    '/referral - 🤝 Programa de Referência\n'
+    '/lucky_wheel - 🎡 Roda da Fortuna\n'
+    '/vip_roulette - 🎰 Roleta VIP\n\n'
+    '💰 **Depósito e Saque:**\n'
+    '/register - 📝 Cadastrar Conta\n'
+    '/deposit - 💰 Problema de Depósito\n'
+    '/withdraw - 💸 Problema de Saque\n'
+    '/status - 📊 Status da Conta\n\n'
+    '🆘 **Suporte e Informações:**\n'
+    '/support - 🆘 Suporte ao Cliente\n'
+    '/rules - 📜 Regras e Termos\n'
+    '/faq - ❓ Perguntas Frequentes\n'
+    '/contact - 📞 Contato Direto\n\n'
+    '🌐 **Configurações:**\n'
+    '/language - 🌐 Alterar Idioma\n'
+    '/download_app - 📱 Baixar App\n\n'
+    '🔐 **Lệnh Admin (chỉ dành cho admin):**\n'
+    '/bulk - 📢 Gửi tin nhắn hàng loạt\n'
+    '/manage_channels - ⚙️ Quản lý kênh chuyển tiếp\n'
+    '/stats - 📊 Xem thống kê khách hàng\n'
+    '/stop_bulk - 🛑 Dừng gửi tin nhắn hàng loạt\n'
+    '/reload - 🔄 Reload bot (Admin only)\n'
+    '/health - 🏥 Kiểm tra sức khỏe bot (Admin only)\n\n'
+    '💡 **Dica:** Use os botões do menu para navegar facilmente!\n'
+    '🔍 **Dica:** Digite / seguido do comando para usar qualquer função!'
+)
 
+COMMANDS_TEXT = (
+    '📋 **LISTA COMPLETA DE COMANDOS**\n\n'
+    '🚀 **COMANDOS PRINCIPAIS:**\n'
+    '• `/start` - Iniciar bot\n'
+    '• `/help` - Ajuda e comandos\n'
+    '• `/menu` - Menu Principal\n'
+    '• `/commands` - Esta lista de comandos\n\n'
+    '🎁 **PROMOÇÕES E BÔNUS:**\n'
+    '• `/promotions` - Promoções e bônus\n'
+    '• `/deposit_packages` - Pacotes de Depósito\n'
+    '• `/daily_first_deposit` - Primeiro Depósito do Dia\n'
+    '• `/vip` - VIP Club\n'
+    '• `/referral` - Programa de Referência\n'
+    '• `/lucky_wheel` - Roda da Fortuna\n'
+    '• `/vip_roulette` - Roleta VIP\n\n'
+    '💰 **DEPÓSITO E SAQUE:**\n'
+    '• `/register` - Cadastrar Conta\n'
+    '• `/deposit` - Problema de Depósito\n'
+    '• `/withdraw` - Problema de Saque\n'
+    '• `/status` - Status da Conta\n\n'
+    '🆘 **SUPORTE E INFORMAÇÕES:**\n'
+    '• `/support` - Suporte ao Cliente\n'
+    '• `/rules` - Regras e Termos\n'
+    '• `/faq` - Perguntas Frequentes\n'
+    '• `/contact` - Contato Direto\n\n'
+    '🌐 **CONFIGURAÇÕES:**\n'
+    '• `/language` - Alterar Idioma\n'
+    '• `/download_app` - Baixar App\n\n'
+    '🔐 **COMANDOS ADMIN:**\n'
+    '• `/bulk` - Gửi tin nhắn hàng loạt\n'
+    '• `/manage_channels` - Quản lý kênh\n'
+    '• `/stats` - Thống kê khách hàng\n'
+    '• `/stop_bulk` - Dừng gửi tin nhắn\n\n'
+    '💡 **DICA:** Digite `/` seguido do comando para usar qualquer função!\n'
+    '📱 **EXEMPLO:** `/vip`, `/status`, `/rules`'
+)
 
-def get_bulk_all_keyboard(language='pt'):
+
+@functools.lru_cache(maxsize=256)
+def _markup(*rows):
+    """InlineKeyboardMarkup từ các hàng (text, callback_data, url), cache theo bộ tuple bất biến"""
+    return InlineKeyboardMarkup([
+        [InlineKeyboardButton(text, callback_data=callback_data, url=url) for text, callback_data, url in row]
+        for row in rows
+    ])
+
+
+# Chuỗi thông báo đa ngôn ngữ: khóa -> ngôn ngữ -> chuỗi (có thể chứa {placeholder} cho str.format)
+MESSAGES = {
+    'stats_unavailable': {
+        'zh': '❌ 无法获取客户统计',
+        'en': '❌ Cannot get customer statistics',
+        'vi': '❌ Không thể lấy thống kê khách hàng'
+    },
+    'bulk_stop_error': {
+        'zh': '❌ 停止发送消息时出错\n\n错误: {error}\n\n请重试或使用命令 /stop_bulk',
+        'en': '❌ ERROR STOPPING MESSAGES\n\nError: {error}\n\nPlease try again or use command /stop_bulk',
+        'vi': '❌ LỖI KHI DỪNG GỬI TIN NHẮN\n\nLỗi: {error}\n\nVui lòng thử lại hoặc sử dụng lệnh /stop_bulk'
+    },
+    'manage_channels': {
+        'zh': '⚙️ **频道管理**\n\n📊 **当前统计:**\n• 总频道数: {channel_count}\n• 状态: ✅ 活跃\n\n**选择您要使用的功能:**',
+        'en': '⚙️ **CHANNEL MANAGEMENT**\n\n📊 **Current statistics:**\n• Total channels: {channel_count}\n• Status: ✅ Active\n\n**Select the function you want to use:**',
+        'vi': '⚙️ **QUẢN LÝ KÊNH CHUYỂN TIẾP**\n\n📊 **Thống kê hiện tại:**\n• Tổng số kênh: {channel_count}\n• Trạng thái: ✅ Hoạt động\n\n**Chọn chức năng bạn muốn sử dụng:**'
+    },
+    'select_channels': {
+        'zh': '🎯 **选择频道发送消息**\n\n📊 **当前统计:**\n• 总频道数: {channel_count}\n• 已选择: 0\n\n**请选择要发送消息的频道:**',
+        'en': '🎯 **SELECT CHANNELS TO SEND MESSAGE**\n\n📊 **Current statistics:**\n• Total channels: {channel_count}\n• Selected: 0\n\n**Please select channels to send message:**',
+        'vi': '🎯 **CHỌN KÊNH GỬI TIN NHẮN**\n\n📊 **Thống kê hiện tại:**\n• Tổng số kênh: {channel_count}\n• Đã chọn: 0\n\n**Hãy chọn các kênh bạn muốn gửi tin nhắn:**'
+    },
+    'add_channel': {
+        'zh': '➕ **添加新频道**\n\n**说明:**\n• 发送频道ID (例如: -1001234567890)\n• 或发送频道用户名 (例如: @channel_name)\n• 机器人将自动添加到列表\n\n**注意:** 机器人必须是频道的管理员才能转发消息!\n\n**请发送频道ID或用户名:**',
+        'en': '➕ **ADD NEW CHANNEL**\n\n**Instructions:**\n• Send channel ID (e.g., -1001234567890)\n• Or send channel username (e.g., @channel_name)\n• Bot will automatically add to the list\n\n**Note:** Bot must be admin of the channel to forward messages!\n\n**Please send channel ID or username:**',
+        'vi': '➕ **THÊM KÊNH MỚI**\n\n**Hướng dẫn:**\n• Gửi ID kênh \\(ví dụ: \\-1001234567890\\)\n• Hoặc gửi username kênh \\(ví dụ: @channel\\_name\\)\n• Bot sẽ tự động thêm vào danh sách\n\n**Lưu ý:** Bot phải là admin của kênh để có thể chuyển tiếp tin nhắn\\!\n\n**Hãy gửi ID hoặc username kênh:**'
+    },
+    'list_channels_header': {
+        'zh': '📋 **当前频道列表:**\n\n',
+        'en': '📋 **CURRENT CHANNEL LIST:**\n\n',
+        'vi': '📋 **DANH SÁCH KÊNH HIỆN TẠI:**\n\n'
+    },
+    'list_channels_total': {
+        'zh': '\n**总计:** {channel_count} 个频道',
+        'en': '\n**Total:** {channel_count} channels',
+        'vi': '\n**Tổng cộng:** {channel_count} kênh'
+    },
+    'list_channels_empty': {
+        'zh': '📋 **频道列表:**\n\n❌ 还没有添加任何频道',
+        'en': '📋 **CHANNEL LIST:**\n\n❌ No channels have been added yet',
+        'vi': '📋 **DANH SÁCH KÊNH:**\n\n❌ Chưa có kênh nào được thêm'
+    },
+    'remove_channel_empty': {
+        'zh': '❌ **删除频道**\n\n❌ 没有频道可以删除!',
+        'en': '❌ **DELETE CHANNEL**\n\n❌ No channels to delete!',
+        'vi': '❌ **XÓA KÊNH**\n\n❌ Không có kênh nào để xóa!'
+    },
+    'remove_channel': {
+        'zh': '❌ **删除频道**\n\n**选择您要删除的频道:**\n⚠️ **注意:** 此操作无法撤销!',
+        'en': '❌ **DELETE CHANNEL**\n\n**Select the channel you want to delete:**\n⚠️ **Warning:** This action cannot be undone!',
+        'vi': '❌ **XÓA KÊNH**\n\n**Chọn kênh bạn muốn xóa:**\n⚠️ **Lưu ý:** Hành động này không thể hoàn tác!'
+    },
+    'delete_channel_success': {
+        'zh': '✅ **频道删除成功!**\n\n**已删除的频道:** `{deleted_channel}`\n**剩余频道数:** {channel_count}\n\n**新频道列表:**\n{channel_list}',
+        'en': '✅ **CHANNEL DELETED SUCCESSFULLY!**\n\n**Deleted channel:** `{deleted_channel}`\n**Remaining channels:** {channel_count}\n\n**New channel list:**\n{channel_list}',
+        'vi': '✅ **ĐÃ XÓA KÊNH THÀNH CÔNG!**\n\n**Kênh đã xóa:** `{deleted_channel}`\n**Số kênh còn lại:** {channel_count}\n\n**Danh sách kênh mới:**\n{channel_list}'
+    },
+    'delete_channel_none_left': {
+        'zh': '❌ 没有剩余频道',
+        'en': '❌ No channels remaining',
+        'vi': '❌ Không còn kênh nào'
+    },
+    'delete_channel_invalid': {
+        'zh': '❌ **错误:** 频道索引无效!',
+        'en': '❌ **ERROR:** Invalid channel index!',
+        'vi': '❌ **LỖI:** Index kênh không hợp lệ!'
+    },
+    'delete_channel_error': {
+        'zh': '❌ 删除频道时出错\n\n错误: {error}',
+        'en': '❌ ERROR DELETING CHANNEL\n\nError: {error}',
+        'vi': '❌ LỖI KHI XÓA KÊNH\n\nLỗi: {error}'
+    }
+}
+
+
+def get_message(key, language='vi', **kwargs):
+    """Lấy chuỗi thông báo theo ngôn ngữ (mặc định tiếng Việt), điền placeholder nếu có"""
+    texts = MESSAGES[key]
+    text = texts.get(language, texts['vi'])
+    return text.format(**kwargs) if kwargs else text
+
+
+def _build_bulk_all_keyboard(language='pt'):
     """Tạo keyboard cho menu gửi tin nhắn đến tất cả theo ngôn ngữ"""
     if language == 'zh':
         return [
@@ -484,7 +1628,7 @@ def get_bulk_all_keyboard(language='pt'):
         ]
 
 
-def get_bulk_filter_keyboard(language='pt'):
+def _build_bulk_filter_keyboard(language='pt'):
     """Tạo keyboard cho menu gửi tin nhắn theo bộ lọc theo ngôn ngữ"""
     if language == 'zh':
         return [
@@ -516,7 +1660,7 @@ def get_bulk_filter_keyboard(language='pt'):
         ]
 
 
-def get_bulk_templates_keyboard(language='vi'):
+def _build_bulk_templates_keyboard(language='vi'):
     """Tạo keyboard cho menu template tin nhắn theo ngôn ngữ"""
     if language == 'zh':
         return [
@@ -535,7 +1679,7 @@ def get_bulk_templates_keyboard(language='vi'):
         ]
 
 
-def get_bulk_stats_keyboard(language='vi'):
+def _build_bulk_stats_keyboard(language='vi'):
     """Tạo keyboard cho menu thống kê theo ngôn ngữ"""
     if language == 'zh':
         return [
@@ -554,49 +1698,135 @@ def get_bulk_stats_keyboard(language='vi'):
         ]
 
 
+# Keyboard theo ngôn ngữ không đổi, dựng một lần khi import và dùng lại cho mọi lần gọi
+_MENU_LANGUAGES = ('zh', 'en', 'vi', 'pt')
+_MENU_CACHE = {
+    name: {
+        lang: tuple(tuple(row) for row in builder(lang))
+        for lang in _MENU_LANGUAGES
+    }
+    for name, builder in (
+        ('bulk_menu', _build_bulk_messaging_menu_keyboard),
+        ('scheduled_forward_menu', _build_scheduled_forward_menu_keyboard),
+        ('bulk_all', _build_bulk_all_keyboard),
+        ('bulk_filter', _build_bulk_filter_keyboard),
+        ('bulk_templates', _build_bulk_templates_keyboard),
+        ('bulk_stats', _build_bulk_stats_keyboard),
+        ('admin_commands', _build_admin_commands),
+    )
+}
+
+
+def _cached_menu(name, language):
+    """Lấy keyboard đã dựng sẵn, ngôn ngữ không hỗ trợ dùng bản mặc định (pt)"""
+    table = _MENU_CACHE[name]
+    return table.get(language) or table['pt']
+
+
+def get_bulk_messaging_menu_keyboard(language='pt'):
+    """Keyboard menu bulk messaging theo ngôn ngữ"""
+    return _cached_menu('bulk_menu', language)
+
+
+def get_scheduled_forward_menu_keyboard(language='pt'):
+    """Keyboard menu hẹn giờ chuyển tiếp theo ngôn ngữ"""
+    return _cached_menu('scheduled_forward_menu', language)
+
+
+def get_bulk_all_keyboard(language='pt'):
+    """Keyboard menu gửi tin nhắn đến tất cả theo ngôn ngữ"""
+    return _cached_menu('bulk_all', language)
+
+
+def get_bulk_filter_keyboard(language='pt'):
+    """Keyboard menu gửi tin nhắn theo bộ lọc theo ngôn ngữ"""
+    return _cached_menu('bulk_filter', language)
+
+
+def get_bulk_templates_keyboard(language='vi'):
+    """Keyboard menu template tin nhắn theo ngôn ngữ"""
+    return _cached_menu('bulk_templates', language)
+
+
+def get_bulk_stats_keyboard(language='vi'):
+    """Keyboard menu thống kê theo ngôn ngữ"""
+    return _cached_menu('bulk_stats', language)
+
+
+def get_admin_commands(language='pt'):
+    """Danh sách lệnh admin (command, description) theo ngôn ngữ"""
+    return _cached_menu('admin_commands', language)
+
+
+# BotCommand của admin theo ngôn ngữ, dựng một lần
+_ADMIN_COMMAND_OBJS = {
+    lang: [BotCommand(command, description) for command, description in get_admin_commands(lang)]
+    for lang in _MENU_LANGUAGES
+}
+
+# Ngôn ngữ commands đã set gần nhất cho từng admin (bỏ qua set_my_commands nếu không đổi)
+_LAST_USER_LANG = {}
+
+
+def get_admin_command_objects(language='pt'):
+    """Danh sách BotCommand của admin theo ngôn ngữ"""
+    return _ADMIN_COMMAND_OBJS.get(language) or _ADMIN_COMMAND_OBJS['pt']
+
+
 async def _forward_media_to_customers(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int):
     """Helper function để forward media đến tất cả khách hàng"""
     try:
-        customers = sheets_manager.get_all_customers()
+        customers = await get_customers_cached()
 
         if customers:
             forwarded_count = 0
             failed_count = 0
-
+            sent_ids = []
+            semaphore = asyncio.Semaphore(CUSTOMER_FORWARD_CONCURRENCY)
+            from_chat_id = update.effective_chat.id
+            message_id = update.message.message_id
+
+            async def _send_one(customer_user_id):
+                # Forward media message (giữ nguyên định dạng gốc, emoji động)
+                async with semaphore:
+                    await _rate_limited_forward(context.bot, customer_user_id, from_chat_id, message_id)
+
+            # user_id đã được chuẩn hóa thành int trong get_all_customers
+            admin_id = int(user_id)
+            targets = []
             for customer in customers:
-                try:
-                    customer_user_id = customer.get('user_id')
-                    if customer_user_id:
-                        # Không gửi lại cho admin đang thao tác
-                        if str(customer_user_id) == str(user_id):
-                            print(f"⏭️ Bỏ qua admin {customer_user_id} (không gửi lại cho chính mình)")
-                            continue
-
-                        # Forward media message (giữ nguyên định dạng gốc, emoji động)
-                        await context.bot.forward_message(
-                            chat_id=int(customer_user_id),
-                            from_chat_id=update.effective_chat.id,
-                            message_id=update.message.message_id
-                        )
-                        forwarded_count += 1
-
-                        # Cập nhật trạng thái trong Google Sheets
-                        sheets_manager.update_customer_message_status(customer_user_id, True)
-
-                        # Ghi log
-                        sheets_manager.add_message_log(
-                            customer_user_id,
-                            f"Forwarded media message from admin {user_id}",
-                            'forward_media',
-                            'sent'
-                        )
-
-                    else:
-                        failed_count += 1
-
-                except Exception as e:
+                customer_user_id = customer.get('user_id')
+                if not customer_user_id:
                     failed_count += 1
-                    logger.error(f"Lỗi forward media đến user {customer.get('user_id')}: {e}")
+                    continue
+                # Không gửi lại cho admin đang thao tác
+                if customer_user_id == admin_id:
+                    logger.debug("⏭️ Bỏ qua admin %s (không gửi lại cho chính mình)", customer_user_id)
+                    continue
+                targets.append(customer_user_id)
+
+            results = await asyncio.gather(*[_send_one(cid) for cid in targets], return_exceptions=True)
+            for customer_user_id, result in zip(targets, results):
+                if isinstance(result, Exception):
+                    failed_count += 1
+                    logger.error("Lỗi forward media đến user %s: %s", customer_user_id, result)
+                else:
+                    forwarded_count += 1
+                    sent_ids.append(customer_user_id)
+
+            # Cập nhật Google Sheets một lần sau khi gửi xong (chạy trong thread riêng)
+            if sent_ids:
+                log_content = f"Forwarded media message from admin {user_id}"
+                log_rows = [
+                    {
+                        'user_id': customer_user_id,
+                        'message_content': log_content,
+                        'message_type': 'forward_media',
+                        'status': 'sent'
+                    }
+                    for customer_user_id in sent_ids
+                ]
+                await _flush_forward_sheets(sent_ids, log_rows)
 
             # Thông báo kết quả
             await update.message.reply_text(
@@ -616,90 +1846,20 @@ async def _forward_media_to_customers(update: Update, context: ContextTypes.DEFA
     except Exception as e:
         logger.error(f"Lỗi forward media: {e}")
         await update.message.reply_text(
-            f'❌ **LỖI KHI FORWARD MEDIA**\n\n'
+            f'❌ LỖI KHI FORWARD MEDIA\n\n'
             f'Lỗi: {str(e)}\n\n'
             'Vui lòng thử lại.',
         )
 
 
-async def _send_message_to_channel(update: Update, context: ContextTypes.DEFAULT_TYPE, user_id: int):
-    """Helper function để gửi tin nhắn đến tất cả các kênh (không hiển thị thông tin forward)"""
-    try:
-        # Lấy danh sách kênh từ bot_config
-        forward_channels = getattr(bot_config, 'FORWARD_CHANNELS', [])
-        if not forward_channels:
-            await update.message.reply_text(
-                '❌ **LỖI: CHƯA CẤU HÌNH KÊNH**\n\n'
-                'Vui lòng cấu hình FORWARD_CHANNELS trong bot_config.py để sử dụng tính năng này.',
-            )
-            return
-
-        # Gửi tin nhắn đến tất cả các kênh (không hiển thị thông tin forward)
-        success_count = 0
-        failed_count = 0
-        failed_channels = []
-
-        for channel_id in forward_channels:
-            try:
-                # Sử dụng forward_message để giữ emoji động
-                await context.bot.forward_message(
-                    chat_id=channel_id,
-                    from_chat_id=update.effective_chat.id,
-                    message_id=update.message.message_id
-                )
-                success_count += 1
-                logger.info(f"✅ Đã forward tin nhắn đến kênh {channel_id} (giữ emoji động)")
-
-            except Exception as e:
-                failed_count += 1
-                failed_channels.append(f"{channel_id} ({str(e)})")
-                logger.error(f"❌ Lỗi gửi tin nhắn đến kênh {channel_id}: {e}")
-
-        # Thông báo kết quả
-        result_message = '✅ **ĐÃ GỬI TIN NHẮN ĐẾN {} KÊNH!**\n\n'.format(len(forward_channels))
-        result_message += '**Kết quả:**\n'
-        result_message += '✅ **Thành công:** {} kênh\n'.format(success_count)
-
-        if failed_count > 0:
-            result_message += '❌ **Thất bại:** {} kênh\n'.format(failed_count)
-            result_message += '**Kênh lỗi:**\n'
-            for failed in failed_channels[:5]:  # Chỉ hiển thị 5 kênh lỗi đầu tiên
-                result_message += '• {}\n'.format(failed)
-            if len(failed_channels) > 5:
-                result_message += '• ... và {} kênh khác\n'.format(len(failed_channels) - 5)
-
-        result_message += '\n**Lưu ý:** Media đã được forward với định dạng gốc, giữ nguyên emoji động.'
-
-        await update.message.reply_text(result_message)
-
-        # Ghi log
-        sheets_manager.add_message_log(
-            str(user_id),
-            f"Forwarded media to {success_count}/{len(forward_channels)} channels",
-            'forward_media_to_channels',
-            'sent'
-        )
-
-    except Exception as e:
-        logger.error(f"Lỗi chuyển tiếp media đến kênh: {e}")
-        await update.message.reply_text(
-            f'❌ **LỖI KHI CHUYỂN TIẾP MEDIA ĐẾN KÊNH**\n\n'
-            f'Lỗi: {str(e)}\n\n'
-            'Vui lòng kiểm tra:\n'
-            '• FORWARD_CHANNELS có được cấu hình đúng không\n'
-            '• Bot có quyền gửi tin nhắn đến các kênh không\n'
-            '• Các kênh có tồn tại không',
-        )
-
-
-async def log_user_interaction(update: Update):
-    """Registrar interação do usuário no Google Sheets"""
+def log_user_interaction(update: Update):
+    """Registrar interação do usuário no Google Sheets (enfileira sem bloquear; gravação em segundo plano)"""
     try:
         user = update.effective_user
         user_id = user.id
         username = user.username or 'N/A'
         full_name = user.full_name or 'N/A'
-        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        timestamp = now_str()
 
         # Criar dados para registrar no sheets
         user_data_to_log = {
@@ -709,57 +1869,243 @@ async def log_user_interaction(update: Update):
             'time': timestamp
         }
 
-        # Registrar no Google Sheets
+        # Enfileirar; _log_consumer grava no Google Sheets em lote
         if sheets_manager:
-            success = sheets_manager.add_customer(user_data_to_log)
-            if success:
-                logger.info(
-                    f"Registrada interação do usuário: {user_id} - {username}"
-                )
-            else:
-                logger.warning(
-                    f"Falha ao registrar interação do usuário: {user_id}"
-                )
+            _LOG_QUEUE.put_nowait(user_data_to_log)
 
+    except asyncio.QueueFull:
+        logger.warning("Fila de registro cheia, descartando interação do usuário: %s", user_id)
     except Exception as e:
         logger.error(f"Erro ao registrar interação do usuário: {e}")
 
 
-async def show_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
+async def _log_consumer():
+    """Gom tối đa LOG_BATCH_SIZE bản ghi hoặc chờ LOG_FLUSH_INTERVAL giây rồi ghi một lần"""
+    loop = asyncio.get_running_loop()
+    while True:
+        batch = [await _LOG_QUEUE.get()]
+        deadline = loop.time() + LOG_FLUSH_INTERVAL
+        while len(batch) < LOG_BATCH_SIZE:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(_LOG_QUEUE.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        try:
+            success = await _sheets(sheets_manager.batch_add_customers, batch)
+            invalidate_customers_cache()
+            if success:
+                logger.info("Registradas %s interações de usuários", len(batch))
+            else:
+                logger.warning("Falha ao registrar %s interações de usuários", len(batch))
+        except Exception as e:
+            logger.error(f"Erro ao registrar interações de usuários: {e}")
+
+
+def _count_bulk_result(job_id, key, count=1):
+    """Cộng kết quả gửi vào thống kê chung và thống kê của đợt gửi"""
+    _BULK_SEND_STATS[key] += count
+    job = _BROADCAST_JOBS.get(job_id)
+    if job is not None:
+        job[key] += count
+
+
+def _job_stopped(job_id):
+    """Đợt gửi đã bị admin dừng (hoặc đã hết hạn trong _BROADCAST_JOBS)"""
+    job = _BROADCAST_JOBS.get(job_id)
+    return job is None or job['stopped']
+
+
+def stop_broadcast_jobs():
+    """Dừng mọi đợt gửi đang chạy; đợt tạo sau đó không bị ảnh hưởng"""
+    for job in _BROADCAST_JOBS.values():
+        if job['sent'] + job['failed'] + job['skipped'] < job['total']:
+            job['stopped'] = True
+    bulk_messaging_manager.stop_bulk_messaging()
+
+
+async def _bulk_send_worker():
+    """Lấy người nhận từ _BULK_SEND_QUEUE và gửi tin nhắn theo nhịp _BULK_LIMITER, tôn trọng giới hạn toàn bot và theo chat"""
+    while True:
+        job_id, customer, message_content = await _BULK_SEND_QUEUE.get()
+        chat_id = customer.get('user_id')
+        try:
+            if _job_stopped(job_id):
+                _count_bulk_result(job_id, 'skipped')
+                continue
+
+            chat_id = int(chat_id)
+            async with _BULK_LIMITER:
+                await _rate_limited_call(
+                    chat_id, bulk_messaging_manager.send_to_customer,
+                    customer=customer, message_content=message_content
+                )
+            _count_bulk_result(job_id, 'sent')
+            job = _BROADCAST_JOBS.get(job_id)
+            if job is not None:
+                job['sent_ids'].append(chat_id)
+        except Exception as e:
+            _count_bulk_result(job_id, 'failed')
+            job = _BROADCAST_JOBS.get(job_id)
+            if job is not None:
+                job['failed_ids'].append(chat_id)
+            logger.error("Lỗi gửi tin nhắn hàng loạt đến %s: %s", chat_id, e)
+        finally:
+            _BULK_SEND_QUEUE.task_done()
+
+        # Đợt gửi xong: ghi trạng thái và log vào Google Sheets một lần
+        job = _BROADCAST_JOBS.get(job_id)
+        if job is not None and not job['flushed'] and job['sent'] + job['failed'] + job['skipped'] >= job['total']:
+            job['flushed'] = True
+            logs = [
+                {'user_id': uid, 'message_content': job['log_text'], 'message_type': 'bulk_message', 'status': status}
+                for status, uids in (('sent', job['sent_ids']), ('failed', job['failed_ids']))
+                for uid in uids
+            ]
+            await _flush_forward_sheets(job['sent_ids'], logs)
+
+
+async def _enqueue_bulk_recipients(job_id, recipients, message_content):
+    """Đưa người nhận vào hàng đợi (chờ khi hàng đợi đầy để tạo backpressure); dừng sớm khi đợt gửi bị dừng"""
+    for index, customer in enumerate(recipients):
+        if _job_stopped(job_id):
+            _count_bulk_result(job_id, 'skipped', len(recipients) - index)
+            return
+        await _BULK_SEND_QUEUE.put((job_id, customer, message_content))
+
+
+async def enqueue_bulk_message(message_content, filter_type=None, filter_value=None):
+    """Chọn tối đa BULK_BATCH_LIMIT người nhận và đưa vào hàng đợi gửi, trả về (job_id, số người nhận)"""
+    if filter_type and filter_value:
+        customers = await _sheets(sheets_manager.get_customers_by_filter, filter_type, filter_value)
+    else:
+        customers = await get_customers_cached()
+
+    recipients = bulk_messaging_manager.select_recipients(customers or [])
+    if len(recipients) > BULK_BATCH_LIMIT:
+        logger.info(
+            "⚠️ Chỉ gửi %s/%s khách hàng để tránh spam. Chạy lại để gửi tiếp.", BULK_BATCH_LIMIT, len(recipients)
+        )
+        recipients = recipients[:BULK_BATCH_LIMIT]
+    job_id = next(_BROADCAST_SEQ)
+    _BROADCAST_JOBS[job_id] = {
+        'total': len(recipients), 'sent': 0, 'failed': 0, 'skipped': 0,
+        'sent_ids': [], 'failed_ids': [], 'flushed': False, 'stopped': False,
+        'log_text': message_content
+    }
+    if recipients:
+        _BULK_SEND_STATS['queued'] += len(recipients)
+        current_application.create_task(_enqueue_bulk_recipients(job_id, recipients, message_content))
+    return job_id, len(recipients)
+
+
+async def _forward_send_worker():
+    """Lấy người nhận từ _FORWARD_QUEUE và forward tin nhắn của admin qua rate limiter"""
+    while True:
+        job_id, chat_id, from_chat_id, message_id = await _FORWARD_QUEUE.get()
+        try:
+            if _job_stopped(job_id):
+                _count_bulk_result(job_id, 'skipped')
+            else:
+                # Forward (giữ nguyên định dạng gốc, emoji động)
+                await _rate_limited_forward(current_application.bot, int(chat_id), from_chat_id, message_id)
+                _count_bulk_result(job_id, 'sent')
+                job = _BROADCAST_JOBS.get(job_id)
+                if job is not None:
+                    job['sent_ids'].append(chat_id)
+        except Exception as e:
+            _count_bulk_result(job_id, 'failed')
+            logger.error("Lỗi forward tin nhắn đến user %s: %s", chat_id, e)
+        finally:
+            _FORWARD_QUEUE.task_done()
+
+        # Đợt forward xong: ghi trạng thái và log vào Google Sheets một lần
+        job = _BROADCAST_JOBS.get(job_id)
+        if job is not None and not job['flushed'] and job['sent'] + job['failed'] + job['skipped'] >= job['total']:
+            job['flushed'] = True
+            logs = [
+                {'user_id': uid, 'message_content': job['log_text'], 'message_type': 'forward_message', 'status': 'sent'}
+                for uid in job['sent_ids']
+            ]
+            await _flush_forward_sheets(job['sent_ids'], logs)
+
+
+async def _enqueue_forward_recipients(job_id, recipients, from_chat_id, message_id):
+    """Đưa người nhận forward vào hàng đợi (chờ khi hàng đợi đầy để tạo backpressure); dừng sớm khi đợt gửi bị dừng"""
+    for index, chat_id in enumerate(recipients):
+        if _job_stopped(job_id):
+            _count_bulk_result(job_id, 'skipped', len(recipients) - index)
+            return
+        await _FORWARD_QUEUE.put((job_id, chat_id, from_chat_id, message_id))
+
+
+def enqueue_forward_broadcast(customers, from_chat_id, message_id, admin_user_id):
+    """Xếp hàng forward một tin nhắn đến mọi khách hàng (trừ admin đang thao tác), trả về (job_id, số người nhận)"""
+    admin_uid = str(admin_user_id)
+    recipients = []
+    for customer in customers:
+        customer_user_id = customer.get('user_id')
+        if customer_user_id and str(customer_user_id) != admin_uid:
+            recipients.append(customer_user_id)
+
+    job_id = next(_BROADCAST_SEQ)
+    _BROADCAST_JOBS[job_id] = {
+        'total': len(recipients), 'sent': 0, 'failed': 0, 'skipped': 0,
+        'sent_ids': [], 'flushed': False, 'stopped': False,
+        'log_text': f"Forwarded message from admin {admin_user_id}"
+    }
+    if recipients:
+        _BULK_SEND_STATS['queued'] += len(recipients)
+        current_application.create_task(_enqueue_forward_recipients(job_id, recipients, from_chat_id, message_id))
+    return job_id, len(recipients)
+
+
+def _bulk_progress_text(language, template_name, job_id, job):
+    """Nội dung tiến độ của một đợt gửi template theo ngôn ngữ"""
+    done = job['sent'] + job['failed'] + job['skipped']
+    if language == 'zh':
+        title = '✅ **发送完成!**' if done >= job['total'] else '⏳ **正在发送消息...**'
+        return (f"{title}\n\n**模板:** {template_name}\n**任务:** #{job_id}\n"
+                f"**进度:** {done}/{job['total']}\n✅ {job['sent']}  ❌ {job['failed']}  ⏭️ {job['skipped']}")
+    elif language == 'en':
+        title = '✅ **SENDING COMPLETED!**' if done >= job['total'] else '⏳ **SENDING MESSAGES...**'
+        return (f"{title}\n\n**Template:** {template_name}\n**Job:** #{job_id}\n"
+                f"**Progress:** {done}/{job['total']}\n✅ {job['sent']}  ❌ {job['failed']}  ⏭️ {job['skipped']}")
+    else:
+        title = '✅ **ĐÃ GỬI XONG!**' if done >= job['total'] else '⏳ **ĐANG GỬI TIN NHẮN...**'
+        return (f"{title}\n\n**Template:** {template_name}\n**Đợt gửi:** #{job_id}\n"
+                f"**Tiến độ:** {done}/{job['total']}\n✅ {job['sent']}  ❌ {job['failed']}  ⏭️ {job['skipped']}")
+
+
+async def _report_bulk_progress(job_id, chat_id, message_id, language, template_name, reply_markup):
+    """Cập nhật tin nhắn tiến độ mỗi BULK_PROGRESS_INTERVAL giây cho đến khi đợt gửi hoàn tất"""
+    last_text = None
+    while True:
+        await asyncio.sleep(BULK_PROGRESS_INTERVAL)
+        job = _BROADCAST_JOBS.get(job_id)
+        if job is None:
+            return
+
+        text = _bulk_progress_text(language, template_name, job_id, job)
+        if text != last_text:
+            try:
+                await current_application.bot.edit_message_text(
+                    text, chat_id=chat_id, message_id=message_id, reply_markup=reply_markup
+                )
+                last_text = text
+            except Exception as e:
+                logger.warning("Không cập nhật được tiến độ đợt gửi #%s: %s", job_id, e)
+
+        if job['sent'] + job['failed'] + job['skipped'] >= job['total']:
+            return
+
+
+async def show_main_menu(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Mostrar menu principal"""
-    keyboard = [
-        [
-            InlineKeyboardButton(
-                '📝 Cadastrar Conta',
-                callback_data='register'
-            ),
-            InlineKeyboardButton(
-                '💰 Problema de Depósito',
-                callback_data='deposit'
-            )
-        ],
-        [
-            InlineKeyboardButton(
-                '💸 Problema de Saque',
-                callback_data='withdraw'
-            ),
-            InlineKeyboardButton(
-                '🎁 Programas Promocionais',
-                callback_data='promotions'
-            )
-        ],
-        [
-            InlineKeyboardButton(
-                '🆘 Atendimento ao Cliente Online',
-                callback_data='support'
-            ),
-            InlineKeyboardButton(
-                '💬 Atendimento ao Cliente Telegram',
-                callback_data='telegram_support'
-            )
-        ]
-    ]
-    reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = MAIN_MENU_KB
 
     if update.callback_query:
         await update.callback_query.edit_message_text(
@@ -780,12 +2126,10 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     user_id = update.effective_user.id
     user_data[user_id] = {}
 
-    # Debug logging để kiểm tra
-    print(f"🚀 START command được gọi bởi user {user_id}")
-    logger.info(f"START command được gọi bởi user {user_id}")
+    logger.info("START command được gọi bởi user %s", user_id)
 
-    # Registrar interação do usuário
-    await log_user_interaction(update)
+    # Registrar interação do usuário (não bloqueia a resposta)
+    log_user_interaction(update)
 
     # Inicializar notification system se não existir
     if not get_notification_manager():
@@ -798,561 +2142,485 @@ async def start(update: Update, context: ContextTypes.DEFAULT_TYPE):
     await show_main_menu(update, context)
 
 
-async def handle_bulk_messaging_callbacks(query, context):
-    """Xử lý các callback cho chức năng gửi tin nhắn hàng loạt"""
-    try:
-        # Lấy ngôn ngữ hiện tại từ user_data
-        language = context.user_data.get('bulk_language', 'vi')
+async def handle_bulk_all(query, context, language):
+    """Gửi tin nhắn đến tất cả khách hàng"""
+    keyboard = get_bulk_all_keyboard(language)
+    reply_markup = InlineKeyboardMarkup(keyboard)
 
-        if query.data == 'bulk_all':
-            # Gửi tin nhắn đến tất cả khách hàng
-            keyboard = get_bulk_all_keyboard(language)
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    await edit_message_text_if_changed(
+        query,
+        get_bulk_all_title(language),
+        reply_markup=reply_markup,
+    )
 
-            await query.edit_message_text(
-                get_bulk_all_title(language),
-                reply_markup=reply_markup,
-            )
 
-        elif query.data == 'bulk_filter':
-            # Gửi tin nhắn theo bộ lọc
-            keyboard = get_bulk_filter_keyboard(language)
-            reply_markup = InlineKeyboardMarkup(keyboard)
+async def handle_bulk_filter(query, context, language):
+    """Gửi tin nhắn theo bộ lọc"""
+    keyboard = get_bulk_filter_keyboard(language)
+    reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(
-                get_bulk_filter_title(language),
-                reply_markup=reply_markup,
-            )
+    await edit_message_text_if_changed(
+        query,
+        get_bulk_filter_title(language),
+        reply_markup=reply_markup,
+    )
 
-        elif query.data == 'bulk_schedule':
-            # Lên lịch gửi tin nhắn
-            if language == 'zh':
-                back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_back')
-            elif language == 'en':
-                back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_back')
-            else:
-                back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_back')
 
-            await query.edit_message_text(
-                get_bulk_schedule_title(language),
-                reply_markup=InlineKeyboardMarkup([[back_button]])
-            )
+async def handle_bulk_schedule(query, context, language):
+    """Lên lịch gửi tin nhắn"""
+    await edit_message_text_if_changed(
+        query,
+        get_bulk_schedule_title(language),
+        reply_markup=get_back_markup(query.data, language)
+    )
 
-        elif query.data == 'bulk_templates':
-            # Hiển thị template tin nhắn
-            templates = bulk_messaging_manager.get_message_templates()
-            template_text = get_bulk_templates_title(language)
 
-            for i, template in enumerate(templates, 1):
-                template_text += f"{i}. **{template['name']}**\n"
-                template_text += f"   {template['content']}\n\n"
+async def handle_bulk_templates(query, context, language):
+    """Hiển thị template tin nhắn"""
+    templates = _cached_templates()
+    parts = [get_bulk_templates_title(language)]
+    for i, template in enumerate(templates, 1):
+        parts.append(f"{i}. **{template['name']}**\n   {template['content']}\n\n")
+    template_text = ''.join(parts)
 
-            keyboard = get_bulk_templates_keyboard(language)
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    keyboard = get_bulk_templates_keyboard(language)
+    reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(
-                template_text,
-                reply_markup=reply_markup,
-            )
+    await edit_message_text_if_changed(
+        query,
+        template_text,
+        reply_markup=reply_markup,
+    )
 
-        elif query.data == 'bulk_stats':
-            # Hiển thị thống kê khách hàng
-            stats = sheets_manager.get_customer_stats()
-            if stats:
-                if language == 'zh':
-                    stats_message = f"""
-{get_bulk_stats_title(language)}👥 **总客户数:** {stats['total']}
-📅 **今天:** {stats['today']}
-📆 **本周:** {stats['week']}
-🗓️ **本月:** {stats['month']}
-
-🔄 **最后更新:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-                    """
-                elif language == 'en':
-                    stats_message = f"""
-{get_bulk_stats_title(language)}👥 **Total customers:** {stats['total']}
-📅 **Today:** {stats['today']}
-📆 **This week:** {stats['week']}
-🗓️ **This month:** {stats['month']}
-
-🔄 **Last updated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-                    """
-                else:
-                    stats_message = f"""
-{get_bulk_stats_title(language)}👥 **Tổng số khách hàng:** {stats['total']}
-📅 **Hôm nay:** {stats['today']}
-📆 **Tuần này:** {stats['week']}
-🗓️ **Tháng này:** {stats['month']}
 
-🔄 **Cập nhật lần cuối:** {datetime.now().strftime('%Y-%m:%S')}
-                    """
-            else:
-                if language == 'zh':
-                    stats_message = "❌ 无法获取客户统计"
-                elif language == 'en':
-                    stats_message = "❌ Cannot get customer statistics"
-                else:
-                    stats_message = "❌ Không thể lấy thống kê khách hàng"
+async def handle_bulk_stats(query, context, language):
+    """Hiển thị thống kê khách hàng"""
+    stats = await get_customer_stats_cached()
+    if stats:
+        stats_message = _BULK_STATS_TEMPLATES.get(language, _BULK_STATS_TEMPLATES['vi']).substitute(
+            title=get_bulk_stats_title(language),
+            ts=now_str(),
+            **stats
+        )
+    else:
+        stats_message = get_message('stats_unavailable', language)
 
-            keyboard = get_bulk_stats_keyboard(language)
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    keyboard = get_bulk_stats_keyboard(language)
+    reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(
-                stats_message,
-                reply_markup=reply_markup,
-            )
+    await edit_message_text_if_changed(
+        query,
+        stats_message,
+        reply_markup=reply_markup,
+    )
 
-        elif query.data == 'bulk_stop':
-            # Dừng gửi tin nhắn hàng loạt
-            language = context.user_data.get('bulk_language', 'vi')
 
-            try:
-                bulk_messaging_manager.stop_bulk_messaging()
-
-                if language == 'zh':
-                    success_message = '🛑 **已停止批量发送消息!**\n\n机器人将在完成当前消息后停止发送消息。\n\n您可以通过发送命令 /stop_bulk 来检查状态'
-                    back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_back')
-                elif language == 'en':
-                    success_message = '🛑 **BULK MESSAGING STOPPED!**\n\nBot will stop sending messages after completing the current message.\n\nYou can check status by sending command /stop_bulk'
-                    back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_back')
-                else:
-                    success_message = '🛑 **ĐÃ DỪNG GỬI TIN NHẮN HÀNG LOẠT!**\n\nBot sẽ dừng gửi tin nhắn sau khi hoàn thành tin nhắn hiện tại.\n\nBạn có thể kiểm tra trạng thái bằng cách gửi lệnh /stop_bulk'
-                    back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_back')
+async def handle_bulk_stop(query, context, language):
+    """Dừng gửi tin nhắn hàng loạt"""
+    try:
+        stop_broadcast_jobs()
 
-                await query.edit_message_text(
-                    success_message,
-                    reply_markup=InlineKeyboardMarkup([[back_button]])
-                )
-            except Exception as e:
-                logger.error(f"Lỗi khi dừng gửi tin nhắn hàng loạt: {e}")
-
-                if language == 'zh':
-                    error_message = f'❌ **停止发送消息时出错**\n\n错误: {str(e)}\n\n请重试或使用命令 /stop_bulk'
-                    back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_back')
-                elif language == 'en':
-                    error_message = f'❌ **ERROR STOPPING MESSAGES**\n\nError: {str(e)}\n\nPlease try again or use command /stop_bulk'
-                    back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_back')
-                else:
-                    error_message = f'❌ **LỖI KHI DỪNG GỬI TIN NHẮN**\n\nLỗi: {str(e)}\n\nVui lòng thử lại hoặc sử dụng lệnh /stop_bulk'
-                    back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_back')
+        success_message = get_i18n(query.data, language)
 
-                await query.edit_message_text(
-                    error_message,
-                    reply_markup=InlineKeyboardMarkup([[back_button]])
-                )
+        await edit_message_text_if_changed(
+            query,
+            success_message,
+            reply_markup=get_back_markup(query.data, language)
+        )
+    except Exception as e:
+        logger.error(f"Lỗi khi dừng gửi tin nhắn hàng loạt: {e}")
 
-        elif query.data == 'bulk_input_message':
-            # Hiển thị hướng dẫn và lắng nghe tin nhắn từ người dùng
-            language = context.user_data.get('bulk_language', 'vi')
+        error_message = get_message('bulk_stop_error', language, error=str(e))
 
-            if language == 'zh':
-                title = '📝 **发送消息或媒体到帖子**\n\n**允许的媒体:**\n• 图片、视频、相册、文件\n• 贴纸、GIF、音频\n• 语音消息、圆形视频\n\n💡 **要将媒体附加到消息，请在此处发送**\n\n**现在请发送您的消息或媒体:**'
-                back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_back')
-            elif language == 'en':
-                title = '📝 **SEND MESSAGE OR MEDIA TO POST**\n\n**Allowed media:**\n• Images, videos, albums, files\n• Stickers, GIFs, audio\n• Voice messages, video notes\n\n💡 **To attach media to message, send here**\n\n**Now please send your message or media:**'
-                back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_back')
-            else:
-                title = '📝 **GỬI TIN NHẮN HOẶC PHƯƠNG TIỆN VÀO BÀI ĐĂNG**\n\n**Phương tiện được phép:**\n• Ảnh, video, album, tệp\n• Nhãn dán, GIF, âm thanh\n• Tin nhắn thoại, video tròn\n\n💡 **Để đính kèm phương tiện vào tin nhắn, hãy gửi tại đây**\n\n**Bây giờ hãy gửi tin nhắn hoặc media của bạn:**'
-                back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_back')
+        await edit_message_text_if_changed(
+            query,
+            error_message,
+            reply_markup=back_markup(language, 'bulk_back')
+        )
 
-            await query.edit_message_text(
-                title,
-                reply_markup=InlineKeyboardMarkup([[back_button]])
-            )
 
-            # Đặt trạng thái để bot lắng nghe tin nhắn từ người dùng
-            context.user_data['waiting_for_message'] = True
-            context.user_data['message_type'] = 'bulk_input'
+async def handle_bulk_input_message(query, context, language):
+    """Hiển thị hướng dẫn và lắng nghe tin nhắn từ người dùng"""
+    title = get_i18n(query.data, language)
 
-        elif query.data == 'bulk_forward_to_channel':
-            # Chuyển tiếp tin nhắn đến kênh
-            language = context.user_data.get('bulk_language', 'vi')
+    await edit_message_text_if_changed(
+        query,
+        title,
+        reply_markup=get_back_markup(query.data, language)
+    )
 
-            if language == 'zh':
-                title = '📢 **转发消息到频道**\n\n**使用方法:**\n• 发送任意文本消息 → 机器人将转发到频道\n• 发送媒体 (图片、视频、文件、音频) → 机器人将转发媒体\n• 无需选择消息类型，机器人自动识别!\n\n**请发送要转发到频道的消息或媒体:**'
-                back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_back')
-            elif language == 'en':
-                title = '📢 **FORWARD MESSAGE TO CHANNEL**\n\n**How to use:**\n• Send any text message → Bot will forward to channel\n• Send media (image, video, file, audio) → Bot will forward media\n• No need to select message type, bot automatically detects!\n\n**Please send message or media to forward to channel:**'
-                back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_back')
-            else:
-                title = '📢 **CHUYỂN TIẾP TIN NHẮN ĐẾN KÊNH**\n\n**Cách sử dụng:**\n• Gửi tin nhắn text bất kỳ → Bot sẽ chuyển tiếp đến kênh\n• Gửi media (ảnh, video, file, audio) → Bot sẽ chuyển tiếp media\n• Không cần chọn loại tin nhắn, bot tự động nhận diện!\n\n**Hãy gửi tin nhắn hoặc media để chuyển tiếp đến kênh:**'
-                back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_back')
+    # Đặt trạng thái để bot lắng nghe tin nhắn từ người dùng
+    context.user_data['waiting_for_message'] = True
+    context.user_data['message_type'] = 'bulk_input'
 
-            await query.edit_message_text(
-                title,
-                reply_markup=InlineKeyboardMarkup([[back_button]])
-            )
 
-            # Đặt trạng thái để bot lắng nghe tin nhắn từ người dùng
-            context.user_data['waiting_for_message'] = True
-            context.user_data['message_type'] = 'forward_to_channel'
+async def handle_bulk_forward_to_channel(query, context, language):
+    """Chuyển tiếp tin nhắn đến kênh"""
+    title = get_i18n(query.data, language)
 
-        elif query.data == 'bulk_text_only':
-            # Chỉ gửi text
-            language = context.user_data.get('bulk_language', 'vi')
+    await edit_message_text_if_changed(
+        query,
+        title,
+        reply_markup=get_back_markup(query.data, language)
+    )
 
-            if language == 'zh':
-                title = '📝 **输入文本消息**\n\n请输入您要发送给客户的消息。\n\n**注意:** 您可以使用以下占位符:\n• `{username}` - 用户名\n• `{full_name}` - 全名\n• `{action}` - 客户操作\n• `{date}` - 日期\n\n**现在请输入您的消息:**'
-                back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_input_message')
-            elif language == 'en':
-                title = '📝 **INPUT TEXT MESSAGE**\n\nPlease enter the message you want to send to customers.\n\n**Note:** You can use the following placeholders:\n• `{username}` - Username\n• `{full_name}` - Full name\n• `{action}` - Customer action\n• `{date}` - Date\n\n**Now please enter your message:**'
-                back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_input_message')
-            else:
-                title = '📝 **NHẬP TIN NHẮN TEXT**\n\nVui lòng nhập tin nhắn bạn muốn gửi đến khách hàng.\n\n**Lưu ý:** Bạn có thể sử dụng các placeholder sau:\n• `{username}` - Tên người dùng\n• `{full_name}` - Họ tên đầy đủ\n• `{action}` - Hành động của khách hàng\n• `{date}` - Ngày tháng\n\n**Bây giờ hãy nhập tin nhắn của bạn:**'
-                back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_input_message')
+    # Đặt trạng thái để bot lắng nghe tin nhắn từ người dùng
+    context.user_data['waiting_for_message'] = True
+    context.user_data['message_type'] = 'forward_to_channel'
 
-            await query.edit_message_text(
-                title,
-                reply_markup=InlineKeyboardMarkup([[back_button]])
-            )
-            context.user_data['waiting_for_message'] = True
-            context.user_data['message_type'] = 'bulk_all'
-            context.user_data['media_type'] = 'text_only'
 
-        elif query.data == 'bulk_with_photo':
-            # Gửi text + hình ảnh
-            language = context.user_data.get('bulk_language', 'vi')
+async def handle_bulk_text_only(query, context, language):
+    """Chỉ gửi text"""
+    title = get_i18n(query.data, language)
 
-            if language == 'zh':
-                title = '🖼️ **发送文本+图片**\n\n**步骤1:** 发送您要使用的图片\n**步骤2:** 然后为图片输入说明文字\n\n**注意:** 您可以使用以下占位符:\n• `{username}` - 用户名\n• `{full_name}` - 全名\n• `{action}` - 客户操作\n• `{date}` - 日期\n\n**现在发送图片:**'
-                back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_input_message')
-            elif language == 'en':
-                title = '🖼️ **SEND TEXT + PHOTO**\n\n**Step 1:** Send the photo you want to use\n**Step 2:** Then enter caption (text) for the photo\n\n**Note:** You can use the following placeholders:\n• `{username}` - Username\n• `{full_name}` - Full name\n• `{action}` - Customer action\n• `{date}` - Date\n\n**Send photo now:**'
-                back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_input_message')
-            else:
-                title = '🖼️ **GỬI TEXT + HÌNH ẢNH**\n\n**Bước 1:** Gửi hình ảnh bạn muốn sử dụng\n**Bước 2:** Sau đó nhập caption (text) cho hình ảnh\n\n**Lưu ý:** Bạn có thể sử dụng các placeholder sau:\n• `{username}` - Tên người dùng\n• `{full_name}` - Họ tên đầy đủ\n• `{action}` - Hành động của khách hàng\n• `{date}` - Ngày tháng\n\n**Gửi hình ảnh ngay bây giờ:**'
-                back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_input_message')
+    await edit_message_text_if_changed(
+        query,
+        title,
+        reply_markup=get_back_markup(query.data, language)
+    )
+    context.user_data['waiting_for_message'] = True
+    context.user_data['message_type'] = 'bulk_all'
+    context.user_data['media_type'] = 'text_only'
 
-            await query.edit_message_text(
-                title,
-                reply_markup=InlineKeyboardMarkup([[back_button]])
-            )
-            context.user_data['waiting_for_photo'] = True
-            context.user_data['message_type'] = 'bulk_all'
-            context.user_data['media_type'] = 'photo'
 
-        elif query.data == 'bulk_with_video':
-            # Gửi text + video
-            language = context.user_data.get('bulk_language', 'vi')
+async def handle_bulk_with_photo(query, context, language):
+    """Gửi text + hình ảnh"""
+    title = get_i18n(query.data, language)
 
-            if language == 'zh':
-                title = '🎥 **发送文本+视频**\n\n**步骤1:** 发送您要使用的视频\n**步骤2:** 然后为视频输入说明文字\n\n**注意:** 您可以使用以下占位符:\n• `{username}` - 用户名\n• `{full_name}` - 全名\n• `{action}` - 客户操作\n• `{date}` - 日期\n\n**现在发送视频:**'
-                back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_input_message')
-            elif language == 'en':
-                title = '🎥 **SEND TEXT + VIDEO**\n\n**Step 1:** Send the video you want to use\n**Step 2:** Then enter caption (text) for the video\n\n**Note:** You can use the following placeholders:\n• `{username}` - Username\n• `{full_name}` - Full name\n• `{action}` - Customer action\n• `{date}` - Date\n\n**Send video now:**'
-                back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_input_message')
-            else:
-                title = '🎥 **GỬI TEXT + VIDEO**\n\n**Bước 1:** Gửi video bạn muốn sử dụng\n**Bước 2:** Sau đó nhập caption (text) cho video\n\n**Lưu ý:** Bạn có thể sử dụng các placeholder sau:\n• `{username}` - Tên người dùng\n• `{full_name}` - Họ tên đầy đủ\n• `{action}` - Hành động của khách hàng\n• `{date}` - Ngày tháng\n\n**Gửi video ngay bây giờ:**'
-                back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_input_message')
+    await edit_message_text_if_changed(
+        query,
+        title,
+        reply_markup=get_back_markup(query.data, language)
+    )
+    context.user_data['waiting_for_photo'] = True
+    context.user_data['message_type'] = 'bulk_all'
+    context.user_data['media_type'] = 'photo'
 
-            await query.edit_message_text(
-                title,
-                reply_markup=InlineKeyboardMarkup([[back_button]])
-            )
-            context.user_data['waiting_for_video'] = True
-            context.user_data['message_type'] = 'bulk_all'
-            context.user_data['media_type'] = 'video'
 
-        elif query.data == 'bulk_with_document':
-            # Gửi text + file
-            language = context.user_data.get('bulk_language', 'vi')
+async def handle_bulk_with_video(query, context, language):
+    """Gửi text + video"""
+    title = get_i18n(query.data, language)
 
-            if language == 'zh':
-                title = '📄 **发送文本+文件**\n\n**步骤1:** 发送您要使用的文件\n**步骤2:** 然后为文件输入说明文字\n\n**注意:** 您可以使用以下占位符:\n• `{username}` - 用户名\n• `{full_name}` - 全名\n• `{action}` - 客户操作\n• `{date}` - 日期\n\n**现在发送文件:**'
-                back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_input_message')
-            elif language == 'en':
-                title = '📄 **SEND TEXT + FILE**\n\n**Step 1:** Send the file you want to use\n**Step 2:** Then enter caption (text) for the file\n\n**Note:** You can use the following placeholders:\n• `{username}` - Username\n• `{full_name}` - Full name\n• `{action}` - Customer action\n• `{date}` - Date\n\n**Send file now:**'
-                back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_input_message')
-            else:
-                title = '📄 **GỬI TEXT + FILE**\n\n**Bước 1:** Gửi file bạn muốn sử dụng\n**Bước 2:** Sau đó nhập caption (text) cho file\n\n**Lưu ý:** Bạn có thể sử dụng các placeholder sau:\n• `{username}` - Tên người dùng\n• `{full_name}` - Họ tên đầy đủ\n• `{action}` - Hành động của khách hàng\n• `{date}` - Ngày tháng\n\n**Gửi file ngay bây giờ:**'
-                back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_input_message')
+    await edit_message_text_if_changed(
+        query,
+        title,
+        reply_markup=get_back_markup(query.data, language)
+    )
+    context.user_data['waiting_for_video'] = True
+    context.user_data['message_type'] = 'bulk_all'
+    context.user_data['media_type'] = 'video'
 
-            await query.edit_message_text(
-                title,
-                reply_markup=InlineKeyboardMarkup([[back_button]])
-            )
-            context.user_data['waiting_for_document'] = True
-            context.user_data['message_type'] = 'bulk_all'
-            context.user_data['media_type'] = 'document'
 
-        elif query.data == 'bulk_with_audio':
-            # Gửi text + audio
-            language = context.user_data.get('bulk_language', 'vi')
+async def handle_bulk_with_document(query, context, language):
+    """Gửi text + file"""
+    title = get_i18n(query.data, language)
 
-            if language == 'zh':
-                title = '🎵 **发送文本+音频**\n\n**步骤1:** 发送您要使用的音频\n**步骤2:** 然后为音频输入说明文字\n\n**注意:** 您可以使用以下占位符:\n• `{username}` - 用户名\n• `{full_name}` - 全名\n• `{action}` - 客户操作\n• `{date}` - 日期\n\n**现在发送音频:**'
-                back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_input_message')
-            elif language == 'en':
-                title = '🎵 **SEND TEXT + AUDIO**\n\n**Step 1:** Send the audio you want to use\n**Step 2:** Then enter caption (text) for the audio\n\n**Note:** You can use the following placeholders:\n• `{username}` - Username\n• `{full_name}` - Full name\n• `{action}` - Customer action\n• `{date}` - Date\n\n**Send audio now:**'
-                back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_input_message')
-            else:
-                title = '🎵 **GỬI TEXT + AUDIO**\n\n**Bước 1:** Gửi audio bạn muốn sử dụng\n**Bước 2:** Sau đó nhập caption (text) cho audio\n\n**Lưu ý:** Bạn có thể sử dụng các placeholder sau:\n• `{username}` - Tên người dùng\n• `{full_name}` - Họ tên đầy đủ\n• `{action}` - Hành động của khách hàng\n• `{date}` - Ngày tháng\n\n**Gửi audio ngay bây giờ:**'
-                back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_input_message')
+    await edit_message_text_if_changed(
+        query,
+        title,
+        reply_markup=get_back_markup(query.data, language)
+    )
+    context.user_data['waiting_for_document'] = True
+    context.user_data['message_type'] = 'bulk_all'
+    context.user_data['media_type'] = 'document'
 
-            await query.edit_message_text(
-                title,
-                reply_markup=InlineKeyboardMarkup([[back_button]])
-            )
-            context.user_data['waiting_for_audio'] = True
-            context.user_data['message_type'] = 'bulk_all'
-            context.user_data['media_type'] = 'audio'
 
-        elif query.data == 'bulk_use_template':
-            # Sử dụng template tin nhắn
-            templates = bulk_messaging_manager.get_message_templates()
-            language = context.user_data.get('bulk_language', 'vi')
+async def handle_bulk_with_audio(query, context, language):
+    """Gửi text + audio"""
+    title = get_i18n(query.data, language)
 
-            if language == 'zh':
-                template_text = '📋 **选择消息模板**\n\n'
-                back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_all')
-            elif language == 'en':
-                template_text = '📋 **SELECT MESSAGE TEMPLATE**\n\n'
-                back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_all')
-            else:
-                template_text = '📋 **CHỌN TEMPLATE TIN NHẮN**\n\n'
-                back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_all')
-
-            keyboard = []
-            for i, template in enumerate(templates, 1):
-                template_text += f"{i}. **{template['name']}**\n"
-                template_text += f"   {template['content']}\n\n"
-                keyboard.append([InlineKeyboardButton(
-                    f"📝 Sử dụng {template['name']}",
-                    callback_data=f'bulk_template_{i - 1}'
-                )])
-
-            keyboard.append([back_button])
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    await edit_message_text_if_changed(
+        query,
+        title,
+        reply_markup=get_back_markup(query.data, language)
+    )
+    context.user_data['waiting_for_audio'] = True
+    context.user_data['message_type'] = 'bulk_all'
+    context.user_data['media_type'] = 'audio'
 
-            await query.edit_message_text(
-                template_text,
-                reply_markup=reply_markup,
-            )
 
-        elif query.data.startswith('bulk_template_'):
-            # Sử dụng template cụ thể
-            template_index = int(query.data.split('_')[2])
-            templates = bulk_messaging_manager.get_message_templates()
-            language = context.user_data.get('bulk_language', 'vi')
+async def handle_bulk_use_template(query, context, language):
+    """Sử dụng template tin nhắn"""
+    templates = _cached_templates()
 
-            if 0 <= template_index < len(templates):
-                template = templates[template_index]
-
-                if language == 'zh':
-                    title = f'📋 **已选择模板: {template["name"]}**\n\n**内容:**\n{template["content"]}\n\n您要将此消息发送给所有客户吗?'
-                    send_button = InlineKeyboardButton('✅ 立即发送', callback_data='bulk_send_template')
-                    back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_use_template')
-                elif language == 'en':
-                    title = f'📋 **TEMPLATE SELECTED: {template["name"]}**\n\n**Content:**\n{template["content"]}\n\nDo you want to send this message to all customers?'
-                    send_button = InlineKeyboardButton('✅ Send now', callback_data='bulk_send_template')
-                    back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_use_template')
-                else:
-                    title = f'📋 **TEMPLATE ĐÃ CHỌN: {template["name"]}**\n\n**Nội dung:**\n{template["content"]}\n\nBạn có muốn gửi tin nhắn này đến tất cả khách hàng?'
-                    send_button = InlineKeyboardButton('✅ Gửi ngay', callback_data='bulk_send_template')
-                    back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_use_template')
+    title = get_i18n(query.data, language)
+    back_button = _back(language, 'bulk_all')
 
-                await query.edit_message_text(
-                    title,
-                    reply_markup=InlineKeyboardMarkup([
-                        [send_button],
-                        [back_button]
-                    ])
-                )
-                context.user_data['selected_template'] = template
-            else:
-                if language == 'zh':
-                    error_message = '❌ 模板无效。'
-                    back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_use_template')
-                elif language == 'en':
-                    error_message = '❌ Invalid template.'
-                    back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_use_template')
-                else:
-                    error_message = '❌ Template không hợp lệ.'
-                    back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_use_template')
+    parts = [title]
+    keyboard = []
+    # Ghi nhớ callback_data -> chỉ số template để handler chọn template không phải parse lại
+    template_cb_index = context.bot_data.setdefault('template_cb_index', {})
+    for i, template in enumerate(templates, 1):
+        callback_data = f'bulk_template_{i - 1}'
+        template_cb_index[callback_data] = i - 1
+        parts.append(f"{i}. **{template['name']}**\n   {template['content']}\n\n")
+        keyboard.append([InlineKeyboardButton(
+            f"📝 Sử dụng {template['name']}",
+            callback_data=callback_data
+        )])
 
-                await query.edit_message_text(
-                    error_message,
-                    reply_markup=InlineKeyboardMarkup([[back_button]])
-                )
+    keyboard.append([back_button])
+    reply_markup = InlineKeyboardMarkup(keyboard)
+    template_text = ''.join(parts)
 
-        elif query.data == 'bulk_send_template':
-            # Gửi tin nhắn template
-            template = context.user_data.get('selected_template')
-            language = context.user_data.get('bulk_language', 'vi')
+    await edit_message_text_if_changed(
+        query,
+        template_text,
+        reply_markup=reply_markup,
+    )
 
-            if template:
-                try:
-                    # Gửi tin nhắn đến tất cả khách hàng
-                    result = await bulk_messaging_manager.send_bulk_message(
-                        message_content=template['content'],
-                        filter_type='all'
-                    )
 
-                    if language == 'zh':
-                        success_message = f'✅ **消息发送成功!**\n\n**模板:** {template["name"]}\n**结果:** {result["success_count"]}/{result["total_count"]} 条消息已发送\n**时间:** {result["duration"]:.2f} 秒'
-                        other_button = InlineKeyboardButton('📢 发送其他消息', callback_data='bulk_all')
-                    elif language == 'en':
-                        success_message = f'✅ **MESSAGE SENT SUCCESSFULLY!**\n\n**Template:** {template["name"]}\n**Result:** {result["success_count"]}/{result["total_count"]} messages sent\n**Time:** {result["duration"]:.2f} seconds'
-                        other_button = InlineKeyboardButton('📢 Send other message', callback_data='bulk_all')
-                    else:
-                        success_message = f'✅ **ĐÃ GỬI TIN NHẮN THÀNH CÔNG!**\n\n**Template:** {template["name"]}\n**Kết quả:** {result["success_count"]}/{result["total_count"]} tin nhắn đã gửi\n**Thời gian:** {result["duration"]:.2f} giây'
-                        other_button = InlineKeyboardButton('📢 Gửi tin nhắn khác', callback_data='bulk_all')
+async def handle_bulk_template_selected(query, context, language):
+    """Sử dụng template cụ thể"""
+    template_index = context.bot_data.get('template_cb_index', {}).get(query.data)
+    if template_index is None:
+        # Nút từ trước khi bot khởi động lại: parse chỉ số từ callback_data
+        index_str = query.data[len('bulk_template_'):]
+        template_index = int(index_str) if index_str.isdigit() else -1
+    templates = _cached_templates()
 
-                    await query.edit_message_text(
-                        success_message,
-                        reply_markup=InlineKeyboardMarkup([[other_button]])
-                    )
-                except Exception as e:
-                    if language == 'zh':
-                        error_message = f'❌ **发送消息时出错**\n\n错误: {str(e)}'
-                        back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_all')
-                    elif language == 'en':
-                        error_message = f'❌ **ERROR SENDING MESSAGE**\n\nError: {str(e)}'
-                        back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_all')
-                    else:
-                        error_message = f'❌ **LỖI KHI GỬI TIN NHẮN**\n\nLỗi: {str(e)}'
-                        back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_all')
+    if 0 <= template_index < len(templates):
+        template = templates[template_index]
 
-                    await query.edit_message_text(
-                        error_message,
-                        reply_markup=InlineKeyboardMarkup([[back_button]])
-                    )
-            else:
-                if language == 'zh':
-                    error_message = '❌ 找不到模板。'
-                    back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_all')
-                elif language == 'en':
-                    error_message = '❌ Template not found.'
-                    back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_all')
-                else:
-                    error_message = '❌ Không tìm thấy template.'
-                    back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_all')
+        if language == 'zh':
+            title = f'📋 **已选择模板: {template["name"]}**\n\n**内容:**\n{template["content"]}\n\n您要将此消息发送给所有客户吗?'
+            send_button = InlineKeyboardButton('✅ 立即发送', callback_data='bulk_send_template')
+        elif language == 'en':
+            title = f'📋 **TEMPLATE SELECTED: {template["name"]}**\n\n**Content:**\n{template["content"]}\n\nDo you want to send this message to all customers?'
+            send_button = InlineKeyboardButton('✅ Send now', callback_data='bulk_send_template')
+        else:
+            title = f'📋 **TEMPLATE ĐÃ CHỌN: {template["name"]}**\n\n**Nội dung:**\n{template["content"]}\n\nBạn có muốn gửi tin nhắn này đến tất cả khách hàng?'
+            send_button = InlineKeyboardButton('✅ Gửi ngay', callback_data='bulk_send_template')
+        back_button = _back(language, 'bulk_use_template')
 
-                await query.edit_message_text(
-                    error_message,
-                    reply_markup=InlineKeyboardMarkup([[back_button]])
-                )
+        await edit_message_text_if_changed(
+            query,
+            title,
+            reply_markup=InlineKeyboardMarkup([
+                [send_button],
+                [back_button]
+            ])
+        )
+        context.user_data['selected_template'] = template
+    else:
+        error_message = get_i18n('bulk_template_invalid', language)
 
-        elif query.data == 'bulk_filter_date':
-            # Lọc theo ngày
-            language = context.user_data.get('bulk_language', 'vi')
+        await edit_message_text_if_changed(
+            query,
+            error_message,
+            reply_markup=get_back_markup('bulk_template_invalid', language)
+        )
 
-            if language == 'zh':
-                title = '📅 **按日期筛选**\n\n请输入日期 (格式: YYYY-MM-DD)\n例如: 2025-08-24'
-                back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_filter')
-            elif language == 'en':
-                title = '📅 **FILTER BY DATE**\n\nPlease enter date (format: YYYY-MM-DD)\nExample: 2025-08-24'
-                back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_filter')
-            else:
-                title = '📅 **LỌC THEO NGÀY**\n\nVui lòng nhập ngày (định dạng: YYYY-MM-DD)\nVí dụ: 2025-08-24'
-                back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_filter')
 
-            await query.edit_message_text(
-                title,
-                reply_markup=InlineKeyboardMarkup([[back_button]])
-            )
-            context.user_data['waiting_for_filter'] = True
-            context.user_data['filter_type'] = 'date'
+async def handle_bulk_send_template(query, context, language):
+    """Gửi tin nhắn template"""
+    template = context.user_data.get('selected_template')
 
-        elif query.data == 'bulk_filter_action':
-            # Lọc theo hành động
-            language = context.user_data.get('bulk_language', 'vi')
+    if template:
+        try:
+            # Đưa tin nhắn vào hàng đợi gửi, worker sẽ gửi dần theo rate limit
+            job_id, total = await enqueue_bulk_message(template['content'])
 
-            if language == 'zh':
-                title = '🎯 **按操作筛选**\n\n请输入需要筛选的操作:\n例如: deposit, withdraw, register'
-                back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_filter')
-            elif language == 'en':
-                title = '🎯 **FILTER BY ACTION**\n\nPlease enter the action to filter:\nExample: deposit, withdraw, register'
-                back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_filter')
-            else:
-                title = '🎯 **LỌC THEO HÀNH ĐỘNG**\n\nVui lòng nhập hành động cần lọc:\nVí dụ: deposit, withdraw, register'
-                back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_filter')
+            reply_markup = SEND_OTHER_KB.get(language, SEND_OTHER_KB['vi'])
 
-            await query.edit_message_text(
-                title,
-                reply_markup=InlineKeyboardMarkup([[back_button]])
+            await edit_message_text_if_changed(
+                query,
+                _bulk_progress_text(language, template['name'], job_id, _BROADCAST_JOBS[job_id]),
+                reply_markup=reply_markup
             )
-            context.user_data['waiting_for_filter'] = True
-            context.user_data['filter_type'] = 'action'
-
-        elif query.data == 'bulk_filter_username':
-            # Lọc theo username
-            language = context.user_data.get('bulk_language', 'vi')
 
+            # Tác vụ nền cập nhật tiến độ vào chính tin nhắn này
+            if total and query.message:
+                context.application.create_task(_report_bulk_progress(
+                    job_id, query.message.chat_id, query.message.message_id,
+                    language, template['name'], reply_markup
+                ))
+        except Exception as e:
             if language == 'zh':
-                title = '👤 **按用户名筛选**\n\n请输入需要筛选的用户名:'
-                back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_filter')
+                error_message = f'❌ 发送消息时出错\n\n错误: {str(e)}'
             elif language == 'en':
-                title = '👤 **FILTER BY USERNAME**\n\nPlease enter the username to filter:'
-                back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_filter')
+                error_message = f'❌ ERROR SENDING MESSAGE\n\nError: {str(e)}'
             else:
-                title = '👤 **LỌC THEO USERNAME**\n\nVui lòng nhập username cần lọc:'
-                back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_filter')
-
-            await query.edit_message_text(
-                title,
-                reply_markup=InlineKeyboardMarkup([[back_button]])
+                error_message = f'❌ LỖI KHI GỬI TIN NHẮN\n\nLỗi: {str(e)}'
+            await edit_message_text_if_changed(
+                query,
+                error_message,
+                reply_markup=back_markup(language, 'bulk_all')
             )
-            context.user_data['waiting_for_filter'] = True
-            context.user_data['filter_type'] = 'username'
+    else:
+        error_message = get_i18n('bulk_template_missing', language)
 
-        else:
-            language = context.user_data.get('bulk_language', 'vi')
+        await edit_message_text_if_changed(
+            query,
+            error_message,
+            reply_markup=get_back_markup('bulk_template_missing', language)
+        )
 
-            if language == 'zh':
-                error_message = '❌ 选项无法识别。'
-                back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_back')
-            elif language == 'en':
-                error_message = '❌ Option not recognized.'
-                back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_back')
-            else:
-                error_message = '❌ Tùy chọn không được nhận diện.'
-                back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_back')
 
-            await query.edit_message_text(
-                error_message,
-                reply_markup=InlineKeyboardMarkup([[back_button]])
-            )
+async def handle_bulk_filter_date(query, context, language):
+    """Lọc theo ngày"""
+    title = get_i18n(query.data, language)
 
-    except Exception as e:
-        logger.error(f"Lỗi xử lý callback gửi tin nhắn hàng loạt: {e}")
-        language = context.user_data.get('bulk_language', 'vi')
+    await edit_message_text_if_changed(
+        query,
+        title,
+        reply_markup=get_back_markup(query.data, language)
+    )
+    context.user_data['waiting_for_filter'] = True
+    context.user_data['filter_type'] = 'date'
 
-        if language == 'zh':
-            error_message = '❌ 发生错误。请重试。'
-            back_button = InlineKeyboardButton('⬅️ 返回', callback_data='bulk_back')
-        elif language == 'en':
-            error_message = '❌ An error occurred. Please try again.'
-            back_button = InlineKeyboardButton('⬅️ Back', callback_data='bulk_back')
-        else:
-            error_message = '❌ Đã xảy ra lỗi. Vui lòng thử lại.'
-            back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_back')
 
-        await query.edit_message_text(
-            error_message,
-            reply_markup=InlineKeyboardMarkup([[back_button]])
-        )
+async def handle_bulk_filter_action(query, context, language):
+    """Lọc theo hành động"""
+    title = get_i18n(query.data, language)
+
+    await edit_message_text_if_changed(
+        query,
+        title,
+        reply_markup=get_back_markup(query.data, language)
+    )
+    context.user_data['waiting_for_filter'] = True
+    context.user_data['filter_type'] = 'action'
+
+
+async def handle_bulk_filter_username(query, context, language):
+    """Lọc theo username"""
+    title = get_i18n(query.data, language)
+
+    await edit_message_text_if_changed(
+        query,
+        title,
+        reply_markup=get_back_markup(query.data, language)
+    )
+    context.user_data['waiting_for_filter'] = True
+    context.user_data['filter_type'] = 'username'
+
+
+async def handle_bulk_unknown(query, context, language):
+    """Callback không được nhận diện"""
+    error_message = get_i18n('bulk_unknown', language)
+
+    await edit_message_text_if_changed(
+        query,
+        error_message,
+        reply_markup=back_markup(language, 'bulk_back')
+    )
+
+
+# Bảng điều phối callback gửi hàng loạt: callback_data -> hàm xử lý
+CALLBACK_HANDLERS = {
+    'bulk_all': handle_bulk_all,
+    'bulk_filter': handle_bulk_filter,
+    'bulk_schedule': handle_bulk_schedule,
+    'bulk_templates': handle_bulk_templates,
+    'bulk_stats': handle_bulk_stats,
+    'bulk_stop': handle_bulk_stop,
+    'bulk_input_message': handle_bulk_input_message,
+    'bulk_forward_to_channel': handle_bulk_forward_to_channel,
+    'bulk_text_only': handle_bulk_text_only,
+    'bulk_with_photo': handle_bulk_with_photo,
+    'bulk_with_video': handle_bulk_with_video,
+    'bulk_with_document': handle_bulk_with_document,
+    'bulk_with_audio': handle_bulk_with_audio,
+    'bulk_use_template': handle_bulk_use_template,
+    'bulk_send_template': handle_bulk_send_template,
+    'bulk_filter_date': handle_bulk_filter_date,
+    'bulk_filter_action': handle_bulk_filter_action,
+    'bulk_filter_username': handle_bulk_filter_username
+}
+
+
+async def handle_bulk_messaging_callbacks(query, context):
+    """Xử lý các callback cho chức năng gửi tin nhắn hàng loạt"""
+    try:
+        # Lấy ngôn ngữ hiện tại từ user_data
+        language = context.user_data.get('bulk_language', 'vi')
+
+        # callback_data từ Telegram không được intern; intern để so khớp khóa CALLBACK_HANDLERS nhanh hơn
+        data = sys.intern(query.data)
+        handler = CALLBACK_HANDLERS.get(data)
+        if handler:
+            await handler(query, context, language)
+        elif data.startswith('bulk_template_'):
+            await handle_bulk_template_selected(query, context, language)
+        else:
+            await handle_bulk_unknown(query, context, language)
+
+    except Exception as e:
+        logger.error(f"Lỗi xử lý callback gửi tin nhắn hàng loạt: {e}")
+        language = context.user_data.get('bulk_language', 'vi')
+
+        error_message = get_i18n('bulk_error', language)
+
+        await edit_message_text_if_changed(
+            query,
+            error_message,
+            reply_markup=back_markup(language, 'bulk_back')
+        )
+
+
+# Hướng dẫn nhập thời gian hẹn giờ (tiếng Việt, còn lại tiếng Bồ Đào Nha); {preamble} là phần mô tả nội dung đã lưu
+SCHEDULE_HELP = {
+    'vi': (
+        "⏰ **NHẬP THỜI GIAN HẸN GIỜ**\n\n"
+        "{preamble}"
+        "🕐 **Nhập thời gian hẹn giờ theo định dạng:**\n"
+        "• `DD/MM/YYYY HH:MM` (ví dụ: 25/12/2024 14:30)\n"
+        "• `HH:MM` (hẹn giờ hôm nay, ví dụ: 14:30)\n"
+        "• `+N phút` (sau N phút, ví dụ: +30 phút)\n"
+        "• `+N giờ` (sau N giờ, ví dụ: +2 giờ)\n\n"
+        "💡 **Lưu ý:** Thời gian theo múi giờ Việt Nam (UTC+7)"
+    ),
+    'pt': (
+        "⏰ **INSERIR HORÁRIO AGENDADO**\n\n"
+        "{preamble}"
+        "🕐 **Insira o horário agendado no formato:**\n"
+        "• `DD/MM/YYYY HH:MM` (exemplo: 25/12/2024 14:30)\n"
+        "• `HH:MM` (agendar para hoje, exemplo: 14:30)\n"
+        "• `+N minutos` (após N minutos, exemplo: +30 minutos)\n"
+        "• `+N horas` (após N horas, exemplo: +2 horas)\n\n"
+        "💡 **Nota:** Horário no fuso horário do Vietnã (UTC+7)"
+    )
+}
+SCHEDULE_SAVED_MEDIA = {
+    'vi': "📎 Media đã được lưu để hẹn giờ chuyển tiếp.\n\n",
+    'pt': "📎 Mídia salva para agendamento de encaminhamento.\n\n"
+}
+SCHEDULE_SAVED_TEXT = {
+    'vi': "📝 Tin nhắn đã được lưu:\n```\n{preview}\n```\n\n",
+    'pt': "📝 Mensagem salva:\n```\n{preview}\n```\n\n"
+}
+MARKDOWN_KW = {'parse_mode': ParseMode.MARKDOWN}
+
+
+def _schedule_help(language, preambles, **kwargs):
+    """Hướng dẫn nhập thời gian hẹn giờ với phần mô tả nội dung đã lưu"""
+    language = 'vi' if language == 'vi' else 'pt'
+    preamble = preambles[language]
+    if kwargs:
+        preamble = preamble.format(**kwargs)
+    return SCHEDULE_HELP[language].format(preamble=preamble)
 
 
 async def handle_media_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Xử lý media - forward chỉ khi admin đã bật chế độ chờ"""
     # Debug and use message_type to decide behavior
     message_type = context.user_data.get('message_type')
-    print(f"handle_media_message called - waiting_for_message={context.user_data.get('waiting_for_message')} message_type={message_type}")
+    logger.debug("handle_media_message called - waiting_for_message=%s message_type=%s", context.user_data.get('waiting_for_message'), message_type)
 
     user_id = update.effective_user.id
     # Kiểm tra quyền admin
-    if user_id not in bot_config.ADMIN_USER_IDS:
-        print(f"⚠️ User {user_id} không có quyền admin")
+    if user_id not in ADMIN_USER_IDS_SET:
+        logger.debug("⚠️ User %s không có quyền admin", user_id)
         return
 
     # Kiểm tra xem admin có đang ở trạng thái chờ tin nhắn để hẹn giờ chuyển tiếp không
     if context.user_data.get('waiting_for_schedule_message'):
         # Admin đang ở trạng thái nhập media để hẹn giờ chuyển tiếp
-        print(f"⏰ Admin {user_id} đang nhập media để hẹn giờ chuyển tiếp")
+        logger.debug("⏰ Admin %s đang nhập media để hẹn giờ chuyển tiếp", user_id)
 
         # Lưu thông tin media
-        context.user_data['schedule_message_data'] = {
+        _SCHEDULE_MESSAGES[str(user_id)] = {
             'is_forward': True,
             'chat_id': update.effective_chat.id,
             'message_id': update.message.message_id
@@ -1363,82 +2631,49 @@ async def handle_media_message(update: Update, context: ContextTypes.DEFAULT_TYP
 
         # Yêu cầu nhập thời gian hẹn giờ
         language = context.user_data.get('language', 'vi')
-        if language == 'vi':
-            message = (
-                "⏰ **NHẬP THỜI GIAN HẸN GIỜ**\n\n"
-                "📎 Media đã được lưu để hẹn giờ chuyển tiếp.\n\n"
-                "🕐 **Nhập thời gian hẹn giờ theo định dạng:**\n"
-                "• `DD/MM/YYYY HH:MM` (ví dụ: 25/12/2024 14:30)\n"
-                "• `HH:MM` (hẹn giờ hôm nay, ví dụ: 14:30)\n"
-                "• `+N phút` (sau N phút, ví dụ: +30 phút)\n"
-                "• `+N giờ` (sau N giờ, ví dụ: +2 giờ)\n\n"
-                "💡 **Lưu ý:** Thời gian theo múi giờ Việt Nam (UTC+7)"
-            )
-        else:
-            message = (
-                "⏰ **INSERIR HORÁRIO AGENDADO**\n\n"
-                "📎 Mídia salva para agendamento de encaminhamento.\n\n"
-                "🕐 **Insira o horário agendado no formato:**\n"
-                "• `DD/MM/YYYY HH:MM` (exemplo: 25/12/2024 14:30)\n"
-                "• `HH:MM` (agendar para hoje, exemplo: 14:30)\n"
-                "• `+N minutos` (após N minutos, exemplo: +30 minutos)\n"
-                "• `+N horas` (após N horas, exemplo: +2 horas)\n\n"
-                "💡 **Nota:** Horário no fuso horário do Vietnã (UTC+7)"
-            )
+        message = _schedule_help(language, SCHEDULE_SAVED_MEDIA)
 
         # Đặt trạng thái chờ thời gian
         context.user_data['waiting_for_schedule_time'] = True
 
-        await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
+        await update.message.reply_text(message, **MARKDOWN_KW)
         return
 
     if not message_type:
         # No action requested
-        print("⚠️ No message_type set, ignoring media")
+        logger.debug("⚠️ No message_type set, ignoring media")
         return
 
     try:
         if message_type == 'bulk_input':
             # Admin đang ở trạng thái nhập tin nhắn - forward ngay lập tức đến khách hàng
-            print(f"📝 Admin {user_id} đang nhập media - forward đến khách hàng")
+            logger.debug("📝 Admin %s đang nhập media - forward đến khách hàng", user_id)
 
             # Forward media đến tất cả khách hàng
             await _forward_media_to_customers(update, context, user_id)
 
         elif message_type == 'forward_to_channel':
             # Admin đang ở trạng thái chuyển tiếp đến kênh
-            print(f"📢 Admin {user_id} đang chuyển tiếp media đến kênh")
+            logger.debug("📢 Admin %s đang chuyển tiếp media đến kênh", user_id)
 
             # Thông báo xác nhận trước khi chuyển tiếp (hiển thị danh sách kênh và 2 nút XÁC NHẬN / HỦY)
-            forward_channels = getattr(bot_config, 'FORWARD_CHANNELS', [])
-            if not forward_channels:
+            if not _FORWARD_CHANNELS:
                 await update.message.reply_text('❌ LỖI: CHƯA CẤU HÌNH KÊNH. Vui lòng cấu hình FORWARD_CHANNELS trong bot_config.py để sử dụng tính năng này.')
                 return
 
-            channel_count = len(forward_channels)
-            # Tạo keyboard xác nhận
-            confirm_btn = InlineKeyboardButton('✅ XÁC NHẬN', callback_data='confirm_forward')
-            cancel_btn = InlineKeyboardButton('❌ HỦY', callback_data='cancel_forward')
-            # Hiển thị tên/ID các kênh (dạng text an toàn)
-            channels_text = '\n'.join([f'- {c}' for c in forward_channels])
+            # Hiển thị tên/ID các kênh (dạng text an toàn, dựng sẵn khi nạp cấu hình)
             msg_text = (
-                f"Bạn sắp chuyển tiếp media này đến {channel_count} kênh:\n{channels_text}\n\n"
+                f"Bạn sắp chuyển tiếp media này đến {_FORWARD_CHANNELS_COUNT} kênh:\n{_FORWARD_CHANNELS_TEXT}\n\n"
                 "Nhấn 'XÁC NHẬN' để chuyển tiếp hoặc 'HỦY' để hủy bỏ."
             )
-            await update.message.reply_text(msg_text, reply_markup=InlineKeyboardMarkup([[confirm_btn, cancel_btn]]))
+            await update.message.reply_text(msg_text, reply_markup=CONFIRM_CANCEL_KB)
 
             # Only accept if message contains text, media, caption, or is a forward from a chat
-            has_content = bool(any([
-                (getattr(update.message, 'text', None) and str(update.message.text).strip()),
-                getattr(update.message, 'caption', None),
-                update.message.photo,
-                update.message.video,
-                update.message.document,
-                update.message.sticker,
-                update.message.audio,
-                update.message.animation,
-            ]))
-            is_forward = bool(getattr(update.message, 'forward_from_chat', None) and getattr(update.message, 'forward_from_message_id', None))
+            m = update.message
+            has_text = bool(m.text and m.text.strip())
+            has_media = bool(m.photo or m.video or m.document or m.sticker or m.audio or m.animation)
+            has_content = has_text or bool(m.caption) or has_media
+            is_forward = bool(m.forward_from_chat and m.forward_from_message_id)
             if not (has_content or is_forward):
                 await update.message.reply_text('⚠️ Vui lòng gửi/forward một bài đăng, text hoặc media để chuyển tiếp.')
                 return
@@ -1449,22 +2684,22 @@ async def handle_media_message(update: Update, context: ContextTypes.DEFAULT_TYP
             if is_forward:
                 orig_chat = update.message.forward_from_chat
                 orig_msg_id = update.message.forward_from_message_id
-                context.user_data['pending_forward'] = {
+                _PENDING_FORWARDS[str(user_id)] = {
                     'original_chat_id': int(orig_chat.id),
                     'original_message_id': int(orig_msg_id)
                 }
             else:
-                context.user_data['pending_forward'] = {
+                _PENDING_FORWARDS[str(user_id)] = {
                     'chat_id': int(update.effective_chat.id),
                     'message_id': int(update.message.message_id)
                 }
 
         elif message_type == 'forward_to_selected_channels':
             # Admin đang ở trạng thái chuyển tiếp đến các kênh đã chọn
-            print(f"🎯 Admin {user_id} đang chuyển tiếp media đến các kênh đã chọn")
+            logger.debug("🎯 Admin %s đang chuyển tiếp media đến các kênh đã chọn", user_id)
 
             # Lấy danh sách kênh đã chọn
-            selected_channels = context.user_data.get('selected_channels', [])
+            selected_channels = _unique_channels(context.user_data.get('selected_channels', ()))
             if not selected_channels:
                 await update.message.reply_text(
                     '❌ **LỖI: KHÔNG CÓ KÊNH NÀO ĐƯỢC CHỌN**\n\n'
@@ -1472,46 +2707,25 @@ async def handle_media_message(update: Update, context: ContextTypes.DEFAULT_TYP
                 )
                 return
 
-            # Chuyển tiếp media đến các kênh đã chọn
+            # Gửi media đến các kênh đã chọn bằng copy_message (không cần header "Forwarded from")
             try:
-                success_count = 0
-                failed_count = 0
-                failed_channels = []
-
-                for channel_id in selected_channels:
-                    try:
-                        await context.bot.forward_message(
-                            chat_id=channel_id,
-                            from_chat_id=update.effective_chat.id,
-                            message_id=update.message.message_id
-                        )
-                        success_count += 1
-                        logger.info(f"✅ Đã forward media đến kênh {channel_id} (giữ emoji động)")
-
-                    except Exception as e:
-                        failed_count += 1
-                        failed_channels.append(f"{channel_id} ({str(e)})")
-                        logger.error(f"❌ Lỗi gửi media đến kênh {channel_id}: {e}")
+                success_count, failed_channels = await _forward_to_channels(
+                    context.bot, selected_channels, update.effective_chat.id, update.message.message_id, copy=True
+                )
 
                 # Thông báo kết quả
-                result_message = f'✅ **ĐÃ GỬI MEDIA ĐẾN {len(selected_channels)} KÊNH ĐÃ CHỌN!**\n\n'
-                result_message += '**Kết quả:**\n'
-                result_message += f'✅ **Thành công:** {success_count} kênh\n'
-
-                if failed_count > 0:
-                    result_message += f'❌ **Thất bại:** {failed_count} kênh\n'
-                    result_message += '**Kênh lỗi:**\n'
-                    for failed in failed_channels[:5]:  # Chỉ hiển thị 5 kênh lỗi đầu tiên
-                        result_message += f'• {failed}\n'
-                    if len(failed_channels) > 5:
-                        result_message += f'• ... và {len(failed_channels) - 5} kênh khác\n'
-
-                result_message += '\n**Lưu ý:** Media đã được gửi với định dạng gốc, giữ nguyên emoji động.'
+                result_message = _channel_result_message(
+                    f'✅ **ĐÃ GỬI MEDIA ĐẾN {len(selected_channels)} KÊNH ĐÃ CHỌN!**\n\n',
+                    success_count,
+                    failed_channels,
+                    'Media đã được gửi với định dạng gốc, giữ nguyên emoji động.'
+                )
 
                 await update.message.reply_text(result_message)
 
                 # Ghi log
-                sheets_manager.add_message_log(
+                await _sheets(
+                    sheets_manager.add_message_log,
                     str(user_id),
                     f"Forwarded media to {success_count}/{len(selected_channels)} selected channels",
                     'forward_media_to_selected_channels',
@@ -1522,9 +2736,9 @@ async def handle_media_message(update: Update, context: ContextTypes.DEFAULT_TYP
                 context.user_data.pop('selected_channels', None)
 
             except Exception as e:
-                logger.error(f"Lỗi chuyển tiếp media đến các kênh đã chọn: {e}")
+                logger.error("Lỗi chuyển tiếp media đến các kênh đã chọn: %s", e)
                 await update.message.reply_text(
-                    f'❌ **LỖI KHI CHUYỂN TIẾP MEDIA ĐẾN CÁC KÊNH ĐÃ CHỌN**\n\n'
+                    f'❌ LỖI KHI CHUYỂN TIẾP MEDIA ĐẾN CÁC KÊNH ĐÃ CHỌN\n\n'
                     f'Lỗi: {str(e)}\n\n'
                     'Vui lòng kiểm tra:\n'
                     '• Các kênh có tồn tại không\n'
@@ -1533,12 +2747,11 @@ async def handle_media_message(update: Update, context: ContextTypes.DEFAULT_TYP
 
         else:
             # Không rõ loại hành động - từ chối xử lý
-            print(f"⚠️ message_type không hợp lệ: {message_type} - bỏ qua")
+            logger.debug("⚠️ message_type không hợp lệ: %s - bỏ qua", message_type)
             await update.message.reply_text('⚠️ Không có hành động nào được thiết lập. Vui lòng chọn chức năng trước khi gửi media.')
 
     except Exception as e:
-        print(f"❌ Lỗi xử lý media: {e}")
-        logger.error(f"Lỗi xử lý media: {e}")
+        logger.error("Lỗi xử lý media: %s", e)
         if update.message:
             await update.message.reply_text('❌ Lỗi khi xử lý media. Vui lòng thử lại.')
     finally:
@@ -1548,150 +2761,149 @@ async def handle_media_message(update: Update, context: ContextTypes.DEFAULT_TYP
             context.user_data['message_type'] = None
 
 
+# Thông báo lỗi khi nhập thời gian hẹn giờ, theo mã lỗi của parse_schedule_time và ngôn ngữ (vi, còn lại pt)
+_SCHEDULE_INVALID_TEXT = {
+    'vi': (
+        "❌ THỜI GIAN KHÔNG HỢP LỆ!\n\n"
+        "🕐 Định dạng hợp lệ:\n\n"
+        "📅 Ngày tháng năm:\n"
+        "• DD/MM/YYYY HH:MM (ví dụ: 25/12/2024 14:30)\n"
+        "• DD-MM-YYYY HH:MM (ví dụ: 25-12-2024 14:30)\n"
+        "• YYYY-MM-DD HH:MM (ví dụ: 2024-12-25 14:30)\n\n"
+        "🔢 Định dạng số liên tục:\n"
+        "• DDMMYYYYHHMMSS (ví dụ: 25092024143000)\n"
+        "• YYYYMMDDHHMMSS (ví dụ: 20240925143000)\n"
+        "• DDMMYYYYHHMM (ví dụ: 250920241430)\n"
+        "• YYYYMMDDHHMM (ví dụ: 202409251430)\n\n"
+        "⏰ Thời gian đơn giản:\n"
+        "• HH:MM (hôm nay, ví dụ: 14:30)\n"
+        "• hôm nay 14:30\n"
+        "• ngày mai 20:00\n"
+        "• mai 20:00\n\n"
+        "⏱️ Thời gian tương đối:\n"
+        "• +30 phút hoặc 30 phút nữa\n"
+        "• +2 giờ hoặc 2 giờ sau\n"
+        "• +1 ngày hoặc 1 ngày nữa\n\n"
+        "🌅 Thời gian trong ngày:\n"
+        "• sáng 8:00\n"
+        "• chiều 14:30\n"
+        "• tối 20:00\n\n"
+        "⚡ Ngay lập tức:\n"
+        "• bây giờ hoặc ngay bây giờ\n\n"
+        "💡 Vui lòng nhập lại thời gian:"
+    ),
+    'pt': (
+        "❌ HORÁRIO INVÁLIDO!\n\n"
+        "🕐 Formatos válidos:\n\n"
+        "📅 Data e hora:\n"
+        "• DD/MM/YYYY HH:MM (exemplo: 25/12/2024 14:30)\n"
+        "• DD-MM-YYYY HH:MM (exemplo: 25-12-2024 14:30)\n"
+        "• YYYY-MM-DD HH:MM (exemplo: 2024-12-25 14:30)\n\n"
+        "⏰ Hora simples:\n"
+        "• HH:MM (hoje, exemplo: 14:30)\n"
+        "• hoje 14:30\n"
+        "• amanhã 20:00\n\n"
+        "⏱️ Tempo relativo:\n"
+        "• +30 minutos ou 30 minutos depois\n"
+        "• +2 horas ou 2 horas depois\n"
+        "• +1 dia ou 1 dia depois\n\n"
+        "🌅 Período do dia:\n"
+        "• manhã 8:00\n"
+        "• tarde 14:30\n"
+        "• noite 20:00\n\n"
+        "⚡ Imediato:\n"
+        "• agora ou immediately\n\n"
+        "💡 Por favor, insira o horário novamente:"
+    )
+}
+# Lỗi nội bộ khi xử lý thời gian (không phải do định dạng nhập): không hiện lại hướng dẫn định dạng
+_SCHEDULE_PARSE_FAILED_TEXT = {
+    'vi': "❌ Không thể xử lý thời gian hẹn giờ do lỗi hệ thống.\n\n💡 Vui lòng thử lại sau giây lát.",
+    'pt': "❌ Não foi possível processar o horário por um erro interno.\n\n💡 Por favor, tente novamente em instantes."
+}
+SCHEDULE_TIME_ERRORS = {
+    'invalid': _SCHEDULE_INVALID_TEXT,
+    'error': _SCHEDULE_PARSE_FAILED_TEXT
+}
+
+
 async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE):
     """Xử lý tin nhắn văn bản - chỉ forward"""
     try:
         user_id = update.effective_user.id
 
         # Debug logging để kiểm tra
-        print(f"📝 handle_text_message được gọi bởi user {user_id}, text: '{update.message.text}'")
-        logger.info(f"handle_text_message được gọi bởi user {user_id}, text: '{update.message.text}'")
+        logger.debug("📝 handle_text_message được gọi bởi user %s, text: '%s'", user_id, update.message.text)
 
         # Kiểm tra quyền admin
-        if user_id not in bot_config.ADMIN_USER_IDS:
+        if user_id not in ADMIN_USER_IDS_SET:
             return
 
         # Kiểm tra xem admin có đang ở trạng thái chờ thời gian hẹn giờ không
         if context.user_data.get('waiting_for_schedule_time'):
             # Admin đang nhập thời gian hẹn giờ
-            print(f"⏰ Admin {user_id} đang nhập thời gian hẹn giờ: {update.message.text}")
+            logger.debug("⏰ Admin %s đang nhập thời gian hẹn giờ: %s", user_id, update.message.text)
 
-            try:
-                # Parse thời gian hẹn giờ
-                schedule_time = parse_schedule_time(update.message.text)
-
-                if not schedule_time:
-                    # Thời gian không hợp lệ
-                    language = context.user_data.get('language', 'vi')
-                    if language == 'vi':
-                        error_message = (
-                            "❌ THỜI GIAN KHÔNG HỢP LỆ!\n\n"
-                            "🕐 Định dạng hợp lệ:\n\n"
-                            "📅 Ngày tháng năm:\n"
-                            "• DD/MM/YYYY HH:MM (ví dụ: 25/12/2024 14:30)\n"
-                            "• DD-MM-YYYY HH:MM (ví dụ: 25-12-2024 14:30)\n"
-                            "• YYYY-MM-DD HH:MM (ví dụ: 2024-12-25 14:30)\n\n"
-                            "🔢 Định dạng số liên tục:\n"
-                            "• DDMMYYYYHHMMSS (ví dụ: 25092024143000)\n"
-                            "• YYYYMMDDHHMMSS (ví dụ: 20240925143000)\n"
-                            "• DDMMYYYYHHMM (ví dụ: 250920241430)\n"
-                            "• YYYYMMDDHHMM (ví dụ: 202409251430)\n\n"
-                            "⏰ Thời gian đơn giản:\n"
-                            "• HH:MM (hôm nay, ví dụ: 14:30)\n"
-                            "• hôm nay 14:30\n"
-                            "• ngày mai 20:00\n"
-                            "• mai 20:00\n\n"
-                            "⏱️ Thời gian tương đối:\n"
-                            "• +30 phút hoặc 30 phút nữa\n"
-                            "• +2 giờ hoặc 2 giờ sau\n"
-                            "• +1 ngày hoặc 1 ngày nữa\n\n"
-                            "🌅 Thời gian trong ngày:\n"
-                            "• sáng 8:00\n"
-                            "• chiều 14:30\n"
-                            "• tối 20:00\n\n"
-                            "⚡ Ngay lập tức:\n"
-                            "• bây giờ hoặc ngay bây giờ\n\n"
-                            "💡 Vui lòng nhập lại thời gian:"
-                        )
-                    else:
-                        error_message = (
-                            "❌ HORÁRIO INVÁLIDO!\n\n"
-                            "🕐 Formatos válidos:\n\n"
-                            "📅 Data e hora:\n"
-                            "• DD/MM/YYYY HH:MM (exemplo: 25/12/2024 14:30)\n"
-                            "• DD-MM-YYYY HH:MM (exemplo: 25-12-2024 14:30)\n"
-                            "• YYYY-MM-DD HH:MM (exemplo: 2024-12-25 14:30)\n\n"
-                            "⏰ Hora simples:\n"
-                            "• HH:MM (hoje, exemplo: 14:30)\n"
-                            "• hoje 14:30\n"
-                            "• amanhã 20:00\n\n"
-                            "⏱️ Tempo relativo:\n"
-                            "• +30 minutos ou 30 minutos depois\n"
-                            "• +2 horas ou 2 horas depois\n"
-                            "• +1 dia ou 1 dia depois\n\n"
-                            "🌅 Período do dia:\n"
-                            "• manhã 8:00\n"
-                            "• tarde 14:30\n"
-                            "• noite 20:00\n\n"
-                            "⚡ Imediato:\n"
-                            "• agora ou immediately\n\n"
-                            "💡 Por favor, insira o horário novamente:"
-                        )
-
-                    await update.message.reply_text(error_message)
-                    return
+            # Parse thời gian hẹn giờ; lỗi nhập liệu trả về mã lỗi thay vì exception
+            schedule_time, error_code = parse_schedule_time(update.message.text)
+            if error_code:
+                language = 'vi' if context.user_data.get('language', 'vi') == 'vi' else 'pt'
+                await update.message.reply_text(SCHEDULE_TIME_ERRORS[error_code][language])
+                return
 
-                # Lấy dữ liệu tin nhắn đã lưu
-                message_data = context.user_data.get('schedule_message_data', {})
-                forward_type = context.user_data.get('schedule_forward_type', 'all_customers')
+            # Lấy dữ liệu tin nhắn đã lưu
+            message_data = _SCHEDULE_MESSAGES.get(str(user_id), {})
+            forward_type = context.user_data.get('schedule_forward_type', 'all_customers')
 
-                # Lên lịch chuyển tiếp
-                result = await scheduled_forward_manager.schedule_forward_message(
-                    schedule_time=schedule_time,
-                    message_data=message_data,
-                    forward_type=forward_type,
-                    admin_id=user_id
-                )
+            # Lên lịch chuyển tiếp
+            result = await scheduled_forward_manager.schedule_forward_message(
+                schedule_time=schedule_time,
+                message_data=message_data,
+                forward_type=forward_type,
+                admin_id=user_id
+            )
+            invalidate_schedule_cache()
 
-                # Reset trạng thái
-                context.user_data['waiting_for_schedule_time'] = False
-                context.user_data.pop('schedule_message_data', None)
-                context.user_data.pop('schedule_forward_type', None)
+            # Reset trạng thái
+            context.user_data['waiting_for_schedule_time'] = False
+            _SCHEDULE_MESSAGES.pop(str(user_id), None)
+            context.user_data.pop('schedule_forward_type', None)
 
-                # Thông báo kết quả
-                language = context.user_data.get('language', 'vi')
-                if result['success']:
-                    if language == 'vi':
-                        success_message = (
-                            f"✅ ĐÃ LÊN LỊCH CHUYỂN TIẾP THÀNH CÔNG!\n\n"
-                            f"🕐 Thời gian hẹn giờ: {result['schedule_time']}\n"
-                            f"📝 Loại chuyển tiếp: {forward_type}\n"
-                            f"🆔 ID lịch hẹn: {result['schedule_id']}\n\n"
-                            f"💡 Lưu ý: Tin nhắn sẽ được chuyển tiếp tự động vào thời gian đã hẹn."
-                        )
-                    else:
-                        success_message = (
-                            f"✅ ENCAMINHAMENTO AGENDADO COM SUCESSO!\n\n"
-                            f"🕐 Horário agendado: {result['schedule_time']}\n"
-                            f"📝 Tipo de encaminhamento: {forward_type}\n"
-                            f"🆔 ID do agendamento: {result['schedule_id']}\n\n"
-                            f"💡 Nota: A mensagem será encaminhada automaticamente no horário agendado."
-                        )
+            # Thông báo kết quả
+            language = context.user_data.get('language', 'vi')
+            if result['success']:
+                if language == 'vi':
+                    success_message = (
+                        f"✅ ĐÃ LÊN LỊCH CHUYỂN TIẾP THÀNH CÔNG!\n\n"
+                        f"🕐 Thời gian hẹn giờ: {result['schedule_time']}\n"
+                        f"📝 Loại chuyển tiếp: {forward_type}\n"
+                        f"🆔 ID lịch hẹn: {result['schedule_id']}\n\n"
+                        f"💡 Lưu ý: Tin nhắn sẽ được chuyển tiếp tự động vào thời gian đã hẹn."
+                    )
                 else:
-                    if language == 'vi':
-                        success_message = f"❌ LỖI LÊN LỊCH CHUYỂN TIẾP\n\n{result['message']}"
-                    else:
-                        success_message = f"❌ ERRO AO AGENDAR ENCAMINHAMENTO\n\n{result['message']}"
-
-                await update.message.reply_text(success_message)
-                return
+                    success_message = (
+                        f"✅ ENCAMINHAMENTO AGENDADO COM SUCESSO!\n\n"
+                        f"🕐 Horário agendado: {result['schedule_time']}\n"
+                        f"📝 Tipo de encaminhamento: {forward_type}\n"
+                        f"🆔 ID do agendamento: {result['schedule_id']}\n\n"
+                        f"💡 Nota: A mensagem será encaminhada automaticamente no horário agendado."
+                    )
+            else:
+                if language == 'vi':
+                    success_message = f"❌ LỖI LÊN LỊCH CHUYỂN TIẾP\n\n{result['message']}"
+                else:
+                    success_message = f"❌ ERRO AO AGENDAR ENCAMINHAMENTO\n\n{result['message']}"
 
-            except Exception as e:
-                logger.error(f"Lỗi xử lý thời gian hẹn giờ: {e}")
-                await update.message.reply_text(
-                    f"❌ LỖI XỬ LÝ THỜI GIAN HẸN GIỜ\n\n"
-                    f"Lỗi: {str(e)}\n\n"
-                    f"Vui lòng thử lại."
-                )
-                return
+            await update.message.reply_text(success_message)
+            return
 
         # Kiểm tra xem admin có đang ở trạng thái chờ tin nhắn để hẹn giờ chuyển tiếp không
         if context.user_data.get('waiting_for_schedule_message'):
             # Admin đang ở trạng thái nhập tin nhắn để hẹn giờ chuyển tiếp
-            print(f"⏰ Admin {user_id} đang nhập tin nhắn để hẹn giờ chuyển tiếp")
+            logger.debug("⏰ Admin %s đang nhập tin nhắn để hẹn giờ chuyển tiếp", user_id)
 
             # Lưu thông tin tin nhắn
-            context.user_data['schedule_message_data'] = {
+            _SCHEDULE_MESSAGES[str(user_id)] = {
                 'text': update.message.text,
                 'is_forward': False,
                 'chat_id': update.effective_chat.id,
@@ -1703,96 +2915,46 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
 
             # Yêu cầu nhập thời gian hẹn giờ
             language = context.user_data.get('language', 'vi')
-            if language == 'vi':
-                message = (
-                    "⏰ **NHẬP THỜI GIAN HẸN GIỜ**\n\n"
-                    "📝 Tin nhắn đã được lưu:\n"
-                    f"```\n{update.message.text[:100]}{'...' if len(update.message.text) > 100 else ''}\n```\n\n"
-                    "🕐 **Nhập thời gian hẹn giờ theo định dạng:**\n"
-                    "• `DD/MM/YYYY HH:MM` (ví dụ: 25/12/2024 14:30)\n"
-                    "• `HH:MM` (hẹn giờ hôm nay, ví dụ: 14:30)\n"
-                    "• `+N phút` (sau N phút, ví dụ: +30 phút)\n"
-                    "• `+N giờ` (sau N giờ, ví dụ: +2 giờ)\n\n"
-                    "💡 **Lưu ý:** Thời gian theo múi giờ Việt Nam (UTC+7)"
-                )
-            else:
-                message = (
-                    "⏰ **INSERIR HORÁRIO AGENDADO**\n\n"
-                    "📝 Mensagem salva:\n"
-                    f"```\n{update.message.text[:100]}{'...' if len(update.message.text) > 100 else ''}\n```\n\n"
-                    "🕐 **Insira o horário agendado no formato:**\n"
-                    "• `DD/MM/YYYY HH:MM` (exemplo: 25/12/2024 14:30)\n"
-                    "• `HH:MM` (agendar para hoje, exemplo: 14:30)\n"
-                    "• `+N minutos` (após N minutos, exemplo: +30 minutos)\n"
-                    "• `+N horas` (após N horas, exemplo: +2 horas)\n\n"
-                    "💡 **Nota:** Horário no fuso horário do Vietnã (UTC+7)"
-                )
+            text = update.message.text
+            preview = text[:100] + ('...' if len(text) > 100 else '')
+            message = _schedule_help(language, SCHEDULE_SAVED_TEXT, preview=preview)
 
             # Đặt trạng thái chờ thời gian
             context.user_data['waiting_for_schedule_time'] = True
 
-            await update.message.reply_text(message, parse_mode=ParseMode.MARKDOWN)
+            await update.message.reply_text(message, **MARKDOWN_KW)
             return
 
         # Kiểm tra xem admin có đang ở trạng thái chờ tin nhắn không
         if context.user_data.get('waiting_for_message') and context.user_data.get('message_type') == 'bulk_input':
             # Admin đang ở trạng thái nhập tin nhắn - forward ngay lập tức
-            print(f"📝 Admin {user_id} đang nhập tin nhắn - forward ngay lập tức")
+            logger.debug("📝 Admin %s đang nhập tin nhắn - forward ngay lập tức", user_id)
 
             # Reset trạng thái
             context.user_data['waiting_for_message'] = False
             context.user_data['message_type'] = None
 
-            # Forward tin nhắn đến tất cả khách hàng
+            # Xếp hàng forward đến tất cả khách hàng; worker gửi theo rate limit (toàn bot và 1 tin/giây mỗi chat)
             try:
-                customers = sheets_manager.get_all_customers()
+                customers = await get_customers_cached()
 
                 if customers:
-                    forwarded_count = 0
-                    failed_count = 0
-
-                    for customer in customers:
-                        try:
-                            customer_user_id = customer.get('user_id')
-                            if customer_user_id:
-                                # Không gửi lại cho admin đang thao tác
-                                if str(customer_user_id) == str(user_id):
-                                    print(f"⏭️ Bỏ qua admin {customer_user_id} (không gửi lại cho chính mình)")
-                                    continue
-
-                                # Forward tin nhắn (giữ nguyên định dạng gốc, emoji động)
-                                await context.bot.forward_message(
-                                    chat_id=int(customer_user_id),
-                                    from_chat_id=update.effective_chat.id,
-                                    message_id=update.message.message_id
-                                )
-                                forwarded_count += 1
-
-                                # Cập nhật trạng thái trong Google Sheets
-                                sheets_manager.update_customer_message_status(customer_user_id, True)
-
-                                # Ghi log
-                                sheets_manager.add_message_log(
-                                    customer_user_id,
-                                    f"Forwarded message from admin {user_id}",
-                                    'forward_message',
-                                    'sent'
-                                )
-
-                            else:
-                                failed_count += 1
-
-                        except Exception as e:
-                            failed_count += 1
-                            logger.error(f"Lỗi forward tin nhắn đến user {customer.get('user_id')}: {e}")
+                    job_id, total = enqueue_forward_broadcast(
+                        customers, update.effective_chat.id, update.message.message_id, user_id
+                    )
 
-                    # Thông báo kết quả
-                    await update.message.reply_text(
-                        f'✅ **ĐÃ FORWARD TIN NHẮN THÀNH CÔNG!**\n\n'
-                        f'**Tin nhắn đã được chuyển tiếp đến:**\n'
-                        f'✅ **Thành công:** {forwarded_count} khách hàng\n'
-                        f'**Lưu ý:** Tin nhắn đã được forward với định dạng gốc, giữ nguyên emoji động.'
+                    # Thông báo đã xếp hàng, tiến độ được cập nhật vào chính tin nhắn này
+                    status_message = await update.message.reply_text(
+                        f'⏳ **ĐÃ XẾP HÀNG FORWARD TIN NHẮN!**\n\n'
+                        f'**Đợt gửi:** #{job_id}\n'
+                        f'**Số khách hàng:** {total}\n'
+                        f'**Lưu ý:** Tin nhắn được forward với định dạng gốc, giữ nguyên emoji động.'
                     )
+                    if total:
+                        context.application.create_task(_report_bulk_progress(
+                            job_id, status_message.chat_id, status_message.message_id,
+                            'vi', 'Forward tin nhắn', None
+                        ))
 
                 else:
                     await update.message.reply_text(
@@ -1801,16 +2963,16 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                     )
 
             except Exception as e:
-                logger.error(f"Lỗi forward tin nhắn: {e}")
+                logger.error("Lỗi forward tin nhắn: %s", e)
                 await update.message.reply_text(
-                    f'❌ **LỖI KHI FORWARD TIN NHẮN**\n\n'
+                    f'❌ LỖI KHI FORWARD TIN NHẮN\n\n'
                     f'Lỗi: {str(e)}\n\n'
                     'Vui lòng thử lại.',
                 )
 
         elif context.user_data.get('waiting_for_message') and context.user_data.get('message_type') == 'forward_to_channel':
             # Admin đang ở trạng thái chuyển tiếp đến kênh
-            print(f"📢 Admin {user_id} đang chuyển tiếp tin nhắn đến kênh")
+            logger.debug("📢 Admin %s đang chuyển tiếp tin nhắn đến kênh", user_id)
 
             # Reset trạng thái
             context.user_data['waiting_for_message'] = False
@@ -1819,7 +2981,7 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
             # Chuyển tiếp tin nhắn đến tất cả các kênh
             try:
                 # Lấy danh sách kênh từ bot_config
-                forward_channels = getattr(bot_config, 'FORWARD_CHANNELS', [])
+                forward_channels = _FORWARD_CHANNELS
                 if not forward_channels:
                     await update.message.reply_text(
                         '❌ **LỖI: CHƯA CẤU HÌNH KÊNH**\n\n'
@@ -1828,44 +2990,23 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                     return
 
                 # Chuyển tiếp tin nhắn đến tất cả các kênh
-                success_count = 0
-                failed_count = 0
-                failed_channels = []
-
-                for channel_id in forward_channels:
-                    try:
-                        await context.bot.forward_message(
-                            chat_id=channel_id,
-                            from_chat_id=update.effective_chat.id,
-                            message_id=update.message.message_id
-                        )
-                        success_count += 1
-                        logger.info(f"✅ Đã forward tin nhắn đến kênh {channel_id} (giữ emoji động)")
-
-                    except Exception as e:
-                        failed_count += 1
-                        failed_channels.append(f"{channel_id} ({str(e)})")
-                        logger.error(f"❌ Lỗi gửi tin nhắn đến kênh {channel_id}: {e}")
+                success_count, failed_channels = await _forward_to_channels(
+                    context.bot, forward_channels, update.effective_chat.id, update.message.message_id
+                )
 
                 # Thông báo kết quả
-                result_message = '✅ **ĐÃ GỬI TIN NHẮN ĐẾN {} KÊNH!**\n\n'.format(len(forward_channels))
-                result_message += '**Kết quả:**\n'
-                result_message += '✅ **Thành công:** {} kênh\n'.format(success_count)
-
-                if failed_count > 0:
-                    result_message += '❌ **Thất bại:** {} kênh\n'.format(failed_count)
-                    result_message += '**Kênh lỗi:**\n'
-                    for failed in failed_channels[:5]:  # Chỉ hiển thị 5 kênh lỗi đầu tiên
-                        result_message += '• {}\n'.format(failed)
-                    if len(failed_channels) > 5:
-                        result_message += '• ... và {} kênh khác\n'.format(len(failed_channels) - 5)
-
-                result_message += '\n**Lưu ý:** Tin nhắn đã được forward với định dạng gốc, giữ nguyên emoji động.'
+                result_message = _channel_result_message(
+                    f'✅ **ĐÃ GỬI TIN NHẮN ĐẾN {len(forward_channels)} KÊNH!**\n\n',
+                    success_count,
+                    failed_channels,
+                    'Tin nhắn đã được forward với định dạng gốc, giữ nguyên emoji động.'
+                )
 
                 await update.message.reply_text(result_message)
 
                 # Ghi log
-                sheets_manager.add_message_log(
+                await _sheets(
+                    sheets_manager.add_message_log,
                     str(user_id),
                     f"Forwarded message to {success_count}/{len(forward_channels)} channels",
                     'forward_to_channels',
@@ -1873,9 +3014,9 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                 )
 
             except Exception as e:
-                logger.error(f"Lỗi chuyển tiếp tin nhắn đến kênh: {e}")
+                logger.error("Lỗi chuyển tiếp tin nhắn đến kênh: %s", e)
                 await update.message.reply_text(
-                    f'❌ **LỖI KHI CHUYỂN TIẾP ĐẾN KÊNH**\n\n'
+                    f'❌ LỖI KHI CHUYỂN TIẾP ĐẾN KÊNH\n\n'
                     f'Lỗi: {str(e)}\n\n'
                     'Vui lòng kiểm tra:\n'
                     '• FORWARD_CHANNELS có được cấu hình đúng không\n'
@@ -1885,14 +3026,14 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
 
         elif context.user_data.get('waiting_for_message') and context.user_data.get('message_type') == 'forward_to_selected_channels':
             # Admin đang ở trạng thái chuyển tiếp đến các kênh đã chọn
-            print(f"🎯 Admin {user_id} đang chuyển tiếp tin nhắn đến các kênh đã chọn")
+            logger.debug("🎯 Admin %s đang chuyển tiếp tin nhắn đến các kênh đã chọn", user_id)
 
             # Reset trạng thái
             context.user_data['waiting_for_message'] = False
             context.user_data['message_type'] = None
 
             # Lấy danh sách kênh đã chọn
-            selected_channels = context.user_data.get('selected_channels', [])
+            selected_channels = _unique_channels(context.user_data.get('selected_channels', ()))
             if not selected_channels:
                 await update.message.reply_text(
                     '❌ **LỖI: KHÔNG CÓ KÊNH NÀO ĐƯỢC CHỌN**\n\n'
@@ -1900,46 +3041,25 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                 )
                 return
 
-            # Chuyển tiếp tin nhắn đến các kênh đã chọn
+            # Gửi tin nhắn đến các kênh đã chọn bằng copy_message (không cần header "Forwarded from")
             try:
-                success_count = 0
-                failed_count = 0
-                failed_channels = []
-
-                for channel_id in selected_channels:
-                    try:
-                        await context.bot.forward_message(
-                            chat_id=channel_id,
-                            from_chat_id=update.effective_chat.id,
-                            message_id=update.message.message_id
-                        )
-                        success_count += 1
-                        logger.info(f"✅ Đã forward tin nhắn đến kênh {channel_id} (giữ emoji động)")
-
-                    except Exception as e:
-                        failed_count += 1
-                        failed_channels.append(f"{channel_id} ({str(e)})")
-                        logger.error(f"❌ Lỗi gửi tin nhắn đến kênh {channel_id}: {e}")
+                success_count, failed_channels = await _forward_to_channels(
+                    context.bot, selected_channels, update.effective_chat.id, update.message.message_id, copy=True
+                )
 
                 # Thông báo kết quả
-                result_message = f'✅ **ĐÃ GỬI TIN NHẮN ĐẾN {len(selected_channels)} KÊNH ĐÃ CHỌN!**\n\n'
-                result_message += '**Kết quả:**\n'
-                result_message += f'✅ **Thành công:** {success_count} kênh\n'
-
-                if failed_count > 0:
-                    result_message += f'❌ **Thất bại:** {failed_count} kênh\n'
-                    result_message += '**Kênh lỗi:**\n'
-                    for failed in failed_channels[:5]:  # Chỉ hiển thị 5 kênh lỗi đầu tiên
-                        result_message += f'• {failed}\n'
-                    if len(failed_channels) > 5:
-                        result_message += f'• ... và {len(failed_channels) - 5} kênh khác\n'
-
-                result_message += '\n**Lưu ý:** Tin nhắn đã được forward với định dạng gốc, giữ nguyên emoji động.'
+                result_message = _channel_result_message(
+                    f'✅ **ĐÃ GỬI TIN NHẮN ĐẾN {len(selected_channels)} KÊNH ĐÃ CHỌN!**\n\n',
+                    success_count,
+                    failed_channels,
+                    'Tin nhắn đã được gửi với định dạng gốc, giữ nguyên emoji động.'
+                )
 
                 await update.message.reply_text(result_message)
 
                 # Ghi log
-                sheets_manager.add_message_log(
+                await _sheets(
+                    sheets_manager.add_message_log,
                     str(user_id),
                     f"Forwarded message to {success_count}/{len(selected_channels)} selected channels",
                     'forward_to_selected_channels',
@@ -1950,9 +3070,9 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                 context.user_data.pop('selected_channels', None)
 
             except Exception as e:
-                logger.error(f"Lỗi chuyển tiếp tin nhắn đến các kênh đã chọn: {e}")
+                logger.error("Lỗi chuyển tiếp tin nhắn đến các kênh đã chọn: %s", e)
                 await update.message.reply_text(
-                    f'❌ **LỖI KHI CHUYỂN TIẾP ĐẾN CÁC KÊNH ĐÃ CHỌN**\n\n'
+                    f'❌ LỖI KHI CHUYỂN TIẾP ĐẾN CÁC KÊNH ĐÃ CHỌN\n\n'
                     f'Lỗi: {str(e)}\n\n'
                     'Vui lòng kiểm tra:\n'
                     '• Các kênh có tồn tại không\n'
@@ -1961,7 +3081,7 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
 
         elif context.user_data.get('waiting_for_channel') and context.user_data.get('action_type') == 'add_channel':
             # Admin đang thêm kênh mới
-            print(f"➕ Admin {user_id} đang thêm kênh mới: {update.message.text}")
+            logger.debug("➕ Admin %s đang thêm kênh mới: %s", user_id, update.message.text)
 
             # Reset trạng thái
             context.user_data['waiting_for_channel'] = False
@@ -1982,21 +3102,18 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                     )
                     return
 
-                # Lấy danh sách kênh hiện tại
-                current_channels = getattr(bot_config, 'FORWARD_CHANNELS', [])
-
-                # Kiểm tra kênh đã tồn tại chưa
-                if new_channel in current_channels:
+                # Kiểm tra kênh đã tồn tại chưa (tra set, O(1))
+                if new_channel in _FORWARD_CHANNELS_SET:
                     await update.message.reply_text(
                         f'⚠️ **KÊNH ĐÃ TỒN TẠI!**\n\n'
                         f'Kênh `{new_channel}` đã có trong danh sách.\n'
-                        f'**Số kênh hiện tại:** {len(current_channels)}',
+                        f'**Số kênh hiện tại:** {_FORWARD_CHANNELS_COUNT}',
                     )
                     return
 
-                # Thêm kênh mới
-                current_channels.append(new_channel)
-                setattr(bot_config, 'FORWARD_CHANNELS', current_channels)
+                # Thêm kênh mới (chỉ sao chép danh sách khi thực sự thay đổi)
+                current_channels = [*_FORWARD_CHANNELS, new_channel]
+                set_forward_channels(current_channels)
 
                 # Thông báo thành công
                 await update.message.reply_text(
@@ -2004,11 +3121,12 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                     f'**Kênh mới:** `{new_channel}`\n'
                     f'**Tổng số kênh:** {len(current_channels)}\n\n'
                     f'**Danh sách kênh hiện tại:**\n'
-                    f'{chr(10).join([f"• {ch}" for ch in current_channels])}'
+                    f'{_channel_bullets(current_channels)}'
                 )
 
                 # Ghi log
-                sheets_manager.add_message_log(
+                await _sheets(
+                    sheets_manager.add_message_log,
                     str(user_id),
                     f"Added new channel: {new_channel}",
                     'manage_channels',
@@ -2016,59 +3134,67 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                 )
 
             except Exception as e:
-                logger.error(f"Lỗi khi thêm kênh: {e}")
+                logger.error("Lỗi khi thêm kênh: %s", e)
                 await update.message.reply_text(
-                    f'❌ **LỖI KHI THÊM KÊNH**\n\n'
+                    f'❌ LỖI KHI THÊM KÊNH\n\n'
                     f'Lỗi: {str(e)}\n\n'
                     'Vui lòng thử lại hoặc liên hệ admin.',
                 )
 
         else:
             # Admin gửi tin nhắn bình thường - forward ngay lập tức
-            print(f"📝 Admin {user_id} gửi tin nhắn bình thường - forward ngay lập tức")
+            logger.debug("📝 Admin %s gửi tin nhắn bình thường - forward ngay lập tức", user_id)
 
             # Forward tin nhắn đến tất cả khách hàng
             try:
-                customers = sheets_manager.get_all_customers()
+                customers = await get_customers_cached()
 
                 if customers:
                     forwarded_count = 0
                     failed_count = 0
-
+                    # Gom trạng thái/log để ghi Google Sheets một lần sau khi gửi xong
+                    status_buffer = []
+                    log_buffer = []
+                    semaphore = asyncio.Semaphore(CUSTOMER_FORWARD_CONCURRENCY)
+                    from_chat_id = update.effective_chat.id
+                    message_id = update.message.message_id
+
+                    async def _forward_one(customer_user_id):
+                        # Forward tin nhắn (giữ nguyên định dạng gốc, emoji động) qua rate limiter toàn bot và theo chat
+                        async with semaphore:
+                            await _rate_limited_forward(context.bot, int(customer_user_id), from_chat_id, message_id)
+
+                    targets = []
+                    admin_uid = str(user_id)
                     for customer in customers:
-                        try:
-                            customer_user_id = customer.get('user_id')
-                            if customer_user_id:
-                                # Không gửi lại cho admin đang thao tác
-                                if str(customer_user_id) == str(user_id):
-                                    print(f"⏭️ Bỏ qua admin {customer_user_id} (không gửi lại cho chính mình)")
-                                    continue
-
-                                # Forward tin nhắn (giữ nguyên định dạng gốc, emoji động)
-                                await context.bot.forward_message(
-                                    chat_id=int(customer_user_id),
-                                    from_chat_id=update.effective_chat.id,
-                                    message_id=update.message.message_id
-                                )
-                                forwarded_count += 1
-
-                                # Cập nhật trạng thái trong Google Sheets
-                                sheets_manager.update_customer_message_status(customer_user_id, True)
-
-                                # Ghi log
-                                sheets_manager.add_message_log(
-                                    customer_user_id,
-                                    f"Forwarded message from admin {user_id}",
-                                    'forward_message',
-                                    'sent'
-                                )
-
-                            else:
-                                failed_count += 1
-
-                        except Exception as e:
+                        customer_user_id = customer.get('user_id')
+                        if not customer_user_id:
+                            failed_count += 1
+                            continue
+                        # Không gửi lại cho admin đang thao tác
+                        if str(customer_user_id) == admin_uid:
+                            logger.debug("⏭️ Bỏ qua admin %s (không gửi lại cho chính mình)", customer_user_id)
+                            continue
+                        targets.append(customer_user_id)
+
+                    results = await asyncio.gather(*[_forward_one(cid) for cid in targets], return_exceptions=True)
+                    log_content = f"Forwarded message from admin {user_id}"
+                    for customer_user_id, result in zip(targets, results):
+                        if isinstance(result, Exception):
                             failed_count += 1
-                            logger.error(f"Lỗi forward tin nhắn đến user {customer.get('user_id')}: {e}")
+                            logger.error("Lỗi forward tin nhắn đến user %s: %s", customer_user_id, result)
+                            continue
+                        forwarded_count += 1
+                        status_buffer.append(customer_user_id)
+                        log_buffer.append({
+                            'user_id': customer_user_id,
+                            'message_content': log_content,
+                            'message_type': 'forward_message',
+                            'status': 'sent',
+                        })
+
+                    # Ghi trạng thái và log vào Google Sheets: 2 request thay vì 2N
+                    await _flush_forward_sheets(status_buffer, log_buffer)
 
                     # Thông báo kết quả
                     await update.message.reply_text(
@@ -2086,23 +3212,99 @@ async def handle_text_message(update: Update, context: ContextTypes.DEFAULT_TYPE
                     )
 
             except Exception as e:
-                logger.error(f"Lỗi forward tin nhắn: {e}")
+                logger.error("Lỗi forward tin nhắn: %s", e)
                 await update.message.reply_text(
-                    f'❌ **LỖI KHI FORWARD TIN NHẮN**\n\n'
+                    f'❌ LỖI KHI FORWARD TIN NHẮN\n\n'
                     f'Lỗi: {str(e)}\n\n'
                     'Vui lòng thử lại.',
                 )
 
     except Exception as e:
-        logger.error(f"Lỗi xử lý tin nhắn text: {e}")
+        logger.error("Lỗi xử lý tin nhắn text: %s", e)
         await update.message.reply_text(
-            '❌ **LỖI XỬ LÝ TIN NHẮN**\n\n'
+            '❌ LỖI XỬ LÝ TIN NHẮN\n\n'
             f'Lỗi: {str(e)}\n\n'
             'Vui lòng thử lại hoặc liên hệ admin.',
         )
 
 
-def parse_schedule_time(time_input: str) -> Optional[datetime]:
+# Các dạng thời gian hẹn giờ phổ biến, khớp một lần bằng regex gộp; m.lastgroup cho biết dạng nào
+_SCHEDULE_RE = re.compile(
+    r'(?P<dmyhm>(?P<dmy_d>\d{1,2})(?P<dmy_sep>[/-])(?P<dmy_mo>\d{1,2})(?P=dmy_sep)(?P<dmy_y>\d{4})'
+    r' (?P<dmy_h>\d{1,2}):(?P<dmy_mi>\d{2})(?::(?P<dmy_s>\d{2}))?)'
+    r'|(?P<ymdhm>(?P<ymd_y>\d{4})-(?P<ymd_mo>\d{1,2})-(?P<ymd_d>\d{1,2}) (?P<ymd_h>\d{1,2}):(?P<ymd_mi>\d{2}))'
+    r'|(?P<hm>(?P<hm_h>\d{1,2}):(?P<hm_mi>\d{2}))'
+    r'|(?P<plusmin>(?:\+\s*(?P<plusmin_n>\d+)|(?P<latermin_n>\d+))\s*(?:phút|phut|minute|minutes|min|mins?)'
+    r'(?(latermin_n)\s*(?:nữa|sau|later)))'
+    r'|(?P<plushr>(?:\+\s*(?P<plushr_n>\d+)|(?P<laterhr_n>\d+))\s*(?:giờ|gio|hour|hours|hr|hrs?)'
+    r'(?(laterhr_n)\s*(?:nữa|sau|later)))'
+    r'|(?P<plusday>(?:\+\s*(?P<plusday_n>\d+)|(?P<laterday_n>\d+))\s*(?:ngày|ngay|day|days)'
+    r'(?(laterday_n)\s*(?:nữa|sau|later)))'
+)
+
+
+def _schedule_today_at(hour, minute, now):
+    """HH:MM hôm nay; nếu đã qua thì chuyển sang ngày mai"""
+    schedule_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if schedule_time <= now:
+        schedule_time += timedelta(days=1)
+    return schedule_time
+
+
+def _schedule_from_digits(digits):
+    """YYYYMMDDHHMM[SS] (ưu tiên nếu bắt đầu bằng 2) hoặc DDMMYYYYHHMM[SS]"""
+    second = int(digits[12:14]) if len(digits) == 14 else 0
+    hour, minute = int(digits[8:10]), int(digits[10:12])
+    if digits[0] == '2':
+        try:
+            return datetime(int(digits[0:4]), int(digits[4:6]), int(digits[6:8]), hour, minute, second)
+        except ValueError:
+            pass
+    return datetime(int(digits[4:8]), int(digits[2:4]), int(digits[0:2]), hour, minute, second)
+
+
+def _schedule_relative(m, kind, now, unit):
+    """+N đơn vị hoặc N đơn vị nữa/sau/later"""
+    amount = int(m.group(f'plus{kind}_n') or m.group(f'later{kind}_n'))
+    return now + timedelta(**{unit: amount})
+
+
+# Hàm dựng datetime cho từng dạng của _SCHEDULE_RE (có thể raise ValueError nếu ngày/giờ không tồn tại)
+_SCHEDULE_PARSERS = {
+    'dmyhm': lambda m, now: datetime(
+        int(m.group('dmy_y')), int(m.group('dmy_mo')), int(m.group('dmy_d')),
+        int(m.group('dmy_h')), int(m.group('dmy_mi')), int(m.group('dmy_s') or 0)
+    ),
+    'ymdhm': lambda m, now: datetime(
+        int(m.group('ymd_y')), int(m.group('ymd_mo')), int(m.group('ymd_d')),
+        int(m.group('ymd_h')), int(m.group('ymd_mi'))
+    ),
+    'hm': lambda m, now: _schedule_today_at(int(m.group('hm_h')), int(m.group('hm_mi')), now),
+    'plusmin': lambda m, now: _schedule_relative(m, 'min', now, 'minutes'),
+    'plushr': lambda m, now: _schedule_relative(m, 'hr', now, 'hours'),
+    'plusday': lambda m, now: _schedule_relative(m, 'day', now, 'days'),
+}
+
+
+# Regex ngôn ngữ tự nhiên cho đường dự phòng của parse_schedule_time, biên dịch sẵn một lần khi load module
+_TODAY_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'^hôm\s+nay\s+(\d{1,2}):(\d{2})$',
+    r'^today\s+(\d{1,2}):(\d{2})$',
+    r'^hoje\s+(\d{1,2}):(\d{2})$'
+)]
+_TOMORROW_PATTERNS = [re.compile(p, re.IGNORECASE) for p in (
+    r'^ngày\s+mai\s+(\d{1,2}):(\d{2})$',
+    r'^mai\s+(\d{1,2}):(\d{2})$',
+    r'^tomorrow\s+(\d{1,2}):(\d{2})$',
+    r'^amanhã\s+(\d{1,2}):(\d{2})$'
+)]
+# Buổi trong ngày: buổi sáng chỉ nhận giờ < 12, chiều/tối cộng 12 nếu giờ < 12
+_PERIOD_RE = re.compile(r'^(?P<p>sáng|chiều|tối|morning|afternoon|evening)\s+(\d{1,2}):(\d{2})$', re.IGNORECASE)
+_PM_PERIODS = frozenset({'chiều', 'tối', 'afternoon', 'evening'})
+_TIENG_RE = re.compile(r'^(\d+)\s*(tiếng|tieng|hour|hours)\s*(nữa|sau|later)$', re.IGNORECASE)
+
+
+def parse_schedule_time(time_input: str) -> Tuple[Optional[datetime], Optional[str]]:
     """
     Parse thời gian hẹn giờ từ input của user với nhiều định dạng khác nhau
 
@@ -2110,1565 +3312,985 @@ def parse_schedule_time(time_input: str) -> Optional[datetime]:
         time_input: Chuỗi thời gian từ user
 
     Returns:
-        datetime object hoặc None nếu không hợp lệ
+        (datetime, None) nếu hợp lệ, ngược lại (None, mã lỗi): 'invalid' hoặc 'error'
     """
     try:
-        import re
-        from datetime import datetime, timedelta
-        import threading
+        time_input = time_input.strip().lower()
 
-        # Timeout protection for Windows
-        def timeout_handler():
-            raise TimeoutError("Parse timeout")
+        # Số liên tục YYYYMMDDHHMM[SS] / DDMMYYYYHHMM[SS]: kiểm tra độ dài + isdigit(), không cần regex
+        if len(time_input) in (12, 14) and time_input.isdigit():
+            try:
+                return _schedule_from_digits(time_input), None
+            except ValueError:
+                return None, 'invalid'
 
-        # Set timeout 5 seconds using threading
-        timeout_occurred = threading.Event()
-        timeout_thread = threading.Timer(5.0, timeout_occurred.set)
-        timeout_thread.start()
+        # Đường nhanh: một lần fullmatch cho các dạng phổ biến, không phải thử strptime rồi bắt ValueError
+        m = _SCHEDULE_RE.fullmatch(time_input)
+        if m:
+            try:
+                return _SCHEDULE_PARSERS[m.lastgroup](m, datetime.now()), None
+            except ValueError:
+                pass
 
-        try:
-            time_input = time_input.strip().lower()
-            now = datetime.now()
+        now = datetime.now()
 
-            # === ĐỊNH DẠNG NGÀY THÁNG NĂM ===
+        # Các dạng số (ngày giờ, HH:MM, số liên tục, +N phút/giờ/ngày) đều đã thử bằng _SCHEDULE_RE ở trên;
+        # chọn nhánh theo ký tự đầu: bắt đầu bằng số/dấu + thì chỉ còn dạng "N tiếng nữa"
+        if not time_input:
+            return None, 'invalid'
+        if time_input[0].isdigit() or time_input[0] == '+':
+            # "1 tiếng nữa", "2 giờ sau"
+            match = _TIENG_RE.match(time_input)
+            if match:
+                return now + timedelta(hours=int(match.group(1))), None
 
-            # DD/MM/YYYY HH:MM hoặc DD-MM-YYYY HH:MM
-            date_time_patterns = [
-                r'^\d{1,2}[/-]\d{1,2}[/-]\d{4} \d{1,2}:\d{2}$',
-                r'^\d{1,2}[/-]\d{1,2}[/-]\d{4} \d{1,2}:\d{2}:\d{2}$'
-            ]
+            return None, 'invalid'
 
-            for pattern in date_time_patterns:
-                if re.match(pattern, time_input):
-                    try:
-                        # Thử các format khác nhau
-                        formats = ['%d/%m/%Y %H:%M', '%d-%m-%Y %H:%M',
-                                   '%d/%m/%Y %H:%M:%S', '%d-%m-%Y %H:%M:%S']
-                        for fmt in formats:
-                            try:
-                                if timeout_occurred.is_set():
-                                    raise TimeoutError("Parse timeout")
-                                result = datetime.strptime(time_input, fmt)
-                                timeout_thread.cancel()  # Cancel timeout
-                                return result
-                            except ValueError:
-                                continue
-                    except ValueError:
-                        continue
-
-            # === ĐỊNH DẠNG SỐ LIÊN TỤC (COMPACT FORMAT) ===
-
-            # YYYYMMDDHHMMSS (20250906200000) - ưu tiên format này trước
-            if re.match(r'^\d{14}$', time_input) and time_input[0:4] >= '2000':
-                try:
-                    if timeout_occurred.is_set():
-                        raise TimeoutError("Parse timeout")
-                    # Parse: YYYYMMDDHHMMSS
-                    year = int(time_input[0:4])
-                    month = int(time_input[4:6])
-                    day = int(time_input[6:8])
-                    hour = int(time_input[8:10])
-                    minute = int(time_input[10:12])
-                    second = int(time_input[12:14])
-
-                    result = datetime(year, month, day, hour, minute, second)
-                    timeout_thread.cancel()  # Cancel timeout
-                    return result
-                except (ValueError, IndexError):
-                    pass
+        # === NGÔN NGỮ TỰ NHIÊN (NATURAL LANGUAGE) ===
 
-            # DDMMYYYYHHMMSS (06092025200000)
-            if re.match(r'^\d{14}$', time_input):
+        # Hôm nay + thời gian
+        for pattern in _TODAY_PATTERNS:
+            match = pattern.match(time_input)
+            if match:
                 try:
-                    if timeout_occurred.is_set():
-                        raise TimeoutError("Parse timeout")
-                    # Parse: DDMMYYYYHHMMSS
-                    day = int(time_input[0:2])
-                    month = int(time_input[2:4])
-                    year = int(time_input[4:8])
-                    hour = int(time_input[8:10])
-                    minute = int(time_input[10:12])
-                    second = int(time_input[12:14])
-
-                    result = datetime(year, month, day, hour, minute, second)
-                    timeout_thread.cancel()  # Cancel timeout
-                    return result
+                    hour, minute = int(match.group(1)), int(match.group(2))
+                    schedule_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+                    if schedule_time <= now:
+                        schedule_time += timedelta(days=1)
+                    return schedule_time, None
                 except (ValueError, IndexError):
                     pass
 
-            # YYYYMMDDHHMM (202509062000) - ưu tiên format này trước
-            if re.match(r'^\d{12}$', time_input) and time_input[0:4] >= '2000':
+        # Ngày mai + thời gian
+        for pattern in _TOMORROW_PATTERNS:
+            match = pattern.match(time_input)
+            if match:
                 try:
-                    if timeout_occurred.is_set():
-                        raise TimeoutError("Parse timeout")
-                    # Parse: YYYYMMDDHHMM
-                    year = int(time_input[0:4])
-                    month = int(time_input[4:6])
-                    day = int(time_input[6:8])
-                    hour = int(time_input[8:10])
-                    minute = int(time_input[10:12])
-
-                    result = datetime(year, month, day, hour, minute, 0)
-                    timeout_thread.cancel()  # Cancel timeout
-                    return result
+                    hour, minute = int(match.group(1)), int(match.group(2))
+                    tomorrow = now + timedelta(days=1)
+                    result = tomorrow.replace(hour=hour, minute=minute, second=0, microsecond=0)
+                    return result, None
                 except (ValueError, IndexError):
                     pass
 
-            # DDMMYYYYHHMM (060920252000)
-            if re.match(r'^\d{12}$', time_input):
-                try:
-                    if timeout_occurred.is_set():
-                        raise TimeoutError("Parse timeout")
-                    # Parse: DDMMYYYYHHMM
-                    day = int(time_input[0:2])
-                    month = int(time_input[2:4])
-                    year = int(time_input[4:8])
-                    hour = int(time_input[8:10])
-                    minute = int(time_input[10:12])
-
-                    result = datetime(year, month, day, hour, minute, 0)
-                    timeout_thread.cancel()  # Cancel timeout
-                    return result
-                except (ValueError, IndexError):
-                    pass
+        # Thời gian trong ngày (sáng, chiều, tối)
+        match = _PERIOD_RE.match(time_input)
+        if match:
+            try:
+                hour, minute = int(match.group(2)), int(match.group(3))
+                if match.group('p') in _PM_PERIODS:
+                    schedule_time = now.replace(hour=hour + 12 if hour < 12 else hour, minute=minute, second=0, microsecond=0)
+                else:
+                    schedule_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0) if hour < 12 else None
+                if schedule_time and schedule_time <= now:
+                    schedule_time += timedelta(days=1)
+                return (schedule_time, None) if schedule_time else (None, 'invalid')
+            except ValueError:
+                pass
 
-            # YYYY-MM-DD HH:MM (ISO format)
-            if re.match(r'^\d{4}-\d{1,2}-\d{1,2} \d{1,2}:\d{2}$', time_input):
-                try:
-                    if timeout_occurred.is_set():
-                        raise TimeoutError("Parse timeout")
-                    result = datetime.strptime(time_input, '%Y-%m-%d %H:%M')
-                    timeout_thread.cancel()  # Cancel timeout
-                    return result
-                except ValueError:
-                    pass
+        # === CÁC TRƯỜNG HỢP ĐẶC BIỆT ===
 
-            # === ĐỊNH DẠNG THỜI GIAN ĐƠN GIẢN ===
+        # "ngay bây giờ", "now", "agora"
+        if time_input in ['ngay bây giờ', 'bây giờ', 'now', 'agora', 'immediately']:
+            result = now + timedelta(seconds=10)  # 10 giây sau để tránh conflict
+            return result, None
 
-            # HH:MM (hôm nay)
-            if re.match(r'^\d{1,2}:\d{2}$', time_input):
-                try:
-                    hour, minute = map(int, time_input.split(':'))
-                    schedule_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        return None, 'invalid'
 
-                    # Nếu thời gian đã qua trong ngày hôm nay, chuyển sang ngày mai
-                    if schedule_time <= now:
-                        schedule_time += timedelta(days=1)
+    except Exception as e:
+        logger.error("Lỗi parse thời gian hẹn giờ: %s", e)
+        return None, 'error'
 
-                    if timeout_occurred.is_set():
-                        raise TimeoutError("Parse timeout")
-                    timeout_thread.cancel()  # Cancel timeout
-                    return schedule_time
-                except ValueError:
-                    pass
 
-            # === THỜI GIAN TƯƠNG ĐỐI (RELATIVE TIME) ===
+async def _cb_scheduled_forward(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Hiển thị menu hẹn giờ chuyển tiếp"""
+    query = update.callback_query
+    language = context.user_data.get('language', 'vi')
+    keyboard = get_scheduled_forward_menu_keyboard(language)
+    reply_markup = InlineKeyboardMarkup(keyboard)
 
-            # +N phút/minutes/min
-            minute_patterns = [
-                r'^\+\s*(\d+)\s*(phút|phut|minute|minutes|min|mins?)$',
-                r'^(\d+)\s*(phút|phut|minute|minutes|min|mins?)\s*(nữa|sau|later)$'
-            ]
+    await enqueue_edit(
+        query,
+        get_scheduled_forward_title(language),
+        reply_markup=reply_markup,
+        parse_mode=ParseMode.MARKDOWN
+    )
 
-            for pattern in minute_patterns:
-                match = re.match(pattern, time_input, re.IGNORECASE)
-                if match:
-                    try:
-                        if timeout_occurred.is_set():
-                            raise TimeoutError("Parse timeout")
-                        minutes = int(match.group(1))
-                        result = now + timedelta(minutes=minutes)
-                        timeout_thread.cancel()  # Cancel timeout
-                        return result
-                    except (ValueError, IndexError):
-                        pass
-
-            # +N giờ/hours/hour
-            hour_patterns = [
-                r'^\+\s*(\d+)\s*(giờ|gio|hour|hours|hr|hrs?)$',
-                r'^(\d+)\s*(giờ|gio|hour|hours|hr|hrs?)\s*(nữa|sau|later)$'
-            ]
 
-            for pattern in hour_patterns:
-                match = re.match(pattern, time_input, re.IGNORECASE)
-                if match:
-                    try:
-                        if timeout_occurred.is_set():
-                            raise TimeoutError("Parse timeout")
-                        hours = int(match.group(1))
-                        result = now + timedelta(hours=hours)
-                        timeout_thread.cancel()  # Cancel timeout
-                        return result
-                    except (ValueError, IndexError):
-                        pass
-
-            # +N ngày/days/day
-            day_patterns = [
-                r'^\+\s*(\d+)\s*(ngày|ngay|day|days)$',
-                r'^(\d+)\s*(ngày|ngay|day|days)\s*(nữa|sau|later)$'
-            ]
+async def _cb_schedule_forward_set(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Thiết lập hẹn giờ chuyển tiếp"""
+    query = update.callback_query
+    language = context.user_data.get('language', 'vi')
+
+    # Đặt trạng thái chờ tin nhắn để hẹn giờ
+    context.user_data['waiting_for_schedule_message'] = True
+    context.user_data['schedule_forward_type'] = 'all_customers'
+
+    if language == 'vi':
+        message = (
+            "⏰ **THIẾT LẬP HẸN GIỜ CHUYỂN TIẾP**\n\n"
+            "📝 Gửi tin nhắn hoặc media mà bạn muốn hẹn giờ chuyển tiếp.\n\n"
+            "💡 **Hướng dẫn:**\n"
+            "• Gửi tin nhắn text để hẹn giờ chuyển tiếp\n"
+            "• Gửi hình ảnh, video, file kèm caption\n"
+            "• Forward tin nhắn từ kênh khác\n\n"
+            "⏰ Sau khi gửi tin nhắn, bạn sẽ được yêu cầu nhập thời gian hẹn giờ."
+        )
+    else:
+        message = (
+            "⏰ **CONFIGURAR ENCAMINHAMENTO AGENDADO**\n\n"
+            "📝 Envie a mensagem ou mídia que deseja agendar para encaminhamento.\n\n"
+            "💡 **Instruções:**\n"
+            "• Envie mensagem de texto para agendar encaminhamento\n"
+            "• Envie imagem, vídeo, arquivo com legenda\n"
+            "• Encaminhe mensagem de outro canal\n\n"
+            "⏰ Após enviar a mensagem, você será solicitado a inserir o horário agendado."
+        )
 
-            for pattern in day_patterns:
-                match = re.match(pattern, time_input, re.IGNORECASE)
-                if match:
-                    try:
-                        if timeout_occurred.is_set():
-                            raise TimeoutError("Parse timeout")
-                        days = int(match.group(1))
-                        result = now + timedelta(days=days)
-                        timeout_thread.cancel()  # Cancel timeout
-                        return result
-                    except (ValueError, IndexError):
-                        pass
-
-            # === NGÔN NGỮ TỰ NHIÊN (NATURAL LANGUAGE) ===
-
-            # Hôm nay + thời gian
-            today_patterns = [
-                r'^hôm\s+nay\s+(\d{1,2}):(\d{2})$',
-                r'^today\s+(\d{1,2}):(\d{2})$',
-                r'^hoje\s+(\d{1,2}):(\d{2})$'
-            ]
+    await query.edit_message_text(message, parse_mode=ParseMode.MARKDOWN)
+
+
+# Emoji theo trạng thái lịch hẹn giờ; lịch đã chạy xong bị xóa khỏi file nên chỉ còn
+# lịch đang chờ hoặc đã quá giờ mà chưa chạy
+SCHEDULE_STATUS_EMOJI = {
+    'pending': '⏰',
+    'overdue': '❌'
+}
+
+# Một dòng trong danh sách lịch hẹn giờ, theo ngôn ngữ (vi / pt)
+SCHEDULE_ROW_TEMPLATES = {
+    'vi': "{i}. {emoji} **{time}**\n   📝 Loại: {target_type} ({targets} đích)\n   📊 Trạng thái: {status}\n\n",
+    'pt': "{i}. {emoji} **{time}**\n   📝 Tipo: {target_type} ({targets} destinos)\n   📊 Status: {status}\n\n"
+}
+
+# Lỗi chung cho màn hình lịch hẹn giờ; chi tiết exception chỉ ghi vào log
+SCHEDULE_ERROR_TEXTS = {
+    'vi': "❌ LỖI\n\nĐã xảy ra lỗi nội bộ, vui lòng thử lại sau.",
+    'pt': "❌ ERRO\n\nOcorreu um erro interno, tente novamente mais tarde."
+}
+
+# Thống kê lịch hẹn giờ theo ngôn ngữ; điền bằng format_map(get_schedule_stats())
+SCHEDULE_STATS_TEMPLATES = {
+    'vi': (
+        "📊 **THỐNG KÊ LỊCH HẸN GIỜ**\n\n"
+        "📈 **Tổng quan:**\n"
+        "• 📋 Tổng cộng: {total}\n"
+        "• ⏰ Đang chờ: {pending}\n"
+        "• 📅 Hôm nay: {today}\n"
+        "• 🗓️ Ngày mai: {tomorrow}"
+    ),
+    'pt': (
+        "📊 **ESTATÍSTICAS DE TAREFAS AGENDADAS**\n\n"
+        "📈 **Visão geral:**\n"
+        "• 📋 Total: {total}\n"
+        "• ⏰ Pendentes: {pending}\n"
+        "• 📅 Hoje: {today}\n"
+        "• 🗓️ Amanhã: {tomorrow}"
+    )
+}
 
-            for pattern in today_patterns:
-                match = re.match(pattern, time_input, re.IGNORECASE)
-                if match:
-                    try:
-                        if timeout_occurred.is_set():
-                            raise TimeoutError("Parse timeout")
-                        hour, minute = int(match.group(1)), int(match.group(2))
-                        schedule_time = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                        if schedule_time <= now:
-                            schedule_time += timedelta(days=1)
-                        timeout_thread.cancel()  # Cancel timeout
-                        return schedule_time
-                    except (ValueError, IndexError):
-                        pass
-
-            # Ngày mai + thời gian
-            tomorrow_patterns = [
-                r'^ngày\s+mai\s+(\d{1,2}):(\d{2})$',
-                r'^mai\s+(\d{1,2}):(\d{2})$',
-                r'^tomorrow\s+(\d{1,2}):(\d{2})$',
-                r'^amanhã\s+(\d{1,2}):(\d{2})$'
-            ]
 
-            for pattern in tomorrow_patterns:
-                match = re.match(pattern, time_input, re.IGNORECASE)
-                if match:
-                    try:
-                        if timeout_occurred.is_set():
-                            raise TimeoutError("Parse timeout")
-                        hour, minute = int(match.group(1)), int(match.group(2))
-                        tomorrow = now + timedelta(days=1)
-                        result = tomorrow.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                        timeout_thread.cancel()  # Cancel timeout
-                        return result
-                    except (ValueError, IndexError):
-                        pass
-
-            # Thời gian trong ngày (sáng, chiều, tối)
-            time_of_day_patterns = [
-                (r'^sáng\s+(\d{1,2}):(\d{2})$', lambda h, m: now.replace(hour=h, minute=m, second=0, microsecond=0) if h < 12 else None),
-                (r'^chiều\s+(\d{1,2}):(\d{2})$', lambda h, m: now.replace(hour=h + 12 if h < 12 else h, minute=m, second=0, microsecond=0)),
-                (r'^tối\s+(\d{1,2}):(\d{2})$', lambda h, m: now.replace(hour=h + 12 if h < 12 else h, minute=m, second=0, microsecond=0)),
-                (r'^morning\s+(\d{1,2}):(\d{2})$', lambda h, m: now.replace(hour=h, minute=m, second=0, microsecond=0) if h < 12 else None),
-                (r'^afternoon\s+(\d{1,2}):(\d{2})$', lambda h, m: now.replace(hour=h + 12 if h < 12 else h, minute=m, second=0, microsecond=0)),
-                (r'^evening\s+(\d{1,2}):(\d{2})$', lambda h, m: now.replace(hour=h + 12 if h < 12 else h, minute=m, second=0, microsecond=0))
-            ]
+def _schedule_display_time(schedule):
+    """Thời gian hẹn dạng dd/mm/YYYY HH:MM, tính một lần rồi lưu vào bản ghi (danh sách được cache)"""
+    display_time = schedule.get('display_time')
+    if display_time is None:
+        display_time = schedule['display_time'] = schedule['schedule_time'].strftime('%d/%m/%Y %H:%M')
+    return display_time
 
-            for pattern, time_func in time_of_day_patterns:
-                match = re.match(pattern, time_input, re.IGNORECASE)
-                if match:
-                    try:
-                        if timeout_occurred.is_set():
-                            raise TimeoutError("Parse timeout")
-                        hour, minute = int(match.group(1)), int(match.group(2))
-                        schedule_time = time_func(hour, minute)
-                        if schedule_time and schedule_time <= now:
-                            schedule_time += timedelta(days=1)
-                        timeout_thread.cancel()  # Cancel timeout
-                        return schedule_time
-                    except (ValueError, IndexError):
-                        pass
-
-            # === CÁC TRƯỜNG HỢP ĐẶC BIỆT ===
-
-            # "ngay bây giờ", "now", "agora"
-            if time_input in ['ngay bây giờ', 'bây giờ', 'now', 'agora', 'immediately']:
-                if timeout_occurred.is_set():
-                    raise TimeoutError("Parse timeout")
-                result = now + timedelta(seconds=10)  # 10 giây sau để tránh conflict
-                timeout_thread.cancel()  # Cancel timeout
-                return result
 
-            # "1 tiếng nữa", "2 giờ sau"
-            if re.match(r'^(\d+)\s*(tiếng|tieng|hour|hours)\s*(nữa|sau|later)$', time_input, re.IGNORECASE):
-                try:
-                    if timeout_occurred.is_set():
-                        raise TimeoutError("Parse timeout")
-                    hours = int(re.findall(r'\d+', time_input)[0])
-                    result = now + timedelta(hours=hours)
-                    timeout_thread.cancel()  # Cancel timeout
-                    return result
-                except (ValueError, IndexError):
-                    pass
+async def _cb_schedule_forward_list(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Xem danh sách lịch hẹn giờ"""
+    query = update.callback_query
+    language = context.user_data.get('language', 'vi')
 
-            # Cancel timeout if no match found
-            timeout_thread.cancel()
-            return None
+    try:
+        # Lấy danh sách lịch hẹn giờ
+        scheduled_forwards = await get_scheduled_forwards_cached()
 
-        except TimeoutError:
-            logger.error("Timeout khi parse thời gian hẹn giờ")
-            return None
-        finally:
-            # Ensure timeout is always cancelled
-            try:
-                timeout_thread.cancel()
-            except Exception:
-                pass
+        if not scheduled_forwards:
+            if language == 'vi':
+                message = "📋 **DANH SÁCH LỊCH HẸN GIỜ**\n\n❌ Không có lịch hẹn giờ nào."
+            else:
+                message = "📋 **LISTA DE TAREFAS AGENDADAS**\n\n❌ Nenhuma tarefa agendada."
+        else:
+            if language == 'vi':
+                parts = [f"📋 **DANH SÁCH LỊCH HẸN GIỜ**\n\n📊 Tổng cộng: {len(scheduled_forwards)} lịch hẹn\n\n"]
+            else:
+                parts = [f"📋 **LISTA DE TAREFAS AGENDADAS**\n\n📊 Total: {len(scheduled_forwards)} tarefas\n\n"]
 
-    except Exception as e:
-        logger.error(f"Lỗi parse thời gian hẹn giờ: {e}")
-        return None
+            row_template = SCHEDULE_ROW_TEMPLATES['vi' if language == 'vi' else 'pt']
+            now = datetime.now()
+            for i, schedule in enumerate(scheduled_forwards[:10], 1):  # Hiển thị tối đa 10 lịch
+                status = 'pending' if schedule['schedule_time'] > now else 'overdue'
+                parts.append(row_template.format(
+                    i=i,
+                    emoji=SCHEDULE_STATUS_EMOJI[status],
+                    time=_schedule_display_time(schedule),
+                    target_type=schedule['target_type'],
+                    targets=len(schedule['target_ids']),
+                    status=status
+                ))
+
+            if len(scheduled_forwards) > 10:
+                if language == 'vi':
+                    parts.append(f"... và {len(scheduled_forwards) - 10} lịch hẹn khác")
+                else:
+                    parts.append(f"... e mais {len(scheduled_forwards) - 10} tarefas")
 
+            message = ''.join(parts)
+
+        # Thêm nút quay lại
+        reply_markup = back_markup(language, 'scheduled_forward')
+
+        await enqueue_edit(
+            query,
+            message,
+            reply_markup=reply_markup,
+            parse_mode=ParseMode.MARKDOWN
+        )
+
+    except Exception:
+        logger.exception("Lỗi lấy danh sách lịch hẹn giờ")
+        await enqueue_edit(query, SCHEDULE_ERROR_TEXTS['vi' if language == 'vi' else 'pt'])
+
+
+async def _cb_schedule_forward_stats(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Thống kê lịch hẹn giờ"""
+    query = update.callback_query
+    language = context.user_data.get('language', 'vi')
 
-async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    """Processar callbacks dos botões"""
     try:
-        print("🔘 Button handler called!")
-        query = update.callback_query
-        print(f"🔘 Query data: {query.data}")
-        print(f"🔘 User ID: {query.from_user.id}")
+        stats = await get_schedule_stats_cached()
 
-        await query.answer()
+        message = SCHEDULE_STATS_TEMPLATES['vi' if language == 'vi' else 'pt'].format_map(stats)
 
-        # Debug logging
-        print(f"🔘 Button clicked: {query.data} by user {query.from_user.id}")
-        logger.info(f"Button callback received: {query.data} from user {query.from_user.id}")
+        # Thêm nút quay lại
+        reply_markup = back_markup(language, 'scheduled_forward')
 
-        if not query.data:
-            logger.error("No callback data received")
-            return
+        await enqueue_edit(
+            query,
+            message,
+            reply_markup=reply_markup,
+            parse_mode=ParseMode.MARKDOWN
+        )
 
-        print(f"🔘 Processing callback: {query.data}")
+    except Exception:
+        logger.exception("Lỗi lấy thống kê lịch hẹn giờ")
+        await enqueue_edit(query, SCHEDULE_ERROR_TEXTS['vi' if language == 'vi' else 'pt'])
 
-        if query.data == 'promotions':
-            # Menu de promoções ABCD.BET
-            keyboard = [
-                [InlineKeyboardButton('👑 VIP Club',
-                                      callback_data='vip_club')],
-                [InlineKeyboardButton('🤝 Programa de Referência',
-                                      callback_data='referral')],
-
-                [InlineKeyboardButton('💳 Pacotes de Depósito',
-                                      callback_data='deposit_packages')],
-                [InlineKeyboardButton('🌅 Primeiro Depósito do Dia',
-                                      callback_data='daily_first_deposit')],
-                [InlineKeyboardButton('🎡 Roda da Fortuna',
-                                      callback_data='lucky_wheel')],
-                [InlineKeyboardButton('🎰 Roleta VIP',
-                                      callback_data='vip_roulette')],
-                [InlineKeyboardButton('📱 Baixar App Promocional',
-                                      callback_data='download_app')],
-                [InlineKeyboardButton('🆘 Compensação de Perda',
-                                      callback_data='loss_compensation')],
-                [InlineKeyboardButton('⬅️ Voltar',
-                                      callback_data='back')]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(
-                '🎁 **Programas Promocionais ABCD.BET**\n\n'
-                'Escolha o programa promocional que você gostaria de conhecer:',
-                reply_markup=reply_markup
-            )
+async def _cb_bulk_back(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Quay lại menu 'HỆ THỐNG GỬI TIN NHẮN HÀNG LOẠT'"""
+    query = update.callback_query
+    language = context.user_data.get('bulk_language', 'vi')
+    keyboard = get_bulk_messaging_menu_keyboard(language)
+    reply_markup = InlineKeyboardMarkup(keyboard)
 
-        elif query.data == 'deposit':
-            keyboard = [
-                [InlineKeyboardButton(
-                    '❌ Depósito não creditado',
-                    callback_data='deposit_not_credited'
-                )],
-                [InlineKeyboardButton(
-                    '🚫 Não consegue depositar',
-                    callback_data='deposit_failed'
-                )],
-                [InlineKeyboardButton(
-                    '⬅️ Voltar',
-                    callback_data='back'
-                )]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    await query.edit_message_text(
+        get_bulk_messaging_title(language),
+        reply_markup=reply_markup,
+    )
 
-            await query.edit_message_text(
-                '💰 **PROBLEMA DE DEPÓSITO**\n\n'
-                'Escolha o problema que você está enfrentando:',
-                reply_markup=reply_markup,
-            )
 
-        elif query.data == 'deposit_not_credited':
-            keyboard = [
-                [InlineKeyboardButton(
-                    '🆘 Atendimento ao cliente online',
-                    url=('https://vm.vondokua.com/'
-                         '1kdzfz0cdixxg0k59medjggvhv')
-                )],
-                [InlineKeyboardButton(
-                    '⬅️ Voltar',
-                    callback_data='deposit'
-                )]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+async def _cb_bulk_language(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Menu chọn ngôn ngữ cho bulk messaging"""
+    query = update.callback_query
+    keyboard = [
+        [InlineKeyboardButton('🇻🇳 Tiếng Việt', callback_data='bulk_lang_vi')],
+        [InlineKeyboardButton('🇨🇳 Tiếng Trung giản thể', callback_data='bulk_lang_zh')],
+        [InlineKeyboardButton('🇺🇸 Tiếng Anh', callback_data='bulk_lang_en')],
+        [InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_back')]
+    ]
+    reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(
-                '❌ **DEPÓSITO NÃO CREDITADO**\n\n'
-                '💡 **Informação:**\n'
-                'Devido ao grande volume de depósitos, o processamento de\n'
-                'transações pode estar atrasado.\n\n'
-                '⏰ **Tempo de processamento:**\n'
-                'Se após 1-10 minutos não foi creditado, entre em contato\n'
-                'com o atendimento ao cliente online para orientação\n'
-                'específica.\n\n'
-                '📞 **Contato de suporte:**\n'
-                'Clique em "Atendimento ao cliente online" para obter suporte imediatamente.',
-                reply_markup=reply_markup,
-            )
+    await query.edit_message_text(
+        '🌐 **CHỌN NGÔN NGỮ CHO HỆ THỐNG BULK MESSAGING**\n\n'
+        'Chọn ngôn ngữ bạn muốn sử dụng:',
+        reply_markup=reply_markup,
+    )
 
-        elif query.data == 'withdraw':
-            keyboard = [
-                [InlineKeyboardButton(
-                    '❌ Saque não recebido',
-                    callback_data='withdraw_not_received'
-                )],
-                [InlineKeyboardButton(
-                    '🚫 Não consegue sacar',
-                    callback_data='withdraw_failed'
-                )],
-                [InlineKeyboardButton(
-                    '⬅️ Voltar',
-                    callback_data='back'
-                )]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(
-                '💸 **PROBLEMA DE SAQUE**\n\n'
-                'Escolha o problema que você está enfrentando:',
-                reply_markup=reply_markup,
-            )
+async def _cb_bulk_lang_vi(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Đặt ngôn ngữ tiếng Việt"""
+    query = update.callback_query
+    context.user_data['bulk_language'] = 'vi'
+    await query.answer('✅ Đã chọn ngôn ngữ: Tiếng Việt')
 
-        elif query.data == 'register':
-            # Abrir mini app de cadastro de conta ABCD.BET
-            keyboard = [
-                [InlineKeyboardButton(
-                    '🌐 Abrir página de cadastro',
-                    url=('https://www.abcd.bet/v2/index.html?'
-                         'appName=0&pid=0&click_id=0&pixel_id=0&t=0#/Center')
-                )],
-                [InlineKeyboardButton(
-                    '📱 Baixar APP ABCD.BET',
-                    url='https://www.abcd.bet/app'
-                )],
-                [InlineKeyboardButton(
-                    '⬅️ Voltar',
-                    callback_data='back'
-                )]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    # Cập nhật admin commands theo ngôn ngữ mới
+    await update_admin_commands_for_user(context, 'vi', query.from_user.id)
 
-            await query.edit_message_text(
-                '📝 **CADASTRAR CONTA ABCDBET**\n\n'
-                '🎯 **Bem-vindo ao ABCD.BET!**\n\n'
-                '🎁 **PROMOÇÃO DE DEPÓSITO INCRÍVEL:**\n'
-                '• 🔥 Presente 100% do valor do primeiro depósito\n'
-                '• 💰 Reembolso de 10% todos os dias sem limite\n'
-                '• 🎰 Rodadas grátis 50 vezes para jogos de slot\n'
-                '• 🏆 Receba R$ 500 imediatamente após cadastro\n\n'
-                '📱 **BAIXE O APP ABCD.BET:**\n'
-                '• Baixe o app para receber mais R$ 200\n'
-                '• Experiência suave e rápida\n'
-                '• Atualizações promocionais em tempo real\n\n'
-                '🚀 **Comece agora:**\n'
-                'Clique em "Abrir página de cadastro" para receber ofertas!',
-                reply_markup=reply_markup
-            )
+    # Quay lại menu chính với ngôn ngữ tiếng Việt
+    keyboard = get_bulk_messaging_menu_keyboard('vi')
+    reply_markup = InlineKeyboardMarkup(keyboard)
+    await query.edit_message_text(
+        get_bulk_messaging_title('vi'),
+        reply_markup=reply_markup,
+    )
 
-        elif query.data == 'support':
-            keyboard = [
-                [InlineKeyboardButton(
-                    '🌐 Abrir Atendimento ao cliente online',
-                    url=('https://vm.vondokua.com/'
-                         '1kdzfz0cdixxg0k59medjggvhv')
-                )],
-                [InlineKeyboardButton(
-                    '⬅️ Voltar',
-                    callback_data='back'
-                )]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(
-                '🆘 **Atendimento ao Cliente Online**\n\n'
-                '🌐 **Link de Suporte:** Clique no botão abaixo para abrir a página de\n'
-                'suporte\n\n'
-                '👆 **Clique em "Abrir Suporte Online" para acessar agora!**',
-                reply_markup=reply_markup,
-            )
+async def _cb_bulk_lang_zh(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Đặt ngôn ngữ tiếng Trung"""
+    query = update.callback_query
+    context.user_data['bulk_language'] = 'zh'
+    await query.answer('✅ 已选择语言: 简体中文')
 
-        elif query.data == 'deposit_failed':
-            keyboard = [
-                [InlineKeyboardButton(
-                    '🆘 Atendimento ao cliente online',
-                    url=('https://vm.vondokua.com/'
-                         '1kdzfz0cdixxg0k59medjggvhv')
-                )],
-                [InlineKeyboardButton(
-                    '⬅️ Voltar',
-                    callback_data='deposit'
-                )]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    # Cập nhật admin commands theo ngôn ngữ mới
+    await update_admin_commands_for_user(context, 'zh', query.from_user.id)
 
-            await query.edit_message_text(
-                '🚫 **NÃO CONSEGUE DEPOSITAR**\n\n'
-                '💡 **Possíveis causas:**\n'
-                '• Problemas de conexão com a internet\n'
-                '• Limite de cartão atingido\n'
-                '• Problemas temporários do sistema\n'
-                '• Bloqueio de transação pelo banco\n\n'
-                '📞 **Solução:**\n'
-                'Entre em contato com o suporte para orientação específica.',
-                reply_markup=reply_markup,
-            )
+    # Quay lại menu chính với ngôn ngữ tiếng Trung
+    keyboard = get_bulk_messaging_menu_keyboard('zh')
+    reply_markup = InlineKeyboardMarkup(keyboard)
+    await query.edit_message_text(
+        get_bulk_messaging_title('zh'),
+        reply_markup=reply_markup,
+    )
 
-        elif query.data == 'withdraw_not_received':
-            keyboard = [
-                [InlineKeyboardButton(
-                    '🆘 Atendimento ao cliente online',
-                    url=('https://vm.vondokua.com/'
-                         '1kdzfz0cdixxg0k59medjggvhv')
-                )],
-                [InlineKeyboardButton(
-                    '⬅️ Voltar',
-                    callback_data='withdraw'
-                )]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(
-                '❌ **SAQUE NÃO RECEBIDO**\n\n'
-                '💡 **Informação:**\n'
-                'O processamento de saques pode levar de 1-24 horas\n'
-                'dependendo do método de pagamento escolhido.\n\n'
-                '⏰ **Tempo de processamento:**\n'
-                '• PIX: 1-2 horas\n'
-                '• Transferência bancária: 1-24 horas\n'
-                '• Criptomoedas: 1-6 horas\n\n'
-                '📞 **Se não recebeu após 24h:**\n'
-                'Entre em contato com o suporte imediatamente.',
-                reply_markup=reply_markup,
-            )
+async def _cb_bulk_lang_en(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Đặt ngôn ngữ tiếng Anh"""
+    query = update.callback_query
+    context.user_data['bulk_language'] = 'en'
+    await query.answer('✅ Language selected: English')
 
-        elif query.data == 'withdraw_failed':
-            keyboard = [
-                [InlineKeyboardButton(
-                    '🆘 Atendimento ao cliente online',
-                    url=('https://vm.vondokua.com/'
-                         '1kdzfz0cdixxg0k59medjggvhv')
-                )],
-                [InlineKeyboardButton(
-                    '⬅️ Voltar',
-                    callback_data='withdraw'
-                )]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    # Cập nhật admin commands theo ngôn ngữ mới
+    await update_admin_commands_for_user(context, 'en', query.from_user.id)
 
-            await query.edit_message_text(
-                '🚫 **NÃO CONSEGUE SACAR**\n\n'
-                '💡 **Possíveis causas:**\n'
-                '• Saldo insuficiente na conta\n'
-                '• Limite de saque diário atingido\n'
-                '• Conta não verificada\n'
-                '• Problemas temporários do sistema\n\n'
-                '📞 **Solução:**\n'
-                'Entre em contato com o suporte para verificar o status da sua conta.',
-                reply_markup=reply_markup,
-            )
+    # Quay lại menu chính với ngôn ngữ tiếng Anh
+    keyboard = get_bulk_messaging_menu_keyboard('en')
+    reply_markup = InlineKeyboardMarkup(keyboard)
+    await query.edit_message_text(
+        get_bulk_messaging_title('en'),
+        reply_markup=reply_markup,
+    )
 
-        elif query.data == 'back':
-            # Voltar ao menu principal
-            await show_main_menu(update, context)
 
-        elif query.data == 'vip_club':
-            # Menu de clube VIP
-            keyboard = [
-                [InlineKeyboardButton('⬅️ Voltar', callback_data='promotions')]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+async def _cb_manage_channels(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Menu quản lý kênh (chỉ admin)"""
+    query = update.callback_query
+    # Debug logging
+    logger.debug("manage_channels callback received from user %s", query.from_user.id)
 
-            await query.edit_message_text(
-                '👑 **Clube VIP ABCD.BET**\n\n'
-                '🌟 **Participar do clube VIP:**\n\n'
-                '📊 **Programa VIP com níveis de Novice até King.**\n'
-                'Benefícios crescem a cada nível: prêmios em dinheiro (BRL), '
-                'moedas NOW, valor de giros grátis e quantidade de giros '
-                'por dia.\n\n'
-                '🎯 **Atendimento ao cliente:** começa como Padrão e passa '
-                'a Prioridade a partir do nível Platinum.\n\n'
-                '💎 **Bônus exclusivo:** vai de 0% nos níveis iniciais '
-                'até 60% extra no nível King.\n\n'
-                '🏆 **Destaques:**\n\n'
-                '🥉 **Bronze:** 25 BRL, 250 NOW, 2 giros/dia.\n\n'
-                '🥈 **Silver:** 150 BRL, 1500 NOW, 20% extra.\n\n'
-                '🥇 **Gold:** 1000 BRL, 10.000 NOW, 30% extra.\n\n'
-                '💎 **Diamond:** 3125 BRL, 31.250 NOW, suporte '
-                'prioritário, 50% extra.\n\n'
-                '👑 **King:** 25.000 BRL, 250.000 NOW, 3 giros/dia, '
-                '60% extra.\n\n'
-                '🚀 **Suba de nível VIP e desfrute de benefícios '
-                'exclusivos!**',
-                reply_markup=reply_markup,
-            )
+    # Kiểm tra quyền admin
+    if query.from_user.id not in ADMIN_USER_IDS_SET:
+        await query.answer("❌ Bạn không có quyền sử dụng chức năng này!", show_alert=True)
+        return
 
-        elif query.data == 'referral':
-            # Menu de programa de referência
-            keyboard = [
-                [InlineKeyboardButton('⬅️ Voltar', callback_data='promotions')]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    # Menu quản lý kênh
+    current_channels = _FORWARD_CHANNELS
+    channel_count = len(current_channels)
 
-            await query.edit_message_text(
-                '🤝 **Programa de Referência ABCD.BET**\n\n'
-                '💰 **Convide seus amigos para receber recompensas:**\n\n'
-                '➡️ **Compartilhe o link da sua conta com seus amigos para '
-                'se registrar e receber os bônus correspondentes! Os detalhes '
-                'específicos são os seguintes:**\n\n'
-                '✔️ **Convide 1 amigo válido e ganhe R$24,8**\n'
-                '✔️ **Convide 5 amigos válidos e ganhe R$158,88**\n\n'
-                '➡️ **Como convidar amigos de forma eficaz:**\n\n'
-                '✔️ **Seu amigo completa o cadastro da conta e você recebe '
-                '0.2 real**\n\n'
-                '✔️ **O amigo que você convidar vem até a plataforma para '
-                'recarregar 30reais, e você ganhará 9,8 reais.**\n\n'
-                '✔️ **O valor total da aposta dos amigos que você convidar '
-                'para a plataforma é de R$ 700, e você receberá R$ 14,8.**\n\n'
-                '➡️➡️ **5 amigos cadastrados receberão um bônus adicional '
-                'de R$ 34,88 💰ao apostar**\n\n'
-                '🚀 **Comece a convidar amigos e ganhe recompensas '
-                'incríveis!**',
-                reply_markup=reply_markup,
-            )
+    # Lấy ngôn ngữ hiện tại
+    language = context.user_data.get('bulk_language', 'vi')
 
-        elif query.data == 'deposit_packages':
-            # Menu de pacotes de depósito
-            keyboard = [
-                [InlineKeyboardButton('⬅️ Voltar', callback_data='promotions')]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    if language == 'zh':
+        keyboard = [
+            [InlineKeyboardButton('➕ 添加新频道', callback_data='add_channel')],
+            [InlineKeyboardButton('📋 查看频道列表', callback_data='list_channels')],
+            [InlineKeyboardButton('❌ 删除频道', callback_data='remove_channel')],
+            [InlineKeyboardButton('⬅️ 返回', callback_data='bulk_back')]
+        ]
+    elif language == 'en':
+        keyboard = [
+            [InlineKeyboardButton('➕ Add new channel', callback_data='add_channel')],
+            [InlineKeyboardButton('📋 View channel list', callback_data='list_channels')],
+            [InlineKeyboardButton('❌ Delete channel', callback_data='remove_channel')],
+            [InlineKeyboardButton('⬅️ Back', callback_data='bulk_back')]
+        ]
+    else:
+        keyboard = [
+            [InlineKeyboardButton('➕ Thêm kênh mới', callback_data='add_channel')],
+            [InlineKeyboardButton('📋 Xem danh sách kênh', callback_data='list_channels')],
+            [InlineKeyboardButton('❌ Xóa kênh', callback_data='remove_channel')],
+            [InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_back')]
+        ]
 
-            await query.edit_message_text(
-                '💳 **Pacotes de Depósito ABCD.BET**\n\n'
-                '🎁 **Pacote de primeiro depósito:**\n'
-                'Por exemplo: Valor máximo de depósito é de 1000 BRL. '
-                'Deposite BRL 1000, e ganhe BRL 1000 de bônus.\n\n'
-                '🎁 **Pacote de Segundo Depósito:**\n'
-                'Por exemplo: Valor máximo de depósito é de 750 BRL. '
-                'Deposite BRL 750, e ganhe 375 BRL de bônus.\n\n'
-                '🎁 **Pacote de Terceiro Depósito:**\n'
-                'Por exemplo: Valor máximo de depósito é de 500 BRL. '
-                'Deposite BRL 500, e ganhe 375 BRL de bônus.\n\n'
-                '🚀 **Comece agora e aproveite nossos pacotes exclusivos!**',
-                reply_markup=reply_markup,
-            )
+    title = get_message('manage_channels', language, channel_count=channel_count)
 
-        elif query.data == 'daily_first_deposit':
-            # Menu de primeiro depósito do dia
-            keyboard = [
-                [InlineKeyboardButton('⬅️ Voltar', callback_data='promotions')]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(
-                '💎 **PROMOÇÃO ESPECIAL – DEPOSITE E RECEBA BÔNUS TODOS OS DIAS!** 💎\n\n'
-                '👉 **Válido somente para o primeiro depósito do dia na ABCD.BET**\n\n'
-                '🔹 **Deposite de R$ 20 a R$ 99** → Bônus de **+2%** diretamente na conta\n'
-                '🔹 **Deposite de R$ 100 ou mais** → Bônus de **+3%** extremamente atrativo\n\n'
-                '⚡ **O bônus será adicionado automaticamente após o depósito ser efetuado!**\n\n'
-                '📌 **Observação importante:**\n\n'
-                '• Cada conta pode receber apenas **1 bônus por dia**.\n'
-                '• O bônus precisa ser apostado **10 vezes** para ser liberado e pode ser sacado ou continuado jogando.\n\n'
-                '🔥 **Não perca a oportunidade de maximizar sua renda diária com a ABCD.BET!**\n\n'
-                '⏰ **Cadastre-se agora!**',
-                reply_markup=reply_markup,
-            )
+    await query.edit_message_text(
+        title,
+        reply_markup=reply_markup,
+    )
 
-        elif query.data == 'vip_roulette':
-            # Menu de roleta VIP
-            keyboard = [
-                [InlineKeyboardButton('⬅️ Voltar', callback_data='promotions')]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(
-                '🎰 **Roleta VIP ABCD.BET**\n\n'
-                '🎯 **Como participar:**\n\n'
-                '✅ Basta concluir o cadastro para se tornar um jogador em '
-                'nossa plataforma ABCD.BET e você terá a oportunidade de '
-                'girar a roleta **uma vez por dia**.\n\n'
-                '💳 **Depósito e apostas:**\n'
-                'Você pode acessar a plataforma normalmente para depositar '
-                'dinheiro e apostar no jogo.\n\n'
-                '🚀 **Benefícios VIP:**\n'
-                'No futuro, quanto maior for o seu nível VIP, mais vezes '
-                'você poderá girar a roleta por dia.\n\n'
-                '🎁 **Recompensas VIP:**\n'
-                'As recompensas VIP da roleta são alocadas de acordo com '
-                'o seu nível VIP. Quanto maior o seu nível, mais rodadas '
-                'grátis você pode obter.\n\n'
-                '📈 **Upgrades VIP:**\n'
-                'À medida que seus upgrades VIP, as recompensas e bônus '
-                'na roda da roleta também aumentarão.\n\n'
-                '🎯 **Probabilidade:**\n'
-                'Você pode obter A probabilidade também é maior, '
-                'obrigado!\n\n'
-                '🌟 **Comece agora e suba de nível VIP para mais '
-                'recompensas!**',
-                reply_markup=reply_markup,
-            )
+async def _cb_select_channels_to_send(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Chọn kênh để gửi tin nhắn"""
+    query = update.callback_query
+    user_id = query.from_user.id
 
-        elif query.data == 'download_app':
-            # Menu de download do app
-            keyboard = [
-                [InlineKeyboardButton('⬅️ Voltar', callback_data='promotions')]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    # Kiểm tra quyền admin
+    if user_id not in ADMIN_USER_IDS_SET:
+        await query.answer("❌ Bạn không có quyền sử dụng chức năng này!", show_alert=True)
+        return
 
-            await query.edit_message_text(
-                '🎉 **FAÇA LOGIN NO EVENTO PARA GANHAR BÔNUS – GANHE R$ 50 AGORA!** 🎉\n\n'
-                '👉 **Basta:**\n\n'
-                '1️⃣ **Depositar e registrar-se** para participar do evento.\n\n'
-                '2️⃣ **Baixar a versão mais recente** do jogo e fazer login continuamente por 3 dias.\n\n'
-                '💰 **Recompensas super fáceis:**\n\n'
-                '✅ **Dia 1:** Faça login e receba **R$ 10** imediatamente\n\n'
-                '✅ **Dia 2:** Continue fazendo login para receber mais **R$ 10**\n\n'
-                '✅ **Dia 3:** Faça login com o conjunto completo e receba **R$ 30** imediatamente\n\n'
-                '🔥 **No total, você receberá R$ 50 grátis** imediatamente com apenas 3 dias de login!\n\n'
-                '⏳ **Corra e participe para não perder a chance!**',
-                reply_markup=reply_markup,
-            )
+    # Lấy danh sách kênh hiện tại
+    all_channels = _FORWARD_CHANNELS
 
-        elif query.data == 'lucky_wheel':
-            # Menu de roda da fortuna
-            keyboard = [
-                [InlineKeyboardButton('⬅️ Voltar', callback_data='promotions')]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    if not all_channels:
+        await query.edit_message_text(
+            "❌ **KHÔNG CÓ KÊNH NÀO**\n\n"
+            "Chưa có kênh nào được cấu hình.\n"
+            "Hãy thêm kênh trước khi sử dụng tính năng này.",
+            reply_markup=back_markup('vi', 'manage_channels')
+        )
+        return
 
-            await query.edit_message_text(
-                '🎡 **RODA DA FORTUNA ABCD.BET**\n\n'
-                '🎯 **Como participar:**\n\n'
-                '✅ **Cadastro automático:** Basta se cadastrar na plataforma ABCD.BET\n'
-                '✅ **Acesso diário:** Gire a roda **uma vez por dia** gratuitamente\n'
-                '✅ **Sem depósito:** Não é necessário depositar para participar\n\n'
-                '🎁 **Prêmios possíveis:**\n\n'
-                '💰 **Prêmios em dinheiro:** R$ 5, R$ 10, R$ 20, R$ 50, R$ 100\n'
-                '🎰 **Rodadas grátis:** 10x, 25x, 50x, 100x para jogos de slot\n'
-                '🎁 **Bônus especiais:** Multiplicadores, cashback, e muito mais\n\n'
-                '🚀 **Benefícios VIP:**\n'
-                '• Níveis VIP mais altos = mais giros por dia\n'
-                '• Prêmios exclusivos para membros VIP\n'
-                '• Acesso prioritário a eventos especiais\n\n'
-                '⏰ **Horário:** Disponível 24/7\n'
-                '🎯 **Probabilidade:** Todos têm chance de ganhar!\n\n'
-                '🌟 **Comece agora e teste sua sorte na Roda da Fortuna!**',
-                reply_markup=reply_markup,
-            )
+    # Tạo keyboard chọn kênh
+    keyboard = create_channel_selection_keyboard(user_id)
 
-        elif query.data == 'loss_compensation':
-            # Menu de compensação de perda
-            keyboard = [
-                [InlineKeyboardButton('⬅️ Voltar', callback_data='promotions')]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    # Lấy ngôn ngữ hiện tại
+    language = context.user_data.get('bulk_language', 'vi')
 
-            await query.edit_message_text(
-                '🆘 **Compensação de Perda ABCD.BET**\n\n'
-                '📋 **Detalhes da Promoção:**\n\n'
-                '1️⃣ **O Acampamento feliz é uma promoção que recompensa '
-                'suas perdas no jogo seguindo a tabela acima;**\n\n'
-                '2️⃣ **A participação dos membros nas atividades é '
-                'registrada automaticamente pelo sistema. Em caso de '
-                'disputa, a decisão resultante da consulta com a '
-                'ABCDBET prevalecerá;**\n\n'
-                '3️⃣ **Se você esquecer a sua conta/senha, você pode '
-                'restaurar em {Esquecer senha] na página de log-in ou '
-                'entrar em contato com o atendimento ao cliente '
-                'on-line 24 horas para ajudá-lo a recuperar as '
-                'informações da sua conta;**\n\n'
-                '4️⃣ **Participar desta oferta significa concordar com '
-                'as Regras e Termos da Oferta.**\n\n'
-                '🚀 **Aproveite nossa promoção de compensação e '
-                'recupere suas perdas!**',
-                reply_markup=reply_markup,
-            )
+    title = get_message('select_channels', language, channel_count=len(all_channels))
 
-        elif query.data == 'telegram_support':
-            keyboard = [
-                [InlineKeyboardButton(
-                    '📱 Abrir @ABCDBETONLINE',
-                    url='https://t.me/ABCDBETONLINE'
-                )],
-                [InlineKeyboardButton(
-                    '⬅️ Voltar',
-                    callback_data='back'
-                )]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    await query.edit_message_text(
+        title,
+        reply_markup=keyboard
+    )
 
-            await query.edit_message_text(
-                '💬 **Atendimento ao Cliente Telegram**\n\n'
-                '🚀 **Conecte-se diretamente com o ABCD Support!**\n\n'
-                '📞 **Canal oficial:** @ABCDBETONLINE\n'
-                '⏰ **Funcionamento:** 24/7 - Sem parar\n'
-                '⚡ **Resposta:** Instantânea e profissional\n'
-                '🎯 **Suporte:** Depósito/Saque, Promoções, Dúvidas\n\n'
-                '👆 **Clique no botão abaixo para abrir o Telegram agora!**',
-                reply_markup=reply_markup,
-            )
 
-        elif query.data == 'scheduled_forward':
-            # Hiển thị menu hẹn giờ chuyển tiếp
-            language = context.user_data.get('language', 'vi')
-            keyboard = get_scheduled_forward_menu_keyboard(language)
-            reply_markup = InlineKeyboardMarkup(keyboard)
+async def _cb_add_channel(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Thêm kênh mới"""
+    query = update.callback_query
+    language = context.user_data.get('bulk_language', 'vi')
 
-            await query.edit_message_text(
-                get_scheduled_forward_title(language),
-                reply_markup=reply_markup,
-                parse_mode=ParseMode.MARKDOWN
-            )
+    await query.edit_message_text(
+        get_message('add_channel', language),
+        reply_markup=back_markup(language, 'manage_channels')
+    )
 
-        elif query.data == 'schedule_forward_set':
-            # Thiết lập hẹn giờ chuyển tiếp
-            language = context.user_data.get('language', 'vi')
+    # Đặt trạng thái chờ thêm kênh
+    context.user_data['waiting_for_channel'] = True
+    context.user_data['action_type'] = 'add_channel'
 
-            # Đặt trạng thái chờ tin nhắn để hẹn giờ
-            context.user_data['waiting_for_schedule_message'] = True
-            context.user_data['schedule_forward_type'] = 'all_customers'
 
-            if language == 'vi':
-                message = (
-                    "⏰ **THIẾT LẬP HẸN GIỜ CHUYỂN TIẾP**\n\n"
-                    "📝 Gửi tin nhắn hoặc media mà bạn muốn hẹn giờ chuyển tiếp.\n\n"
-                    "💡 **Hướng dẫn:**\n"
-                    "• Gửi tin nhắn text để hẹn giờ chuyển tiếp\n"
-                    "• Gửi hình ảnh, video, file kèm caption\n"
-                    "• Forward tin nhắn từ kênh khác\n\n"
-                    "⏰ Sau khi gửi tin nhắn, bạn sẽ được yêu cầu nhập thời gian hẹn giờ."
-                )
-            else:
-                message = (
-                    "⏰ **CONFIGURAR ENCAMINHAMENTO AGENDADO**\n\n"
-                    "📝 Envie a mensagem ou mídia que deseja agendar para encaminhamento.\n\n"
-                    "💡 **Instruções:**\n"
-                    "• Envie mensagem de texto para agendar encaminhamento\n"
-                    "• Envie imagem, vídeo, arquivo com legenda\n"
-                    "• Encaminhe mensagem de outro canal\n\n"
-                    "⏰ Após enviar a mensagem, você será solicitado a inserir o horário agendado."
-                )
+async def _cb_list_channels(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Hiển thị danh sách kênh"""
+    query = update.callback_query
+    current_channels = _FORWARD_CHANNELS
+    language = context.user_data.get('bulk_language', 'vi')
 
-            await query.edit_message_text(message, parse_mode=ParseMode.MARKDOWN)
+    if current_channels:
+        parts = [get_message('list_channels_header', language)]
+        parts.extend(f'{i}. `{channel_id}`\n' for i, channel_id in enumerate(current_channels, 1))
+        parts.append(get_message('list_channels_total', language, channel_count=len(current_channels)))
+        channel_list = ''.join(parts)
+    else:
+        channel_list = get_message('list_channels_empty', language)
 
-        elif query.data == 'schedule_forward_list':
-            # Xem danh sách lịch hẹn giờ
-            language = context.user_data.get('language', 'vi')
-            user_id = query.from_user.id
+    if language == 'zh':
+        keyboard = [
+            [InlineKeyboardButton('➕ 添加新频道', callback_data='add_channel')],
+            [InlineKeyboardButton('❌ 删除频道', callback_data='remove_channel')],
+            [InlineKeyboardButton('⬅️ 返回', callback_data='manage_channels')]
+        ]
+    elif language == 'en':
+        keyboard = [
+            [InlineKeyboardButton('➕ Add new channel', callback_data='add_channel')],
+            [InlineKeyboardButton('❌ Delete channel', callback_data='remove_channel')],
+            [InlineKeyboardButton('⬅️ Back', callback_data='manage_channels')]
+        ]
+    else:
+        keyboard = [
+            [InlineKeyboardButton('➕ Thêm kênh mới', callback_data='add_channel')],
+            [InlineKeyboardButton('❌ Xóa kênh', callback_data='remove_channel')],
+            [InlineKeyboardButton('⬅️ Quay lại', callback_data='manage_channels')]
+        ]
 
-            try:
-                # Lấy danh sách lịch hẹn giờ
-                scheduled_forwards = scheduled_forward_manager.get_scheduled_forwards(user_id)
+    reply_markup = InlineKeyboardMarkup(keyboard)
 
-                if not scheduled_forwards:
-                    if language == 'vi':
-                        message = "📋 **DANH SÁCH LỊCH HẸN GIỜ**\n\n❌ Không có lịch hẹn giờ nào."
-                    else:
-                        message = "📋 **LISTA DE TAREFAS AGENDADAS**\n\n❌ Nenhuma tarefa agendada."
-                else:
-                    if language == 'vi':
-                        message = f"📋 **DANH SÁCH LỊCH HẸN GIỜ**\n\n📊 Tổng cộng: {len(scheduled_forwards)} lịch hẹn\n\n"
-                    else:
-                        message = f"📋 **LISTA DE TAREFAS AGENDADAS**\n\n📊 Total: {len(scheduled_forwards)} tarefas\n\n"
-
-                    for i, schedule in enumerate(scheduled_forwards[:10], 1):  # Hiển thị tối đa 10 lịch
-                        schedule_time = datetime.fromisoformat(schedule['schedule_time'])
-                        status_emoji = {
-                            'scheduled': '⏰',
-                            'executing': '🔄',
-                            'completed': '✅',
-                            'failed': '❌',
-                            'cancelled': '🚫'
-                        }.get(schedule['status'], '❓')
-
-                        if language == 'vi':
-                            message += (
-                                f"{i}. {status_emoji} **{schedule_time.strftime('%d/%m/%Y %H:%M')}**\n"
-                                f"   📝 Loại: {schedule['forward_type']}\n"
-                                f"   📊 Trạng thái: {schedule['status']}\n\n"
-                            )
-                        else:
-                            message += (
-                                f"{i}. {status_emoji} **{schedule_time.strftime('%d/%m/%Y %H:%M')}**\n"
-                                f"   📝 Tipo: {schedule['forward_type']}\n"
-                                f"   📊 Status: {schedule['status']}\n\n"
-                            )
-
-                    if len(scheduled_forwards) > 10:
-                        if language == 'vi':
-                            message += f"... và {len(scheduled_forwards) - 10} lịch hẹn khác"
-                        else:
-                            message += f"... e mais {len(scheduled_forwards) - 10} tarefas"
-
-                # Thêm nút quay lại
-                keyboard = [[InlineKeyboardButton('⬅️ Quay lại' if language == 'vi' else '⬅️ Voltar', callback_data='scheduled_forward')]]
-                reply_markup = InlineKeyboardMarkup(keyboard)
+    await query.edit_message_text(
+        channel_list,
+        reply_markup=reply_markup,
+    )
 
-                await query.edit_message_text(
-                    message,
-                    reply_markup=reply_markup,
-                    parse_mode=ParseMode.MARKDOWN
-                )
 
-            except Exception as e:
-                logger.error(f"Lỗi lấy danh sách lịch hẹn giờ: {e}")
-                error_message = f"❌ **LỖI**\n\nLỗi: {str(e)}" if language == 'vi' else f"❌ **ERRO**\n\nErro: {str(e)}"
-                await query.edit_message_text(error_message)
+async def _cb_remove_channel(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Xóa kênh"""
+    query = update.callback_query
+    current_channels = _FORWARD_CHANNELS
+    language = context.user_data.get('bulk_language', 'vi')
 
-        elif query.data == 'schedule_forward_stats':
-            # Thống kê lịch hẹn giờ
-            language = context.user_data.get('language', 'vi')
+    if not current_channels:
+        await query.edit_message_text(
+            get_message('remove_channel_empty', language),
+            reply_markup=back_markup(language, 'manage_channels')
+        )
+        return
 
-            try:
-                stats = scheduled_forward_manager.get_schedule_stats()
+    # Tạo danh sách kênh để chọn xóa
+    keyboard = []
+    for i, channel_id in enumerate(current_channels):
+        keyboard.append([InlineKeyboardButton(
+            f'❌ {i + 1}. {channel_id}',
+            callback_data=f'delete_channel_{i}'
+        )])
 
-                if language == 'vi':
-                    message = (
-                        "📊 **THỐNG KÊ LỊCH HẸN GIỜ**\n\n"
-                        f"📈 **Tổng quan:**\n"
-                        f"• 📋 Tổng cộng: {stats['total']}\n"
-                        f"• ⏰ Đang chờ: {stats['scheduled']}\n"
-                        f"• 🔄 Đang thực hiện: {stats['running']}\n"
-                        f"• ✅ Hoàn thành: {stats['completed']}\n"
-                        f"• ❌ Thất bại: {stats['failed']}\n"
-                        f"• 🚫 Đã hủy: {stats['cancelled']}\n\n"
-                        f"💡 **Tỷ lệ thành công:** {stats['completed'] / (stats['total'] or 1) * 100:.1f}%"
-                    )
-                else:
-                    message = (
-                        "📊 **ESTATÍSTICAS DE TAREFAS AGENDADAS**\n\n"
-                        f"📈 **Visão geral:**\n"
-                        f"• 📋 Total: {stats['total']}\n"
-                        f"• ⏰ Agendadas: {stats['scheduled']}\n"
-                        f"• 🔄 Executando: {stats['running']}\n"
-                        f"• ✅ Concluídas: {stats['completed']}\n"
-                        f"• ❌ Falharam: {stats['failed']}\n"
-                        f"• 🚫 Canceladas: {stats['cancelled']}\n\n"
-                        f"💡 **Taxa de sucesso:** {stats['completed'] / (stats['total'] or 1) * 100:.1f}%"
-                    )
+    keyboard.append([_back(language, 'manage_channels')])
+
+    reply_markup = InlineKeyboardMarkup(keyboard)
+
+    title = get_message('remove_channel', language)
+
+    await query.edit_message_text(
+        title,
+        reply_markup=reply_markup,
+    )
+
+
+async def _cb_confirm_forward(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Xác nhận forward media đang chờ đến các kênh"""
+    query = update.callback_query
+    # Kiểm tra quyền admin
+    user_id = query.from_user.id
+    if user_id not in ADMIN_USER_IDS_SET:
+        await query.edit_message_text('❌ Bạn không có quyền thực hiện hành động này.')
+        return
+
+    pending = _PENDING_FORWARDS.get(str(user_id))
+    if not pending:
+        await query.edit_message_text('⚠️ Không có tác vụ chuyển tiếp nào đang chờ.')
+        return
+
+    await query.edit_message_text('⏳ Đang chuyển tiếp media đến các kênh...')
+    # Thực hiện forward
+    forward_channels = _FORWARD_CHANNELS
+    # _PENDING_FORWARDS lưu message gốc của kênh nếu admin forward bài đăng từ kênh khác
+    from_chat_id = pending.get('original_chat_id', pending.get('chat_id'))
+    message_id = pending.get('original_message_id', pending.get('message_id'))
+    success, failed_channels = await _forward_to_channels(
+        context.bot, forward_channels, from_chat_id, message_id
+    )
+    failed = len(failed_channels)
+
+    # Báo kết quả
+    result = f"✅ Hoàn thành: {success} thành công, {failed} thất bại."
+    if failed:
+        result += "\nKênh lỗi:\n" + '\n'.join(failed_channels[:5])
+
+    await query.edit_message_text(result)
+
+    # Ghi log và reset trạng thái
+    await _sheets(sheets_manager.add_message_log, str(user_id), f"Forwarded media to {success}/{len(forward_channels)} channels", 'forward_media_to_channels', 'sent')
+    context.user_data.pop('waiting_for_confirmation', None)
+    _PENDING_FORWARDS.pop(str(user_id), None)
+    return
+
+
+async def _cb_cancel_forward(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Hủy tác vụ"""
+    query = update.callback_query
+    context.user_data.pop('waiting_for_confirmation', None)
+    _PENDING_FORWARDS.pop(str(query.from_user.id), None)
+    await query.edit_message_text('❎ Đã hủy tác vụ chuyển tiếp.')
+    return
+
+
+# ===== XỬ LÝ CHỌN KÊNH GỬI =====
+async def _cb_select_all_channels(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Chọn tất cả kênh"""
+    query = update.callback_query
+    user_id = query.from_user.id
+    selected_channels = select_all_channels(user_id)
+
+    await query.answer(f"✅ Đã chọn {len(selected_channels)} kênh")
+
+    # Cập nhật keyboard
+    keyboard = create_channel_selection_keyboard(user_id)
+    await query.edit_message_reply_markup(reply_markup=keyboard)
 
-                # Thêm nút quay lại
-                keyboard = [[InlineKeyboardButton('⬅️ Quay lại' if language == 'vi' else '⬅️ Voltar', callback_data='scheduled_forward')]]
-                reply_markup = InlineKeyboardMarkup(keyboard)
 
-                await query.edit_message_text(
-                    message,
-                    reply_markup=reply_markup,
-                    parse_mode=ParseMode.MARKDOWN
-                )
+async def _cb_deselect_all_channels(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Bỏ chọn tất cả kênh"""
+    query = update.callback_query
+    user_id = query.from_user.id
+    deselect_all_channels(user_id)
+
+    await query.answer("🔴 Đã bỏ chọn tất cả kênh")
+
+    # Cập nhật keyboard
+    keyboard = create_channel_selection_keyboard(user_id)
+    await query.edit_message_reply_markup(reply_markup=keyboard)
+
+
+async def _cb_confirm_send_to_channels(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Xác nhận gửi đến các kênh đã chọn"""
+    query = update.callback_query
+    user_id = query.from_user.id
+    selected_set = get_admin_selected_channels(user_id)
+
+    if not selected_set:
+        await query.answer("❌ Chưa chọn kênh nào!", show_alert=True)
+        return
+
+    # Giữ thứ tự kênh theo cấu hình
+    all_channels = _FORWARD_CHANNELS
+    selected_channels = [c for c in all_channels if c in selected_set]
+    selected_channels += sorted(selected_set.difference(selected_channels))
+
+    # Đặt trạng thái chờ tin nhắn để gửi đến kênh
+    context.user_data['waiting_for_message'] = True
+    context.user_data['message_type'] = 'forward_to_selected_channels'
+    context.user_data['selected_channels'] = selected_channels
+
+    # Tạo nội dung tin nhắn
+    channel_list = '\n'.join([f"• {c}" for c in selected_channels[:5]])
+    if len(selected_channels) > 5:
+        channel_list += f"\n• ... và {len(selected_channels) - 5} kênh khác"
+
+    message_text = (
+        f"📢 **GỬI TIN NHẮN ĐẾN {len(selected_channels)} KÊNH ĐÃ CHỌN**\n\n"
+        f"**Kênh đã chọn:**\n{channel_list}\n\n"
+        "**Bây giờ hãy gửi tin nhắn hoặc media bạn muốn gửi đến các kênh này:**"
+    )
+
+    await query.edit_message_text(
+        message_text,
+        reply_markup=CANCEL_CHANNEL_SELECTION_KB
+    )
+
 
-            except Exception as e:
-                logger.error(f"Lỗi lấy thống kê lịch hẹn giờ: {e}")
-                error_message = f"❌ **LỖI**\n\nLỗi: {str(e)}" if language == 'vi' else f"❌ **ERRO**\n\nErro: {str(e)}"
-                await query.edit_message_text(error_message)
+async def _cb_cancel_channel_selection(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Hủy chọn kênh"""
+    query = update.callback_query
+    user_id = query.from_user.id
+    set_admin_selected_channels(user_id, ())
 
-        elif query.data == 'bulk_back':
-            # Quay lại menu "HỆ THỐNG GỬI TIN NHẮN HÀNG LOẠT"
-            language = context.user_data.get('bulk_language', 'vi')
-            keyboard = get_bulk_messaging_menu_keyboard(language)
-            reply_markup = InlineKeyboardMarkup(keyboard)
+    await query.answer("❌ Đã hủy chọn kênh")
 
-            await query.edit_message_text(
-                get_bulk_messaging_title(language),
-                reply_markup=reply_markup,
-            )
+    # Quay lại menu quản lý kênh
+    await query.edit_message_text(
+        "❌ **ĐÃ HỦY CHỌN KÊNH**\n\n"
+        "Bạn có thể sử dụng lệnh /manage_channels để quản lý kênh.",
+        reply_markup=back_markup('vi', 'manage_channels')
+    )
 
-        elif query.data.startswith('cmd_'):
-            # Xử lý các callback command nhanh
-            command = query.data.split('_')[1]
 
-            # Tạo fake update để gọi command handler
-            fake_update = Update(
-                update_id=query.update_id,
-                callback_query=query
-            )
+async def _cb_stats_info(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Hiển thị thông tin thống kê"""
+    query = update.callback_query
+    user_id = query.from_user.id
+    selected_channels = get_admin_selected_channels(user_id)
+    all_channels = _FORWARD_CHANNELS
 
-            # Thực thi command tương ứng
-            if command == 'start':
-                await start(fake_update, context)
-            elif command == 'help':
-                # Gọi help command trực tiếp
-                await fake_update.message.reply_text(
-                    '🤖 **ABCDBET Customer Service Bot - Ajuda**\n\n'
-                    '📋 **Comandos principais:**\n'
-                    '/start - 🚀 Iniciar bot\n'
-                    '/help - ❓ Ajuda e comandos\n'
-                    '/menu - 📋 Menu Principal\n'
-                    '/commands - 📋 Lista de comandos\n'
-                    '/quick - ⚡ Comandos rápidos\n'
-                    '/hint - 💡 Dicas de comandos\n\n'
-                    '🎁 **Promoções e Bônus:**\n'
-                    '/promotions - 🎁 Promoções e bônus\n'
-                    '/deposit_packages - 💳 Pacotes de Depósito\n'
-                    '/daily_first_deposit - 🌅 Primeiro Depósito do Dia\n'
-                    '/vip - 👑 VIP Club\n'
-                    '/referral - 🤝 Programa de Referência\n'
-                    '/lucky_wheel - 🎡 Roda da Fortuna\n'
-                    '/vip_roulette - 🎰 Roleta VIP\n\n'
-                    '💰 **Depósito e Saque:**\n'
-                    '/register - 📝 Cadastrar Conta\n'
-                    '/deposit - 💰 Problema de Depósito\n'
-                    '/withdraw - 💸 Problema de Saque\n'
-                    '/status - 📊 Status da Conta\n\n'
-                    '🆘 **Suporte e Informações:**\n'
-                    '/support - 🆘 Suporte ao Cliente\n'
-                    '/rules - 📜 Regras e Termos\n'
-                    '/faq - ❓ Perguntas Frequentes\n'
-                    '/contact - 📞 Contato Direto\n\n'
-                    '🌐 **Configurações:**\n'
-                    '/language - 🌐 Alterar Idioma\n'
-                    '/download_app - 📱 Baixar App\n\n'
-                    '🔐 **Lệnh Admin (chỉ dành cho admin):**\n'
-                    '/bulk - 📢 Gửi tin nhắn hàng loạt\n'
-                    '/manage_channels - ⚙️ Quản lý kênh chuyển tiếp\n'
-                    '/stats - 📊 Xem thống kê khách hàng\n'
-                    '/stop_bulk - 🛑 Dừng gửi tin nhắn hàng loạt\n'
-                    '/reload - 🔄 Reload bot (Admin only)\n'
-                    '/health - 🏥 Kiểm tra sức khỏe bot (Admin only)\n\n'
-                    '💡 **Dica:** Use os botões do menu para navegar facilmente!\n'
-                    '🔍 **Dica:** Digite / seguido do comando para usar qualquer função!'
-                )
-            elif command == 'menu':
-                await show_main_menu(fake_update, context)
-            elif command == 'commands':
-                # Gọi commands list trực tiếp
-                commands_text = (
-                    '📋 **LISTA COMPLETA DE COMANDOS**\n\n'
-                    '🚀 **COMANDOS PRINCIPAIS:**\n'
-                    '• `/start` - Iniciar bot\n'
-                    '• `/help` - Ajuda e comandos\n'
-                    '• `/menu` - Menu Principal\n'
-                    '• `/commands` - Esta lista de comandos\n\n'
-                    '🎁 **PROMOÇÕES E BÔNUS:**\n'
-                    '• `/promotions` - Promoções e bônus\n'
-                    '• `/deposit_packages` - Pacotes de Depósito\n'
-                    '• `/daily_first_deposit` - Primeiro Depósito do Dia\n'
-                    '• `/vip` - VIP Club\n'
-                    '• `/referral` - Programa de Referência\n'
-                    '• `/lucky_wheel` - Roda da Fortuna\n'
-                    '• `/vip_roulette` - Roleta VIP\n\n'
-                    '💰 **DEPÓSITO E SAQUE:**\n'
-                    '• `/register` - Cadastrar Conta\n'
-                    '• `/deposit` - Problema de Depósito\n'
-                    '• `/withdraw` - Problema de Saque\n'
-                    '• `/status` - Status da Conta\n\n'
-                    '🆘 **SUPORTE E INFORMAÇÕES:**\n'
-                    '• `/support` - Suporte ao Cliente\n'
-                    '• `/rules` - Regras e Termos\n'
-                    '• `/faq` - Perguntas Frequentes\n'
-                    '• `/contact` - Contato Direto\n\n'
-                    '🌐 **CONFIGURAÇÕES:**\n'
-                    '• `/language` - Alterar Idioma\n'
-                    '• `/download_app` - Baixar App\n\n'
-                    '🔐 **COMANDOS ADMIN:**\n'
-                    '• `/bulk` - Gửi tin nhắn hàng loạt\n'
-                    '• `/manage_channels` - Quản lý kênh\n'
-                    '• `/stats` - Thống kê khách hàng\n'
-                    '• `/stop_bulk` - Dừng gửi tin nhắn\n\n'
-                    '💡 **DICA:** Digite `/` seguido do comando para usar qualquer função!\n'
-                    '📱 **EXEMPLO:** `/vip`, `/status`, `/rules`'
-                )
-                await fake_update.message.reply_text(commands_text)
-            elif command == 'promotions':
-                # Gọi promotions trực tiếp
-                keyboard = [
-                    [InlineKeyboardButton('👑 VIP Club', callback_data='vip_club')],
-                    [InlineKeyboardButton('🤝 Programa de Referência', callback_data='referral')],
-                    [InlineKeyboardButton('💳 Pacotes de Depósito', callback_data='deposit_packages')],
-                    [InlineKeyboardButton('🌅 Primeiro Depósito do Dia', callback_data='daily_first_deposit')],
-                    [InlineKeyboardButton('🎡 Roda da Fortuna', callback_data='lucky_wheel')],
-                    [InlineKeyboardButton('🎰 Roleta VIP', callback_data='vip_roulette')],
-                    [InlineKeyboardButton('📱 Baixe o aplicativo de promoção', callback_data='download_app')],
-                    [InlineKeyboardButton('🆘 Compensação de Perda', callback_data='loss_compensation')],
-                    [InlineKeyboardButton('⬅️ Voltar', callback_data='back')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                await fake_update.message.reply_text(
-                    '🎁 **Programas Promocionais ABCD.BET**\n\n'
-                    'Escolha o programa promocional que você gostaria de conhecer:',
-                    reply_markup=reply_markup
-                )
-            elif command == 'vip':
-                # Gọi VIP trực tiếp
-                keyboard = [
-                    [InlineKeyboardButton('👑 VIP Club', callback_data='vip_club')],
-                    [InlineKeyboardButton('⬅️ Voltar', callback_data='back')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                await fake_update.message.reply_text(
-                    '👑 **VIP Club ABCD.BET**\n\n'
-                    'Bem-vindo ao programa VIP exclusivo!',
-                    reply_markup=reply_markup
-                )
-            elif command == 'deposit':
-                # Gọi deposit trực tiếp
-                keyboard = [
-                    [InlineKeyboardButton('💳 Problema de Depósito', callback_data='deposit_issue')],
-                    [InlineKeyboardButton('⬅️ Voltar', callback_data='back')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                await fake_update.message.reply_text(
-                    '💰 **Problema de Depósito**\n\n'
-                    'Como podemos ajudá-lo com seu depósito?',
-                    reply_markup=reply_markup
-                )
-            elif command == 'withdraw':
-                # Gọi withdraw trực tiếp
-                keyboard = [
-                    [InlineKeyboardButton('💸 Problema de Saque', callback_data='withdraw_issue')],
-                    [InlineKeyboardButton('⬅️ Voltar', callback_data='back')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                await fake_update.message.reply_text(
-                    '💸 **Problema de Saque**\n\n'
-                    'Como podemos ajudá-lo com seu saque?',
-                    reply_markup=reply_markup
-                )
-            elif command == 'register':
-                # Gọi register trực tiếp
-                keyboard = [
-                    [InlineKeyboardButton('📝 Cadastrar Conta', callback_data='register_account')],
-                    [InlineKeyboardButton('⬅️ Voltar', callback_data='back')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                await fake_update.message.reply_text(
-                    '📝 **Cadastrar Conta**\n\n'
-                    'Vamos ajudá-lo a criar sua conta!',
-                    reply_markup=reply_markup
-                )
-            elif command == 'status':
-                # Gọi status trực tiếp
-                keyboard = [
-                    [InlineKeyboardButton('📊 Status da Conta', callback_data='account_status')],
-                    [InlineKeyboardButton('⬅️ Voltar', callback_data='back')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                await fake_update.message.reply_text(
-                    '📊 **Status da Conta**\n\n'
-                    'Verifique o status da sua conta!',
-                    reply_markup=reply_markup
-                )
-            elif command == 'support':
-                # Gọi support trực tiếp
-                keyboard = [
-                    [InlineKeyboardButton('🆘 Suporte ao Cliente', callback_data='customer_support')],
-                    [InlineKeyboardButton('⬅️ Voltar', callback_data='back')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                await fake_update.message.reply_text(
-                    '🆘 **Suporte ao Cliente**\n\n'
-                    'Como podemos ajudá-lo?',
-                    reply_markup=reply_markup
-                )
-            elif command == 'rules':
-                # Gọi rules trực tiếp
-                keyboard = [
-                    [InlineKeyboardButton('📜 Regras e Termos', callback_data='rules_terms')],
-                    [InlineKeyboardButton('⬅️ Voltar', callback_data='back')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                await fake_update.message.reply_text(
-                    '📜 **Regras e Termos**\n\n'
-                    'Leia nossas regras e termos!',
-                    reply_markup=reply_markup
-                )
-            elif command == 'faq':
-                # Gọi FAQ trực tiếp
-                keyboard = [
-                    [InlineKeyboardButton('❓ Perguntas Frequentes', callback_data='faq_questions')],
-                    [InlineKeyboardButton('⬅️ Voltar', callback_data='back')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                await fake_update.message.reply_text(
-                    '❓ **Perguntas Frequentes**\n\n'
-                    'Encontre respostas para suas dúvidas!',
-                    reply_markup=reply_markup
-                )
-            elif command == 'contact':
-                # Gọi contact trực tiếp
-                keyboard = [
-                    [InlineKeyboardButton('📞 Contato Direto', callback_data='direct_contact')],
-                    [InlineKeyboardButton('⬅️ Voltar', callback_data='back')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                await fake_update.message.reply_text(
-                    '📞 **Contato Direto**\n\n'
-                    'Entre em contato conosco!',
-                    reply_markup=reply_markup
-                )
-            elif command == 'language':
-                # Gọi language trực tiếp
-                keyboard = [
-                    [InlineKeyboardButton('🇻🇳 Tiếng Việt', callback_data='lang_vi')],
-                    [InlineKeyboardButton('🇨🇳 Tiếng Trung', callback_data='lang_zh')],
-                    [InlineKeyboardButton('🇺🇸 Tiếng Anh', callback_data='lang_en')],
-                    [InlineKeyboardButton('⬅️ Voltar', callback_data='back')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                await fake_update.message.reply_text(
-                    '🌐 **Alterar Idioma**\n\n'
-                    'Chọn ngôn ngữ của bạn:',
-                    reply_markup=reply_markup
-                )
-            elif command == 'download':
-                # Gọi download app trực tiếp
-                keyboard = [
-                    [InlineKeyboardButton('📱 Baixar App', callback_data='download_app')],
-                    [InlineKeyboardButton('⬅️ Voltar', callback_data='back')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                await fake_update.message.reply_text(
-                    '📱 **Baixar App**\n\n'
-                    'Baixe nosso aplicativo!',
-                    reply_markup=reply_markup
-                )
-            elif command == 'lucky_wheel':
-                # Gọi lucky wheel trực tiếp
-                keyboard = [
-                    [InlineKeyboardButton('🎡 Roda da Fortuna', callback_data='lucky_wheel')],
-                    [InlineKeyboardButton('⬅️ Voltar', callback_data='back')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                await fake_update.message.reply_text(
-                    '🎡 **Roda da Fortuna**\n\n'
-                    'Gire a roda da fortuna!',
-                    reply_markup=reply_markup
-                )
-            elif command == 'vip_roulette':
-                # Gọi VIP roulette trực tiếp
-                keyboard = [
-                    [InlineKeyboardButton('🎰 Roleta VIP', callback_data='vip_roulette')],
-                    [InlineKeyboardButton('⬅️ Voltar', callback_data='back')]
-                ]
-                reply_markup = InlineKeyboardMarkup(keyboard)
-                await fake_update.message.reply_text(
-                    '🎰 **Roleta VIP**\n\n'
-                    'Jogue a roleta VIP!',
-                    reply_markup=reply_markup
-                )
-            else:
-                await query.answer(f"❌ Lệnh '{command}' không được hỗ trợ!")
+    await query.answer(f"📊 Đã chọn {len(selected_channels)}/{len(all_channels)} kênh", show_alert=False)
 
-        elif query.data == 'bulk_language':
-            # Menu chọn ngôn ngữ cho bulk messaging
-            keyboard = [
-                [InlineKeyboardButton('🇻🇳 Tiếng Việt', callback_data='bulk_lang_vi')],
-                [InlineKeyboardButton('🇨🇳 Tiếng Trung giản thể', callback_data='bulk_lang_zh')],
-                [InlineKeyboardButton('🇺🇸 Tiếng Anh', callback_data='bulk_lang_en')],
-                [InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_back')]
-            ]
-            reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(
-                '🌐 **CHỌN NGÔN NGỮ CHO HỆ THỐNG BULK MESSAGING**\n\n'
-                'Chọn ngôn ngữ bạn muốn sử dụng:',
-                reply_markup=reply_markup,
-            )
+async def _cb_no_channels(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Không có kênh nào"""
+    query = update.callback_query
+    await query.answer("❌ Chưa có kênh nào được cấu hình!", show_alert=True)
 
-        elif query.data == 'bulk_lang_vi':
-            # Đặt ngôn ngữ tiếng Việt
-            context.user_data['bulk_language'] = 'vi'
-            await query.answer('✅ Đã chọn ngôn ngữ: Tiếng Việt')
 
-            # Cập nhật admin commands theo ngôn ngữ mới
-            await update_admin_commands_for_user(context, 'vi')
+async def _cmd_help(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/help: dùng chung cho lệnh và nút lệnh nhanh"""
+    await update.effective_message.reply_text(HELP_TEXT)
 
-            # Quay lại menu chính với ngôn ngữ tiếng Việt
-            keyboard = get_bulk_messaging_menu_keyboard('vi')
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            await query.edit_message_text(
-                get_bulk_messaging_title('vi'),
-                reply_markup=reply_markup,
-            )
 
-        elif query.data == 'bulk_lang_zh':
-            # Đặt ngôn ngữ tiếng Trung
-            context.user_data['bulk_language'] = 'zh'
-            await query.answer('✅ 已选择语言: 简体中文')
+async def _cmd_commands(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """/commands: dùng chung cho lệnh và nút lệnh nhanh"""
+    await update.effective_message.reply_text(COMMANDS_TEXT)
 
-            # Cập nhật admin commands theo ngôn ngữ mới
-            await update_admin_commands_for_user(context, 'zh')
 
-            # Quay lại menu chính với ngôn ngữ tiếng Trung
-            keyboard = get_bulk_messaging_menu_keyboard('zh')
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            await query.edit_message_text(
-                get_bulk_messaging_title('zh'),
-                reply_markup=reply_markup,
-            )
+async def _cmd_promotions(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Nút lệnh nhanh /promotions"""
+    reply_markup = _markup(
+        (('👑 VIP Club', 'vip_club', None),),
+        (('🤝 Programa de Referência', 'referral', None),),
+        (('💳 Pacotes de Depósito', 'deposit_packages', None),),
+        (('🌅 Primeiro Depósito do Dia', 'daily_first_deposit', None),),
+        (('🎡 Roda da Fortuna', 'lucky_wheel', None),),
+        (('🎰 Roleta VIP', 'vip_roulette', None),),
+        (('📱 Baixe o aplicativo de promoção', 'download_app', None),),
+        (('🆘 Compensação de Perda', 'loss_compensation', None),),
+        (('⬅️ Voltar', 'back', None),)
+    )
+    await update.effective_message.reply_text(
+        '🎁 **Programas Promocionais ABCD.BET**\n\n'
+        'Escolha o programa promocional que você gostaria de conhecer:',
+        reply_markup=reply_markup
+    )
 
-        elif query.data == 'bulk_lang_en':
-            # Đặt ngôn ngữ tiếng Anh
-            context.user_data['bulk_language'] = 'en'
-            await query.answer('✅ Language selected: English')
 
-            # Cập nhật admin commands theo ngôn ngữ mới
-            await update_admin_commands_for_user(context, 'en')
+async def _cmd_vip(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Nút lệnh nhanh /vip"""
+    reply_markup = _markup(
+        (('👑 VIP Club', 'vip_club', None),),
+        (('⬅️ Voltar', 'back', None),)
+    )
+    await update.effective_message.reply_text(
+        '👑 **VIP Club ABCD.BET**\n\n'
+        'Bem-vindo ao programa VIP exclusivo!',
+        reply_markup=reply_markup
+    )
 
-            # Quay lại menu chính với ngôn ngữ tiếng Anh
-            keyboard = get_bulk_messaging_menu_keyboard('en')
-            reply_markup = InlineKeyboardMarkup(keyboard)
-            await query.edit_message_text(
-                get_bulk_messaging_title('en'),
-                reply_markup=reply_markup,
-            )
 
-        elif query.data.startswith('bulk_'):            # Xử lý các callback cho chức năng gửi tin nhắn hàng loạt
-            await handle_bulk_messaging_callbacks(query, context)
+async def _cmd_deposit(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Nút lệnh nhanh /deposit"""
+    reply_markup = _markup(
+        (('💳 Problema de Depósito', 'deposit_issue', None),),
+        (('⬅️ Voltar', 'back', None),)
+    )
+    await update.effective_message.reply_text(
+        '💰 **Problema de Depósito**\n\n'
+        'Como podemos ajudá-lo com seu depósito?',
+        reply_markup=reply_markup
+    )
 
-        elif query.data == 'manage_channels':
-            # Debug logging
-            print(f"🔧 manage_channels callback received from user {query.from_user.id}")
-            logger.info(f"manage_channels callback received from user {query.from_user.id}")
 
-            # Kiểm tra quyền admin
-            if query.from_user.id not in bot_config.ADMIN_USER_IDS:
-                await query.answer("❌ Bạn không có quyền sử dụng chức năng này!", show_alert=True)
-                return
+async def _cmd_withdraw(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Nút lệnh nhanh /withdraw"""
+    reply_markup = _markup(
+        (('💸 Problema de Saque', 'withdraw_issue', None),),
+        (('⬅️ Voltar', 'back', None),)
+    )
+    await update.effective_message.reply_text(
+        '💸 **Problema de Saque**\n\n'
+        'Como podemos ajudá-lo com seu saque?',
+        reply_markup=reply_markup
+    )
 
-            # Menu quản lý kênh
-            current_channels = getattr(bot_config, 'FORWARD_CHANNELS', [])
-            channel_count = len(current_channels)
 
-            # Lấy ngôn ngữ hiện tại
-            language = context.user_data.get('bulk_language', 'vi')
+async def _cmd_register(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Nút lệnh nhanh /register"""
+    reply_markup = _markup(
+        (('📝 Cadastrar Conta', 'register_account', None),),
+        (('⬅️ Voltar', 'back', None),)
+    )
+    await update.effective_message.reply_text(
+        '📝 **Cadastrar Conta**\n\n'
+        'Vamos ajudá-lo a criar sua conta!',
+        reply_markup=reply_markup
+    )
 
-            if language == 'zh':
-                keyboard = [
-                    [InlineKeyboardButton('➕ 添加新频道', callback_data='add_channel')],
-                    [InlineKeyboardButton('📋 查看频道列表', callback_data='list_channels')],
-                    [InlineKeyboardButton('❌ 删除频道', callback_data='remove_channel')],
-                    [InlineKeyboardButton('⬅️ 返回', callback_data='bulk_back')]
-                ]
-                title = f'⚙️ **频道管理**\n\n📊 **当前统计:**\n• 总频道数: {channel_count}\n• 状态: ✅ 活跃\n\n**选择您要使用的功能:**'
-            elif language == 'en':
-                keyboard = [
-                    [InlineKeyboardButton('➕ Add new channel', callback_data='add_channel')],
-                    [InlineKeyboardButton('📋 View channel list', callback_data='list_channels')],
-                    [InlineKeyboardButton('❌ Delete channel', callback_data='remove_channel')],
-                    [InlineKeyboardButton('⬅️ Back', callback_data='bulk_back')]
-                ]
-                title = f'⚙️ **CHANNEL MANAGEMENT**\n\n📊 **Current statistics:**\n• Total channels: {channel_count}\n• Status: ✅ Active\n\n**Select the function you want to use:**'
-            else:
-                keyboard = [
-                    [InlineKeyboardButton('➕ Thêm kênh mới', callback_data='add_channel')],
-                    [InlineKeyboardButton('📋 Xem danh sách kênh', callback_data='list_channels')],
-                    [InlineKeyboardButton('❌ Xóa kênh', callback_data='remove_channel')],
-                    [InlineKeyboardButton('⬅️ Quay lại', callback_data='bulk_back')]
-                ]
-                title = f'⚙️ **QUẢN LÝ KÊNH CHUYỂN TIẾP**\n\n📊 **Thống kê hiện tại:**\n• Tổng số kênh: {channel_count}\n• Trạng thái: ✅ Hoạt động\n\n**Chọn chức năng bạn muốn sử dụng:**'
 
-            reply_markup = InlineKeyboardMarkup(keyboard)
+async def _cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Nút lệnh nhanh /status"""
+    reply_markup = _markup(
+        (('📊 Status da Conta', 'account_status', None),),
+        (('⬅️ Voltar', 'back', None),)
+    )
+    await update.effective_message.reply_text(
+        '📊 **Status da Conta**\n\n'
+        'Verifique o status da sua conta!',
+        reply_markup=reply_markup
+    )
 
-            await query.edit_message_text(
-                title,
-                reply_markup=reply_markup,
-            )
 
-        elif query.data == 'select_channels_to_send':
-            # Chọn kênh để gửi tin nhắn
-            user_id = query.from_user.id
+async def _cmd_support(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Nút lệnh nhanh /support"""
+    reply_markup = _markup(
+        (('🆘 Suporte ao Cliente', 'customer_support', None),),
+        (('⬅️ Voltar', 'back', None),)
+    )
+    await update.effective_message.reply_text(
+        '🆘 **Suporte ao Cliente**\n\n'
+        'Como podemos ajudá-lo?',
+        reply_markup=reply_markup
+    )
 
-            # Kiểm tra quyền admin
-            if user_id not in bot_config.ADMIN_USER_IDS:
-                await query.answer("❌ Bạn không có quyền sử dụng chức năng này!", show_alert=True)
-                return
 
-            # Lấy danh sách kênh hiện tại
-            all_channels = getattr(bot_config, 'FORWARD_CHANNELS', [])
+async def _cmd_rules(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Nút lệnh nhanh /rules"""
+    reply_markup = _markup(
+        (('📜 Regras e Termos', 'rules_terms', None),),
+        (('⬅️ Voltar', 'back', None),)
+    )
+    await update.effective_message.reply_text(
+        '📜 **Regras e Termos**\n\n'
+        'Leia nossas regras e termos!',
+        reply_markup=reply_markup
+    )
 
-            if not all_channels:
-                await query.edit_message_text(
-                    "❌ **KHÔNG CÓ KÊNH NÀO**\n\n"
-                    "Chưa có kênh nào được cấu hình.\n"
-                    "Hãy thêm kênh trước khi sử dụng tính năng này.",
-                    reply_markup=InlineKeyboardMarkup([[
-                        InlineKeyboardButton("⬅️ Quay lại", callback_data="manage_channels")
-                    ]])
-                )
-                return
 
-            # Tạo keyboard chọn kênh
-            keyboard = create_channel_selection_keyboard(user_id)
+async def _cmd_faq(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Nút lệnh nhanh /faq"""
+    reply_markup = _markup(
+        (('❓ Perguntas Frequentes', 'faq_questions', None),),
+        (('⬅️ Voltar', 'back', None),)
+    )
+    await update.effective_message.reply_text(
+        '❓ **Perguntas Frequentes**\n\n'
+        'Encontre respostas para suas dúvidas!',
+        reply_markup=reply_markup
+    )
 
-            # Lấy ngôn ngữ hiện tại
-            language = context.user_data.get('bulk_language', 'vi')
 
-            if language == 'zh':
-                title = f"🎯 **选择频道发送消息**\n\n📊 **当前统计:**\n• 总频道数: {len(all_channels)}\n• 已选择: 0\n\n**请选择要发送消息的频道:**"
-            elif language == 'en':
-                title = f"🎯 **SELECT CHANNELS TO SEND MESSAGE**\n\n📊 **Current statistics:**\n• Total channels: {len(all_channels)}\n• Selected: 0\n\n**Please select channels to send message:**"
-            else:
-                title = f"🎯 **CHỌN KÊNH GỬI TIN NHẮN**\n\n📊 **Thống kê hiện tại:**\n• Tổng số kênh: {len(all_channels)}\n• Đã chọn: 0\n\n**Hãy chọn các kênh bạn muốn gửi tin nhắn:**"
+async def _cmd_contact(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Nút lệnh nhanh /contact"""
+    reply_markup = _markup(
+        (('📞 Contato Direto', 'direct_contact', None),),
+        (('⬅️ Voltar', 'back', None),)
+    )
+    await update.effective_message.reply_text(
+        '📞 **Contato Direto**\n\n'
+        'Entre em contato conosco!',
+        reply_markup=reply_markup
+    )
 
-            await query.edit_message_text(
-                title,
-                reply_markup=keyboard
-            )
 
-        elif query.data == 'add_channel':
-            # Thêm kênh mới
-            language = context.user_data.get('bulk_language', 'vi')
+async def _cmd_language(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Nút lệnh nhanh /language"""
+    reply_markup = _markup(
+        (('🇻🇳 Tiếng Việt', 'lang_vi', None),),
+        (('🇨🇳 Tiếng Trung', 'lang_zh', None),),
+        (('🇺🇸 Tiếng Anh', 'lang_en', None),),
+        (('⬅️ Voltar', 'back', None),)
+    )
+    await update.effective_message.reply_text(
+        '🌐 **Alterar Idioma**\n\n'
+        'Chọn ngôn ngữ của bạn:',
+        reply_markup=reply_markup
+    )
 
-            if language == 'zh':
-                title = '➕ **添加新频道**\n\n**说明:**\n• 发送频道ID (例如: -1001234567890)\n• 或发送频道用户名 (例如: @channel_name)\n• 机器人将自动添加到列表\n\n**注意:** 机器人必须是频道的管理员才能转发消息!\n\n**请发送频道ID或用户名:**'
-                back_button = InlineKeyboardButton('⬅️ 返回', callback_data='manage_channels')
-            elif language == 'en':
-                title = '➕ **ADD NEW CHANNEL**\n\n**Instructions:**\n• Send channel ID (e.g., -1001234567890)\n• Or send channel username (e.g., @channel_name)\n• Bot will automatically add to the list\n\n**Note:** Bot must be admin of the channel to forward messages!\n\n**Please send channel ID or username:**'
-                back_button = InlineKeyboardButton('⬅️ Back', callback_data='manage_channels')
-            else:
-                title = '➕ **THÊM KÊNH MỚI**\n\n**Hướng dẫn:**\n• Gửi ID kênh \\(ví dụ: \\-1001234567890\\)\n• Hoặc gửi username kênh \\(ví dụ: @channel\\_name\\)\n• Bot sẽ tự động thêm vào danh sách\n\n**Lưu ý:** Bot phải là admin của kênh để có thể chuyển tiếp tin nhắn\\!\n\n**Hãy gửi ID hoặc username kênh:**'
-                back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='manage_channels')
 
-            await query.edit_message_text(
-                title,
-                reply_markup=InlineKeyboardMarkup([[back_button]])
-            )
+async def _cmd_download(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Nút lệnh nhanh /download"""
+    reply_markup = _markup(
+        (('📱 Baixar App', 'download_app', None),),
+        (('⬅️ Voltar', 'back', None),)
+    )
+    await update.effective_message.reply_text(
+        '📱 **Baixar App**\n\n'
+        'Baixe nosso aplicativo!',
+        reply_markup=reply_markup
+    )
 
-            # Đặt trạng thái chờ thêm kênh
-            context.user_data['waiting_for_channel'] = True
-            context.user_data['action_type'] = 'add_channel'
 
-        elif query.data == 'list_channels':
-            # Hiển thị danh sách kênh
-            current_channels = getattr(bot_config, 'FORWARD_CHANNELS', [])
-            language = context.user_data.get('bulk_language', 'vi')
+async def _cmd_lucky_wheel(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Nút lệnh nhanh /lucky_wheel"""
+    reply_markup = _markup(
+        (('🎡 Roda da Fortuna', 'lucky_wheel', None),),
+        (('⬅️ Voltar', 'back', None),)
+    )
+    await update.effective_message.reply_text(
+        '🎡 **Roda da Fortuna**\n\n'
+        'Gire a roda da fortuna!',
+        reply_markup=reply_markup
+    )
 
-            if current_channels:
-                if language == 'zh':
-                    channel_list = '📋 **当前频道列表:**\n\n'
-                    for i, channel_id in enumerate(current_channels, 1):
-                        channel_list += f'{i}. `{channel_id}`\n'
-                    channel_list += f'\n**总计:** {len(current_channels)} 个频道'
-                elif language == 'en':
-                    channel_list = '📋 **CURRENT CHANNEL LIST:**\n\n'
-                    for i, channel_id in enumerate(current_channels, 1):
-                        channel_list += f'{i}. `{channel_id}`\n'
-                    channel_list += f'\n**Total:** {len(current_channels)} channels'
-                else:
-                    channel_list = '📋 **DANH SÁCH KÊNH HIỆN TẠI:**\n\n'
-                    for i, channel_id in enumerate(current_channels, 1):
-                        channel_list += f'{i}. `{channel_id}`\n'
-                    channel_list += f'\n**Tổng cộng:** {len(current_channels)} kênh'
-            else:
-                if language == 'zh':
-                    channel_list = '📋 **频道列表:**\n\n❌ 还没有添加任何频道'
-                elif language == 'en':
-                    channel_list = '📋 **CHANNEL LIST:**\n\n❌ No channels have been added yet'
-                else:
-                    channel_list = '📋 **DANH SÁCH KÊNH:**\n\n❌ Chưa có kênh nào được thêm'
 
-            if language == 'zh':
-                keyboard = [
-                    [InlineKeyboardButton('➕ 添加新频道', callback_data='add_channel')],
-                    [InlineKeyboardButton('❌ 删除频道', callback_data='remove_channel')],
-                    [InlineKeyboardButton('⬅️ 返回', callback_data='manage_channels')]
-                ]
-            elif language == 'en':
-                keyboard = [
-                    [InlineKeyboardButton('➕ Add new channel', callback_data='add_channel')],
-                    [InlineKeyboardButton('❌ Delete channel', callback_data='remove_channel')],
-                    [InlineKeyboardButton('⬅️ Back', callback_data='manage_channels')]
-                ]
-            else:
-                keyboard = [
-                    [InlineKeyboardButton('➕ Thêm kênh mới', callback_data='add_channel')],
-                    [InlineKeyboardButton('❌ Xóa kênh', callback_data='remove_channel')],
-                    [InlineKeyboardButton('⬅️ Quay lại', callback_data='manage_channels')]
-                ]
+async def _cmd_vip_roulette(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Nút lệnh nhanh /vip_roulette"""
+    reply_markup = _markup(
+        (('🎰 Roleta VIP', 'vip_roulette', None),),
+        (('⬅️ Voltar', 'back', None),)
+    )
+    await update.effective_message.reply_text(
+        '🎰 **Roleta VIP**\n\n'
+        'Jogue a roleta VIP!',
+        reply_markup=reply_markup
+    )
 
-            reply_markup = InlineKeyboardMarkup(keyboard)
 
-            await query.edit_message_text(
-                channel_list,
-                reply_markup=reply_markup,
-            )
+# Nút gợi ý lệnh nhanh: phần sau 'cmd_' -> handler(update, context)
+CMD_HANDLERS = {
+    'start': start,
+    'menu': show_main_menu,
+    'help': _cmd_help,
+    'commands': _cmd_commands,
+    'promotions': _cmd_promotions,
+    'vip': _cmd_vip,
+    'deposit': _cmd_deposit,
+    'withdraw': _cmd_withdraw,
+    'register': _cmd_register,
+    'status': _cmd_status,
+    'support': _cmd_support,
+    'rules': _cmd_rules,
+    'faq': _cmd_faq,
+    'contact': _cmd_contact,
+    'language': _cmd_language,
+    'download': _cmd_download,
+    'lucky_wheel': _cmd_lucky_wheel,
+    'vip_roulette': _cmd_vip_roulette,
+}
+
+
+# callback_data -> handler(update, context) cho các nút không phải menu tĩnh
+BUTTON_HANDLERS = {
+    # Voltar ao menu principal
+    'back': show_main_menu,
+    'scheduled_forward': _cb_scheduled_forward,
+    'schedule_forward_set': _cb_schedule_forward_set,
+    'schedule_forward_list': _cb_schedule_forward_list,
+    'schedule_forward_stats': _cb_schedule_forward_stats,
+    'bulk_back': _cb_bulk_back,
+    'bulk_language': _cb_bulk_language,
+    'bulk_lang_vi': _cb_bulk_lang_vi,
+    'bulk_lang_zh': _cb_bulk_lang_zh,
+    'bulk_lang_en': _cb_bulk_lang_en,
+    'manage_channels': _cb_manage_channels,
+    'select_channels_to_send': _cb_select_channels_to_send,
+    'add_channel': _cb_add_channel,
+    'list_channels': _cb_list_channels,
+    'remove_channel': _cb_remove_channel,
+    'confirm_forward': _cb_confirm_forward,
+    'cancel_forward': _cb_cancel_forward,
+    'select_all_channels': _cb_select_all_channels,
+    'deselect_all_channels': _cb_deselect_all_channels,
+    'confirm_send_to_channels': _cb_confirm_send_to_channels,
+    'cancel_channel_selection': _cb_cancel_channel_selection,
+    'stats_info': _cb_stats_info,
+    'no_channels': _cb_no_channels,
+}
+
+# Nút phải đọc file lịch hẹn giờ trước khi edit: chạy thành task riêng thay vì await trong button_handler
+BACKGROUND_BUTTONS = frozenset({'schedule_forward_list', 'schedule_forward_stats'})
 
-        elif query.data == 'remove_channel':
-            # Xóa kênh
-            current_channels = getattr(bot_config, 'FORWARD_CHANNELS', [])
-            language = context.user_data.get('bulk_language', 'vi')
 
-            if not current_channels:
-                if language == 'zh':
-                    title = '❌ **删除频道**\n\n❌ 没有频道可以删除!'
-                    back_button = InlineKeyboardButton('⬅️ 返回', callback_data='manage_channels')
-                elif language == 'en':
-                    title = '❌ **DELETE CHANNEL**\n\n❌ No channels to delete!'
-                    back_button = InlineKeyboardButton('⬅️ Back', callback_data='manage_channels')
-                else:
-                    title = '❌ **XÓA KÊNH**\n\n❌ Không có kênh nào để xóa!'
-                    back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='manage_channels')
+async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    """Processar callbacks dos botões"""
+    try:
+        query = update.callback_query
 
-                await query.edit_message_text(
-                    title,
-                    reply_markup=InlineKeyboardMarkup([[back_button]])
-                )
-                return
+        # Bỏ qua callback trùng để không chạy lại handler và tốn thêm lượt edit
+        if query.id in _SEEN_CALLBACK_IDS:
+            logger.debug("Bỏ qua callback trùng %s", query.id)
+            return
+        _SEEN_CALLBACK_IDS[query.id] = True
 
-            # Tạo danh sách kênh để chọn xóa
-            keyboard = []
-            for i, channel_id in enumerate(current_channels):
-                keyboard.append([InlineKeyboardButton(
-                    f'❌ {i + 1}. {channel_id}',
-                    callback_data=f'delete_channel_{i}'
-                )])
+        await query.answer()
 
-            if language == 'zh':
-                keyboard.append([InlineKeyboardButton('⬅️ 返回', callback_data='manage_channels')])
-            elif language == 'en':
-                keyboard.append([InlineKeyboardButton('⬅️ Back', callback_data='manage_channels')])
-            else:
-                keyboard.append([InlineKeyboardButton('⬅️ Quay lại', callback_data='manage_channels')])
+        logger.debug("Button clicked: %s by user %s", query.data, query.from_user.id)
 
-            reply_markup = InlineKeyboardMarkup(keyboard)
+        if not query.data:
+            logger.error("No callback data received")
+            return
 
-            if language == 'zh':
-                title = '❌ **删除频道**\n\n**选择您要删除的频道:**\n⚠️ **注意:** 此操作无法撤销!'
-            elif language == 'en':
-                title = '❌ **DELETE CHANNEL**\n\n**Select the channel you want to delete:**\n⚠️ **Warning:** This action cannot be undone!'
+        # Tra bảng trước: menu tĩnh và handler riêng không phải đi qua chuỗi elif bên dưới
+        menu_text = MENU_TEXTS.get(query.data)
+        if menu_text is not None:
+            await enqueue_edit(query, menu_text, reply_markup=MENUS[query.data], parse_mode=None)
+            return
+        handler = BUTTON_HANDLERS.get(query.data)
+        if handler is not None:
+            if query.data in BACKGROUND_BUTTONS:
+                # Đọc dữ liệu lịch hẹn giờ chạy nền, edit đi qua _EDIT_QUEUE; không giữ update kế tiếp
+                context.application.create_task(handler(update, context), update=update)
             else:
-                title = '❌ **XÓA KÊNH**\n\n**Chọn kênh bạn muốn xóa:**\n⚠️ **Lưu ý:** Hành động này không thể hoàn tác!'
+                await handler(update, context)
+            return
 
-            await query.edit_message_text(
-                title,
-                reply_markup=reply_markup,
-            )
+        if query.data.startswith('cmd_'):
+            # Xử lý các callback command nhanh
+            command = query.data[4:]
+            handler = CMD_HANDLERS.get(command)
+            if handler is None:
+                await query.answer(f"❌ Lệnh '{command}' không được hỗ trợ!")
+                return
+            # update thật đã mang callback_query, không cần dựng Update giả
+            await handler(update, context)
+
+        elif query.data.startswith('bulk_'):            # Xử lý các callback cho chức năng gửi tin nhắn hàng loạt
+            await handle_bulk_messaging_callbacks(query, context)
 
         elif query.data.startswith('delete_channel_'):
             # Xóa kênh cụ thể
+            language = context.user_data.get('bulk_language', 'vi')
             try:
                 channel_index = int(query.data.split('_')[2])
-                current_channels = getattr(bot_config, 'FORWARD_CHANNELS', [])
+                current_channels = list(_FORWARD_CHANNELS)
 
                 if 0 <= channel_index < len(current_channels):
                     deleted_channel = current_channels[channel_index]
@@ -3677,131 +4299,36 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
                     current_channels.pop(channel_index)
 
                     # Cập nhật bot_config
-                    setattr(bot_config, 'FORWARD_CHANNELS', current_channels)
-
-                    language = context.user_data.get('bulk_language', 'vi')
+                    set_forward_channels(current_channels)
 
-                    if language == 'zh':
-                        success_message = f'✅ **频道删除成功!**\n\n**已删除的频道:** `{deleted_channel}`\n**剩余频道数:** {len(current_channels)}\n\n**新频道列表:**\n' + ('\n'.join([f'• {ch}' for ch in current_channels]) if current_channels else '❌ 没有剩余频道')
-                        back_button = InlineKeyboardButton('⬅️ 返回', callback_data='manage_channels')
-                    elif language == 'en':
-                        success_message = f'✅ **CHANNEL DELETED SUCCESSFULLY!**\n\n**Deleted channel:** `{deleted_channel}`\n**Remaining channels:** {len(current_channels)}\n\n**New channel list:**\n' + ('\n'.join([f'• {ch}' for ch in current_channels]) if current_channels else '❌ No channels remaining')
-                        back_button = InlineKeyboardButton('⬅️ Back', callback_data='manage_channels')
+                    if current_channels:
+                        channel_list = _channel_bullets(current_channels)
                     else:
-                        success_message = f'✅ **ĐÃ XÓA KÊNH THÀNH CÔNG!**\n\n**Kênh đã xóa:** `{deleted_channel}`\n**Số kênh còn lại:** {len(current_channels)}\n\n**Danh sách kênh mới:**\n' + ('\n'.join([f'• {ch}' for ch in current_channels]) if current_channels else '❌ Không còn kênh nào')
-                        back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='manage_channels')
+                        channel_list = get_message('delete_channel_none_left', language)
+                    success_message = get_message(
+                        'delete_channel_success', language,
+                        deleted_channel=deleted_channel,
+                        channel_count=len(current_channels),
+                        channel_list=channel_list
+                    )
 
                     await query.edit_message_text(
                         success_message,
-                        reply_markup=InlineKeyboardMarkup([[back_button]])
+                        reply_markup=back_markup(language, 'manage_channels')
                     )
                 else:
-                    if language == 'zh':
-                        error_message = '❌ **错误:** 频道索引无效!'
-                        back_button = InlineKeyboardButton('⬅️ 返回', callback_data='manage_channels')
-                    elif language == 'en':
-                        error_message = '❌ **ERROR:** Invalid channel index!'
-                        back_button = InlineKeyboardButton('⬅️ Back', callback_data='manage_channels')
-                    else:
-                        error_message = '❌ **LỖI:** Index kênh không hợp lệ!'
-                        back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='manage_channels')
-
                     await query.edit_message_text(
-                        error_message,
-                        reply_markup=InlineKeyboardMarkup([[back_button]])
+                        get_message('delete_channel_invalid', language),
+                        reply_markup=back_markup(language, 'manage_channels')
                     )
             except Exception as e:
                 logger.error(f"Lỗi khi xóa kênh: {e}")
-                language = context.user_data.get('bulk_language', 'vi')
-
-                if language == 'zh':
-                    error_message = f'❌ **删除频道时出错**\n\n错误: {str(e)}'
-                    back_button = InlineKeyboardButton('⬅️ 返回', callback_data='manage_channels')
-                elif language == 'en':
-                    error_message = f'❌ **ERROR DELETING CHANNEL**\n\nError: {str(e)}'
-                    back_button = InlineKeyboardButton('⬅️ Back', callback_data='manage_channels')
-                else:
-                    error_message = f'❌ **LỖI KHI XÓA KÊNH**\n\nLỗi: {str(e)}'
-                    back_button = InlineKeyboardButton('⬅️ Quay lại', callback_data='manage_channels')
 
                 await query.edit_message_text(
-                    error_message,
-                    reply_markup=InlineKeyboardMarkup([[back_button]])
+                    get_message('delete_channel_error', language, error=str(e)),
+                    reply_markup=back_markup(language, 'manage_channels')
                 )
 
-        elif query.data == 'confirm_forward':
-            # Kiểm tra quyền admin
-            user_id = query.from_user.id
-            if user_id not in bot_config.ADMIN_USER_IDS:
-                await query.edit_message_text('❌ Bạn không có quyền thực hiện hành động này.')
-                return
-
-            pending = context.user_data.get('pending_forward')
-            if not pending:
-                await query.edit_message_text('⚠️ Không có tác vụ chuyển tiếp nào đang chờ.')
-                return
-
-            await query.edit_message_text('⏳ Đang chuyển tiếp media đến các kênh...')
-            # Thực hiện forward
-            success = 0
-            failed = 0
-            failed_channels = []
-            forward_channels = getattr(bot_config, 'FORWARD_CHANNELS', [])
-            for channel_id in forward_channels:
-                try:
-                    await context.bot.forward_message(
-                        chat_id=channel_id,
-                        from_chat_id=pending['chat_id'],
-                        message_id=pending['message_id']
-                    )
-                    success += 1
-                except Exception as e:
-                    failed += 1
-                    failed_channels.append(f"{channel_id} ({e})")
-
-            # Báo kết quả
-            result = f"✅ Hoàn thành: {success} thành công, {failed} thất bại."
-            if failed:
-                result += "\nKênh lỗi:\n" + '\n'.join(failed_channels[:5])
-
-            await query.edit_message_text(result)
-
-            # Ghi log và reset trạng thái
-            sheets_manager.add_message_log(str(user_id), f"Forwarded media to {success}/{len(forward_channels)} channels", 'forward_media_to_channels', 'sent')
-            context.user_data.pop('waiting_for_confirmation', None)
-            context.user_data.pop('pending_forward', None)
-            return
-
-        elif query.data == 'cancel_forward':
-            # Hủy tác vụ
-            context.user_data.pop('waiting_for_confirmation', None)
-            context.user_data.pop('pending_forward', None)
-            await query.edit_message_text('❎ Đã hủy tác vụ chuyển tiếp.')
-            return
-
-        # ===== XỬ LÝ CHỌN KÊNH GỬI =====
-        elif query.data == 'select_all_channels':
-            # Chọn tất cả kênh
-            user_id = query.from_user.id
-            selected_channels = select_all_channels(user_id)
-
-            await query.answer(f"✅ Đã chọn {len(selected_channels)} kênh")
-
-            # Cập nhật keyboard
-            keyboard = create_channel_selection_keyboard(user_id)
-            await query.edit_message_reply_markup(reply_markup=keyboard)
-
-        elif query.data == 'deselect_all_channels':
-            # Bỏ chọn tất cả kênh
-            user_id = query.from_user.id
-            selected_channels = deselect_all_channels(user_id)
-
-            await query.answer("🔴 Đã bỏ chọn tất cả kênh")
-
-            # Cập nhật keyboard
-            keyboard = create_channel_selection_keyboard(user_id)
-            await query.edit_message_reply_markup(reply_markup=keyboard)
-
         elif query.data.startswith('toggle_channel:'):
             # Chuyển đổi trạng thái chọn kênh
             user_id = query.from_user.id
@@ -3817,83 +4344,19 @@ async def button_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
             keyboard = create_channel_selection_keyboard(user_id)
             await query.edit_message_reply_markup(reply_markup=keyboard)
 
-        elif query.data == 'confirm_send_to_channels':
-            # Xác nhận gửi đến các kênh đã chọn
-            user_id = query.from_user.id
-            selected_channels = get_admin_selected_channels(user_id)
-
-            if not selected_channels:
-                await query.answer("❌ Chưa chọn kênh nào!", show_alert=True)
-                return
-
-            # Đặt trạng thái chờ tin nhắn để gửi đến kênh
-            context.user_data['waiting_for_message'] = True
-            context.user_data['message_type'] = 'forward_to_selected_channels'
-            context.user_data['selected_channels'] = selected_channels
-
-            # Tạo nội dung tin nhắn
-            channel_list = '\n'.join([f"• {c}" for c in selected_channels[:5]])
-            if len(selected_channels) > 5:
-                channel_list += f"\n• ... và {len(selected_channels) - 5} kênh khác"
-
-            message_text = (
-                f"📢 **GỬI TIN NHẮN ĐẾN {len(selected_channels)} KÊNH ĐÃ CHỌN**\n\n"
-                f"**Kênh đã chọn:**\n{channel_list}\n\n"
-                "**Bây giờ hãy gửi tin nhắn hoặc media bạn muốn gửi đến các kênh này:**"
-            )
-
-            await query.edit_message_text(
-                message_text,
-                reply_markup=InlineKeyboardMarkup([[
-                    InlineKeyboardButton("❌ Hủy", callback_data="cancel_channel_selection")
-                ]])
-            )
-
-        elif query.data == 'cancel_channel_selection':
-            # Hủy chọn kênh
-            user_id = query.from_user.id
-            set_admin_selected_channels(user_id, [])
-
-            await query.answer("❌ Đã hủy chọn kênh")
-
-            # Quay lại menu quản lý kênh
-            await query.edit_message_text(
-                "❌ **ĐÃ HỦY CHỌN KÊNH**\n\n"
-                "Bạn có thể sử dụng lệnh /manage_channels để quản lý kênh.",
-                reply_markup=InlineKeyboardMarkup([[
-                    InlineKeyboardButton("⬅️ Quay lại", callback_data="manage_channels")
-                ]])
-            )
-
-        elif query.data == 'stats_info':
-            # Hiển thị thông tin thống kê
-            user_id = query.from_user.id
-            selected_channels = get_admin_selected_channels(user_id)
-            all_channels = getattr(bot_config, 'FORWARD_CHANNELS', [])
-
-            await query.answer(f"📊 Đã chọn {len(selected_channels)}/{len(all_channels)} kênh", show_alert=False)
-
-        elif query.data == 'no_channels':
-            # Không có kênh nào
-            await query.answer("❌ Chưa có kênh nào được cấu hình!", show_alert=True)
-
         # ===== XỬ LÝ CÁC CALLBACK KHÁC =====
         else:
             # Opção không được nhận diện
             await query.edit_message_text(
                 '❌ Tùy chọn không được nhận diện. Vui lòng chọn một tùy chọn hợp lệ.',
-                reply_markup=InlineKeyboardMarkup([[
-                    InlineKeyboardButton('⬅️ Quay lại Menu', callback_data='back')
-                ]])
+                reply_markup=UNKNOWN_OPTION_KB
             )
 
     except Exception as e:
         logger.error(f"Erro no button_handler: {e}")
         await query.edit_message_text(
             '❌ Ocorreu um erro. Por favor, tente novamente.',
-            reply_markup=InlineKeyboardMarkup([[
-                InlineKeyboardButton('⬅️ Voltar ao Menu', callback_data='back')
-            ]])
+            reply_markup=ERROR_MENU_KB
         )
 
 
@@ -3910,7 +4373,13 @@ def main():
     print("🔄 Signal handlers configured for auto-reload")
 
     # Criar application
-    application = Application.builder().token(bot_config.TELEGRAM_TOKEN).build()
+    application = (
+        Application.builder()
+        .token(bot_config.TELEGRAM_TOKEN)
+        .request(make_telegram_request(connection_pool_size=TELEGRAM_CONNECTION_POOL_SIZE))
+        .get_updates_request(make_telegram_request())
+        .build()
+    )
     current_application = application
 
     # KHÔNG gọi init_notification_system(application.bot) trực tiếp trong main()
@@ -3919,6 +4388,28 @@ def main():
     # một hàm duy nhất đảm bảo cả Notification và Bot Commands đều được cấu hình.
     async def post_init_func(app):
         try:
+            # Thread pool cho các lệnh gọi Google Sheets chạy qua asyncio.to_thread
+            asyncio.get_running_loop().set_default_executor(
+                ThreadPoolExecutor(max_workers=SHEETS_EXECUTOR_WORKERS, thread_name_prefix='sheets')
+            )
+
+            # Tác vụ nền ghi tương tác người dùng vào Google Sheets
+            app.create_task(_log_consumer())
+
+            # Worker gửi tin nhắn hàng loạt từ hàng đợi (một worker, nhịp theo _BULK_LIMITER)
+            app.create_task(_bulk_send_worker())
+
+            # Worker forward tin nhắn của admin đến khách hàng
+            for _ in range(FORWARD_WORKERS):
+                app.create_task(_forward_send_worker())
+
+            # Worker edit tin nhắn từ nút bấm
+            for _ in range(EDIT_WORKERS):
+                app.create_task(_edit_worker())
+
+            # Làm mới thống kê lịch hẹn giờ ở nền
+            app.create_task(_refresh_schedule_stats_loop())
+
             # Khởi tạo notification system nếu chưa có
             if not get_notification_manager():
                 print("🔔 Khởi tạo notification system...")
@@ -3991,12 +4482,11 @@ def main():
                 except Exception:
                     lang = 'vi'
 
-                admin_cmds = get_admin_commands(lang)
-
                 await app.bot.set_my_commands(
-                    [BotCommand(cmd, desc) for cmd, desc in admin_cmds],
+                    get_admin_command_objects(lang),
                     scope=BotCommandScopeChat(chat_id=int(admin_id))
                 )
+                _LAST_USER_LANG[int(admin_id)] = lang
                 print(f"✅ Comandos admin configurados para {admin_id} (lang={lang})")
             except Exception as e:
                 print(f"⚠️ Não foi possível configurar comandos admin para {admin_id}: {e}")
@@ -4006,46 +4496,7 @@ def main():
     # Adicionar comandos de sugestão
     async def help_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Comando help"""
-        await update.message.reply_text(
-            '🤖 **ABCDBET Customer Service Bot - Ajuda**\n\n'
-            '📋 **Comandos principais:**\n'
-            '/start - 🚀 Iniciar bot\n'
-            '/help - ❓ Ajuda e comandos\n'
-            '/menu - 📋 Menu Principal\n'
-            '/commands - 📋 Lista de comandos\n'
-            '/quick - ⚡ Comandos rápidos\n'
-            '/hint - 💡 Dicas de comandos\n\n'
-            '🎁 **Promoções e Bônus:**\n'
-            '/promotions - 🎁 Promoções e bônus\n'
-            '/deposit_packages - 💳 Pacotes de Depósito\n'
-            '/daily_first_deposit - 🌅 Primeiro Depósito do Dia\n'
-            '/vip - 👑 VIP Club\n'
-            '/referral - 🤝 Programa de Referência\n'
-            '/lucky_wheel - 🎡 Roda da Fortuna\n'
-            '/vip_roulette - 🎰 Roleta VIP\n\n'
-            '💰 **Depósito e Saque:**\n'
-            '/register - 📝 Cadastrar Conta\n'
-            '/deposit - 💰 Problema de Depósito\n'
-            '/withdraw - 💸 Problema de Saque\n'
-            '/status - 📊 Status da Conta\n\n'
-            '🆘 **Suporte e Informações:**\n'
-            '/support - 🆘 Suporte ao Cliente\n'
-            '/rules - 📜 Regras e Termos\n'
-            '/faq - ❓ Perguntas Frequentes\n'
-            '/contact - 📞 Contato Direto\n\n'
-            '🌐 **Configurações:**\n'
-            '/language - 🌐 Alterar Idioma\n'
-            '/download_app - 📱 Baixar App\n\n'
-            '🔐 **Lệnh Admin (chỉ dành cho admin):**\n'
-            '/bulk - 📢 Gửi tin nhắn hàng loạt\n'
-            '/manage_channels - ⚙️ Quản lý kênh chuyển tiếp\n'
-            '/stats - 📊 Xem thống kê khách hàng\n'
-            '/stop_bulk - 🛑 Dừng gửi tin nhắn hàng loạt\n'
-            '/reload - 🔄 Reload bot (Admin only)\n'
-            '/health - 🏥 Kiểm tra sức khỏe bot (Admin only)\n\n'
-            '💡 **Dica:** Use os botões do menu para navegar facilmente!\n'
-            '🔍 **Dica:** Digite / seguido do comando para usar qualquer função!'
-        )
+        await _cmd_help(update, context)
 
     # Adicionar outros comandos
     async def promotions_command(
@@ -4147,8 +4598,7 @@ def main():
         keyboard = [
             [InlineKeyboardButton(
                 '🌐 Abrir Atendimento ao cliente online',
-                url=('https://vm.vondokua.com/'
-                     '1kdzfz0cdixxg0k59medjggvhv')
+                url=SUPPORT_URL
             )],
             [InlineKeyboardButton('⬅️ Voltar', callback_data='back')]
         ]
@@ -4259,7 +4709,7 @@ def main():
         user_id = update.effective_user.id
 
         # Kiểm tra quyền admin
-        if user_id not in bot_config.ADMIN_USER_IDS:
+        if user_id not in ADMIN_USER_IDS_SET:
             await update.message.reply_text(
                 "❌ Você não tem permissão para usar este comando!"
             )
@@ -4282,14 +4732,14 @@ def main():
         user_id = update.effective_user.id
 
         # Kiểm tra quyền admin
-        if user_id not in bot_config.ADMIN_USER_IDS:
+        if user_id not in ADMIN_USER_IDS_SET:
             await update.message.reply_text(
                 "❌ Você não tem permissão para usar este comando!"
             )
             return
 
         # Lấy thống kê từ Google Sheets
-        stats = sheets_manager.get_customer_stats()
+        stats = await get_customer_stats_cached()
         if stats:
             stats_message = f"""
 📊 **THỐNG KÊ KHÁCH HÀNG**
@@ -4299,7 +4749,7 @@ def main():
 📆 **Tuần này:** {stats['week']}
 🗓️ **Tháng này:** {stats['month']}
 
-🔄 **Cập nhật lần cuối:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+🔄 **Cập nhật lần cuối:** {now_str()}
             """
         else:
             stats_message = "❌ Không thể lấy thống kê khách hàng"
@@ -4313,14 +4763,14 @@ def main():
         user_id = update.effective_user.id
 
         # Kiểm tra quyền admin
-        if user_id not in bot_config.ADMIN_USER_IDS:
+        if user_id not in ADMIN_USER_IDS_SET:
             await update.message.reply_text(
                 "❌ Você não tem permissão para usar este comando!"
             )
             return
 
         # Menu quản lý kênh
-        current_channels = getattr(bot_config, 'FORWARD_CHANNELS', [])
+        current_channels = _FORWARD_CHANNELS
         channel_count = len(current_channels)
 
         # Lấy ngôn ngữ hiện tại
@@ -4368,7 +4818,7 @@ def main():
         user_id = update.effective_user.id
 
         # Kiểm tra quyền admin
-        if user_id not in bot_config.ADMIN_USER_IDS:
+        if user_id not in ADMIN_USER_IDS_SET:
             await update.message.reply_text(
                 "❌ Você não tem permissão para usar este comando!"
             )
@@ -4376,7 +4826,7 @@ def main():
 
         try:
             # Dừng gửi tin nhắn hàng loạt
-            bulk_messaging_manager.stop_bulk_messaging()
+            stop_broadcast_jobs()
             await update.message.reply_text(
                 "🛑 **ĐÃ DỪNG GỬI TIN NHẮN HÀNG LOẠT!**\n\n"
                 "Bot sẽ dừng gửi tin nhắn sau khi hoàn thành tin nhắn hiện tại.",
@@ -4384,8 +4834,30 @@ def main():
         except Exception as e:
             logger.error(f"Lỗi khi dừng gửi tin nhắn hàng loạt: {e}")
             await update.message.reply_text(
-                f"❌ **LỖI KHI DỪNG GỬI TIN NHẮN**\n\nLỗi: {str(e)}",
+                f"❌ LỖI KHI DỪNG GỬI TIN NHẮN\n\nLỗi: {str(e)}",
+            )
+
+    async def bulk_status_command(
+        update: Update, context: ContextTypes.DEFAULT_TYPE
+    ):
+        """Lệnh xem tiến độ hàng đợi gửi tin nhắn hàng loạt (chỉ admin)"""
+        user_id = update.effective_user.id
+
+        # Kiểm tra quyền admin
+        if user_id not in ADMIN_USER_IDS_SET:
+            await update.message.reply_text(
+                "❌ Você não tem permissão para usar este comando!"
             )
+            return
+
+        await update.message.reply_text(
+            "📊 **TRẠNG THÁI GỬI TIN NHẮN HÀNG LOẠT**\n\n"
+            f"📥 Đang chờ: {_BULK_SEND_QUEUE.qsize() + _FORWARD_QUEUE.qsize()}\n"
+            f"✅ Đã gửi: {_BULK_SEND_STATS['sent']}\n"
+            f"❌ Thất bại: {_BULK_SEND_STATS['failed']}\n"
+            f"⏭️ Bỏ qua: {_BULK_SEND_STATS['skipped']}\n"
+            f"📦 Tổng đã xếp hàng: {_BULK_SEND_STATS['queued']}"
+        )
 
     # ===== CÁC LỆNH HẸN GIỜ CHUYỂN TIẾP =====
 
@@ -4396,7 +4868,7 @@ def main():
         user_id = update.effective_user.id
 
         # Kiểm tra quyền admin
-        if user_id not in bot_config.ADMIN_USER_IDS:
+        if user_id not in ADMIN_USER_IDS_SET:
             await update.message.reply_text(
                 "❌ Bạn không có quyền sử dụng lệnh này!"
             )
@@ -4420,7 +4892,7 @@ def main():
         except Exception as e:
             logger.error(f"Lỗi hiển thị menu hẹn giờ chuyển tiếp: {e}")
             await update.message.reply_text(
-                f"❌ **LỖI HIỂN THỊ MENU**\n\nLỗi: {str(e)}"
+                f"❌ LỖI HIỂN THỊ MENU\n\nLỗi: {str(e)}"
             )
 
     # ===== CÁC LỆNH MỚI CHO KHÁCH HÀNG =====
@@ -4649,7 +5121,7 @@ def main():
         user_id = update.effective_user.id
 
         # Kiểm tra quyền admin
-        if user_id not in bot_config.ADMIN_USER_IDS:
+        if user_id not in ADMIN_USER_IDS_SET:
             await update.message.reply_text(
                 "❌ Você não tem permissão para usar este comando!"
             )
@@ -4681,8 +5153,8 @@ def main():
         # Kiểm tra Google Sheets
         try:
             if sheets_manager.service:
-                sheets_manager.service.spreadsheets().get(
-                    spreadsheetId=sheets_manager.spreadsheet_id).execute()
+                await _sheets(sheets_manager.service.spreadsheets().get(
+                    spreadsheetId=sheets_manager.spreadsheet_id).execute)
                 sheets_status = 'Hoạt động bình thường'
             else:
                 sheets_status = 'Chưa khởi tạo'
@@ -4716,46 +5188,7 @@ def main():
 
     async def commands_list_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Lệnh hiển thị danh sách tất cả các lệnh có sẵn"""
-        commands_text = (
-            '📋 **LISTA COMPLETA DE COMANDOS**\n\n'
-            '🚀 **COMANDOS PRINCIPAIS:**\n'
-            '• `/start` - Iniciar bot\n'
-            '• `/help` - Ajuda e comandos\n'
-            '• `/menu` - Menu Principal\n'
-            '• `/commands` - Esta lista de comandos\n\n'
-            '🎁 **PROMOÇÕES E BÔNUS:**\n'
-            '• `/promotions` - Promoções e bônus\n'
-            '• `/deposit_packages` - Pacotes de Depósito\n'
-            '• `/daily_first_deposit` - Primeiro Depósito do Dia\n'
-            '• `/vip` - VIP Club\n'
-            '• `/referral` - Programa de Referência\n'
-            '• `/lucky_wheel` - Roda da Fortuna\n'
-            '• `/vip_roulette` - Roleta VIP\n\n'
-            '💰 **DEPÓSITO E SAQUE:**\n'
-            '• `/register` - Cadastrar Conta\n'
-            '• `/deposit` - Problema de Depósito\n'
-            '• `/withdraw` - Problema de Saque\n'
-            '• `/status` - Status da Conta\n\n'
-            '🆘 **SUPORTE E INFORMAÇÕES:**\n'
-            '• `/support` - Suporte ao Cliente\n'
-            '• `/rules` - Regras e Termos\n'
-            '• `/faq` - Perguntas Frequentes\n'
-            '• `/contact` - Contato Direto\n\n'
-            '🌐 **CONFIGURAÇÕES:**\n'
-            '• `/language` - Alterar Idioma\n'
-            '• `/download_app` - Baixar App\n\n'
-            '🔐 **COMANDOS ADMIN:**\n'
-            '• `/bulk` - Gửi tin nhắn hàng loạt\n'
-            '• `/manage_channels` - Quản lý kênh\n'
-            '• `/stats` - Thống kê khách hàng\n'
-            '• `/stop_bulk` - Dừng gửi tin nhắn\n\n'
-            '💡 **DICA:** Digite `/` seguido do comando para usar qualquer função!\n'
-            '📱 **EXEMPLO:** `/vip`, `/status`, `/rules`'
-        )
-
-        await update.message.reply_text(
-            commands_text,
-        )
+        await _cmd_commands(update, context)
 
     async def quick_commands_command(update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Lệnh hiển thị gợi ý lệnh nhanh với keyboard"""
@@ -4899,6 +5332,9 @@ def main():
     application.add_handler(
         CommandHandler('stop_bulk', stop_bulk_command)
     )
+    application.add_handler(
+        CommandHandler('bulk_status', bulk_status_command)
+    )
     application.add_handler(
         CommandHandler('scheduled_forward', scheduled_forward_command)
     )
@@ -4945,6 +5381,9 @@ def main():
         print(f"❌ Lỗi khi chạy bot: {e}")
         logger.error(f"Lỗi khi chạy bot: {e}")
 
+    if _RESTART_REQUESTED:
+        _exec_restart()
+
 
 if __name__ == '__main__':
     main()
@@ -12,6 +12,7 @@ from typing import List, Dict, Optional
 from telegram import Bot
 from telegram.constants import ParseMode
 from google_sheets import GoogleSheetsManager
+from bot_config import ADMIN_USER_IDS
 
 logger = logging.getLogger(__name__)
 
@@ -59,11 +60,13 @@ class BulkMessagingManager:
             Dict chứa kết quả gửi tin nhắn
         """
         try:
-            # Lấy danh sách khách hàng
+            # Lấy danh sách khách hàng (Google Sheets là I/O đồng bộ, chạy trong thread)
             if filter_type and filter_value:
-                customers = self.sheets_manager.get_customers_by_filter(filter_type, filter_value)
+                customers = await asyncio.to_thread(
+                    self.sheets_manager.get_customers_by_filter, filter_type, filter_value
+                )
             else:
-                customers = self.sheets_manager.get_all_customers()
+                customers = await asyncio.to_thread(self.sheets_manager.get_all_customers)
 
             if not customers:
                 return {
@@ -160,26 +163,8 @@ class BulkMessagingManager:
                     })
                     continue
 
-                # Kiểm tra xem user có phải admin không (bỏ qua admin)
-                if str(user_id) in ['6513278007', '7363247246', '7988655018']:
-                    logger.info(f"Bỏ qua admin user {user_id}")
-                    continue
-
-                # Kiểm tra và loại bỏ bot khác
-                username = customer.get('username', '').lower()
-                full_name = customer.get('full_name', '').lower()
-
-                # Danh sách từ khóa để nhận diện bot
-                bot_keywords = [
-                    'bot', 'anonymous', 'group', 'channel', 'telegram',
-                    'system', 'service', 'helper', 'assistant'
-                ]
-
-                # Kiểm tra username và full_name có chứa từ khóa bot không
-                is_bot = any(keyword in username or keyword in full_name for keyword in bot_keywords)
-
-                if is_bot:
-                    logger.info(f"Bỏ qua bot: {username} ({full_name})")
+                # Bỏ qua admin và bot khác
+                if self._should_skip_customer(customer):
                     continue
 
                 # Gửi tin nhắn
@@ -190,7 +175,7 @@ class BulkMessagingManager:
                 if success:
                     sent_count += 1
                     # Cập nhật trạng thái trong Google Sheets
-                    self.sheets_manager.update_customer_message_status(user_id, True)
+                    await asyncio.to_thread(self.sheets_manager.update_customer_message_status, user_id, True)
                     logger.info(f"✅ Đã gửi tin nhắn đến user {user_id}")
                 else:
                     failed_count += 1
@@ -237,6 +222,60 @@ class BulkMessagingManager:
             'batch_limit': max_messages_per_batch
         }
 
+    def _should_skip_customer(self, customer: Dict) -> bool:
+        """Kiểm tra khách hàng có phải admin hoặc bot (không gửi tin nhắn)"""
+        user_id = customer.get('user_id')
+
+        # Kiểm tra xem user có phải admin không (bỏ qua admin, danh sách lấy từ bot_config)
+        if str(user_id).isdigit() and int(user_id) in ADMIN_USER_IDS:
+            logger.info(f"Bỏ qua admin user {user_id}")
+            return True
+
+        # Kiểm tra và loại bỏ bot khác
+        username = customer.get('username', '').lower()
+        full_name = customer.get('full_name', '').lower()
+
+        # Danh sách từ khóa để nhận diện bot
+        bot_keywords = [
+            'bot', 'anonymous', 'group', 'channel', 'telegram',
+            'system', 'service', 'helper', 'assistant'
+        ]
+
+        # Kiểm tra username và full_name có chứa từ khóa bot không
+        is_bot = any(keyword in username or keyword in full_name for keyword in bot_keywords)
+
+        if is_bot:
+            logger.info(f"Bỏ qua bot: {username} ({full_name})")
+            return True
+
+        return False
+
+    def select_recipients(self, customers: List[Dict]) -> List[Dict]:
+        """Loại bỏ user_id trùng lặp, admin và bot khỏi danh sách khách hàng"""
+        recipients = []
+        seen_user_ids = set()
+
+        for customer in customers:
+            user_id = customer.get('user_id')
+            if not user_id or user_id in seen_user_ids:
+                continue
+            seen_user_ids.add(user_id)
+            if not self._should_skip_customer(customer):
+                recipients.append(customer)
+
+        return recipients
+
+    async def send_to_customer(self, customer: Dict, message_content: str):
+        """Gửi tin nhắn text đã tùy chỉnh đến một khách hàng (dùng cho hàng đợi gửi)
+
+        Lỗi (kể cả RetryAfter) được ném ra để hàng đợi tự thử lại và ghi log/trạng thái theo lô.
+        """
+        await self.bot.send_message(
+            chat_id=int(customer['user_id']),
+            text=self._personalize_message(message_content, customer),
+            parse_mode=ParseMode.HTML
+        )
+
     async def _send_single_message(
         self,
         user_id: str,
@@ -262,7 +301,8 @@ class BulkMessagingManager:
                 )
 
             # Ghi log tin nhắn đã gửi
-            self.sheets_manager.add_message_log(
+            await asyncio.to_thread(
+                self.sheets_manager.add_message_log,
                 user_id, message_content, 'bulk_message', 'sent'
             )
 
@@ -272,7 +312,8 @@ class BulkMessagingManager:
             logger.error(f"Lỗi gửi tin nhắn đến user {user_id}: {e}")
 
             # Ghi log lỗi
-            self.sheets_manager.add_message_log(
+            await asyncio.to_thread(
+                self.sheets_manager.add_message_log,
                 user_id, message_content, 'bulk_message', 'failed'
             )
 
@@ -15,6 +15,11 @@ class GoogleSheetsManager:
         self.service = None
         self.spreadsheet_id = bot_config.SPREADSHEET_ID
         self.worksheet_name = bot_config.WORKSHEET_NAME
+        # Cache danh sách khách hàng: (thời điểm lấy, dữ liệu)
+        self.customers_cache_ttl = 60
+        self._customers_cache = None
+        # Tên worksheet log đã xác nhận tồn tại (tránh gọi spreadsheets.get mỗi lần ghi log)
+        self._log_worksheet_ready = None
         self._authenticate()
 
     def _authenticate(self):
@@ -93,6 +98,10 @@ class GoogleSheetsManager:
         except Exception as e:
             print(f"❌ Lỗi tạo worksheet: {e}")
 
+    def invalidate_customers_cache(self):
+        """Xóa cache danh sách khách hàng (gọi sau khi ghi dữ liệu)"""
+        self._customers_cache = None
+
     def _execute_with_retry(self, func, *args, retries: int = 3, backoff: float = 1.0, **kwargs):
         """Thực thi request với cơ chế retry để chịu transient errors."""
         last_exc = None
@@ -162,6 +171,7 @@ class GoogleSheetsManager:
                 traceback.print_exc()
                 return False
 
+            self.invalidate_customers_cache()
             print(f"✅ Đã thêm khách hàng mới: {customer_data.get('full_name', 'Unknown')} (User ID: {user_id})")
             return True
 
@@ -170,6 +180,84 @@ class GoogleSheetsManager:
             traceback.print_exc()
             return False
 
+    def batch_add_customers(self, customers_data):
+        """Thêm/cập nhật nhiều khách hàng: một lần đọc cột A, một append và một batchUpdate"""
+        try:
+            if not self.service or not customers_data:
+                return False
+
+            self.create_worksheet_if_not_exists()
+
+            # Gộp theo user_id, giữ bản ghi mới nhất
+            latest = {}
+            for customer_data in customers_data:
+                user_id = str(customer_data.get('user_id', ''))
+                if user_id:
+                    latest[user_id] = customer_data
+
+            if not latest:
+                return False
+
+            result = self._execute_with_retry(
+                lambda: self.service.spreadsheets().values().get(
+                    spreadsheetId=self.spreadsheet_id,
+                    range=f"{self.worksheet_name}!A:A"
+                ).execute()
+            )
+            existing_rows = {}
+            for i, row in enumerate(result.get('values', [])[1:], 2):  # Bỏ qua header
+                if row and row[0]:
+                    existing_rows.setdefault(str(row[0]), i)
+
+            new_rows = []
+            update_data = []
+            for user_id, customer_data in latest.items():
+                row_data = [
+                    user_id,
+                    customer_data.get('username', ''),
+                    customer_data.get('full_name', ''),
+                    customer_data.get('time', datetime.now().strftime('%Y-%m-%d %H:%M:%S')),
+                    customer_data.get('action', ''),
+                    customer_data.get('chat_id', ''),
+                    customer_data.get('message_type', '')
+                ]
+                row_number = existing_rows.get(user_id)
+                if row_number:
+                    update_data.append({
+                        'range': f"{self.worksheet_name}!A{row_number}:G{row_number}",
+                        'values': [row_data]
+                    })
+                else:
+                    new_rows.append(row_data)
+
+            if new_rows:
+                self._execute_with_retry(
+                    lambda: self.service.spreadsheets().values().append(
+                        spreadsheetId=self.spreadsheet_id,
+                        range=f"{self.worksheet_name}!A:G",
+                        valueInputOption='RAW',
+                        insertDataOption='INSERT_ROWS',
+                        body={'values': new_rows}
+                    ).execute()
+                )
+
+            if update_data:
+                self._execute_with_retry(
+                    lambda: self.service.spreadsheets().values().batchUpdate(
+                        spreadsheetId=self.spreadsheet_id,
+                        body={'valueInputOption': 'RAW', 'data': update_data}
+                    ).execute()
+                )
+
+            self.invalidate_customers_cache()
+            print(f"✅ Đã lưu {len(new_rows)} khách hàng mới, cập nhật {len(update_data)} khách hàng")
+            return True
+
+        except Exception as e:
+            print(f"❌ Lỗi lưu khách hàng hàng loạt: {e}")
+            traceback.print_exc()
+            return False
+
     def _is_user_exists(self, user_id):
         """Kiểm tra xem user_id đã tồn tại chưa và trả về vị trí dòng"""
         try:
@@ -246,6 +334,7 @@ class GoogleSheetsManager:
                 traceback.print_exc()
                 return False
 
+            self.invalidate_customers_cache()
             print(f"✅ Đã cập nhật khách hàng: {customer_data.get('full_name', 'Unknown')} (User ID: {user_id})")
             return True
 
@@ -278,6 +367,7 @@ class GoogleSheetsManager:
                 traceback.print_exc()
                 return False
 
+            self.invalidate_customers_cache()
             return True
 
         except Exception as e:
@@ -426,11 +516,15 @@ class GoogleSheetsManager:
             return False
 
     def get_all_customers(self):
-        """Lấy danh sách tất cả khách hàng"""
+        """Lấy danh sách tất cả khách hàng (có cache trong customers_cache_ttl giây)"""
         try:
             if not self.service:
                 return None
 
+            cached = self._customers_cache
+            if cached and time.monotonic() - cached[0] < self.customers_cache_ttl:
+                return list(cached[1])
+
             range_name = f"{self.worksheet_name}!A:G"
             result = self.service.spreadsheets().values().get(
                 spreadsheetId=self.spreadsheet_id,
@@ -443,11 +537,18 @@ class GoogleSheetsManager:
                 return []
 
             customers = []
+            malformed_count = 0
             for i, row in enumerate(values[1:], 1):  # Bỏ qua header
                 if len(row) >= 3:  # Ít nhất có User ID, Username, Full Name
+                    # Chuẩn hóa user_id thành int ngay khi đọc
+                    try:
+                        user_id = int(row[0])
+                    except (TypeError, ValueError):
+                        malformed_count += 1
+                        continue
                     customers.append({
                         'row': i + 1,
-                        'user_id': row[0] if len(row) > 0 else '',
+                        'user_id': user_id,
                         'username': row[1] if len(row) > 1 else '',
                         'full_name': row[2] if len(row) > 2 else '',
                         'action': row[4] if len(row) > 4 else '',
@@ -456,7 +557,11 @@ class GoogleSheetsManager:
                         'message_type': row[6] if len(row) > 6 else ''
                     })
 
-            return customers
+            if malformed_count:
+                print(f"⚠️ Bỏ qua {malformed_count} dòng có User ID không hợp lệ")
+
+            self._customers_cache = (time.monotonic(), customers)
+            return list(customers)
 
         except Exception as e:
             print(f"❌ Lỗi lấy danh sách khách hàng: {e}")
@@ -499,7 +604,7 @@ class GoogleSheetsManager:
                 return False
 
             for customer in customers:
-                if customer.get('user_id') == str(user_id):
+                if str(customer.get('user_id')) == str(user_id):
                     row_number = customer['row']
 
                     # Cập nhật trạng thái tin nhắn
@@ -515,6 +620,7 @@ class GoogleSheetsManager:
                         body=body
                     ).execute()
 
+                    # Cột H không nằm trong A:G mà get_all_customers đọc nên không cần xóa cache
                     print(f"✅ Đã cập nhật trạng thái tin nhắn cho user {user_id}")
                     return True
 
@@ -524,43 +630,87 @@ class GoogleSheetsManager:
             print(f"❌ Lỗi cập nhật trạng thái tin nhắn: {e}")
             return False
 
-    def add_message_log(self, user_id, message_content, message_type='bulk_message', status='sent'):
-        """Ghi log tin nhắn đã gửi"""
+    def batch_update_message_status(self, user_ids, message_sent=True):
+        """Cập nhật trạng thái tin nhắn cho nhiều khách hàng trong một request"""
         try:
-            if not self.service:
+            if not self.service or not user_ids:
                 return False
 
-            # Tạo worksheet log nếu chưa có
-            log_worksheet = f"{self.worksheet_name}_Log"
+            customers = self.get_all_customers()
+            if not customers:
+                return False
 
-            # Kiểm tra worksheet log có tồn tại không
-            spreadsheet = self.service.spreadsheets().get(
-                spreadsheetId=self.spreadsheet_id
+            wanted = {str(user_id) for user_id in user_ids}
+            status_text = 'Đã gửi' if message_sent else 'Chưa gửi'
+            data = [
+                {
+                    'range': f"{self.worksheet_name}!H{customer['row']}",
+                    'values': [[status_text]]
+                }
+                for customer in customers
+                if str(customer.get('user_id')) in wanted
+            ]
+
+            if not data:
+                return False
+
+            self.service.spreadsheets().values().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'valueInputOption': 'RAW', 'data': data}
             ).execute()
 
-            log_exists = any(
-                sheet['properties']['title'] == log_worksheet
-                for sheet in spreadsheet['sheets']
-            )
+            print(f"✅ Đã cập nhật trạng thái tin nhắn cho {len(data)} user")
+            return True
 
-            if not log_exists:
-                # Tạo worksheet log mới
-                request = {
-                    'addSheet': {
-                        'properties': {
-                            'title': log_worksheet
-                        }
+        except Exception as e:
+            print(f"❌ Lỗi cập nhật trạng thái tin nhắn hàng loạt: {e}")
+            return False
+
+    def _ensure_log_worksheet(self):
+        """Tạo worksheet log nếu chưa có, trả về tên worksheet"""
+        log_worksheet = f"{self.worksheet_name}_Log"
+        if self._log_worksheet_ready == log_worksheet:
+            return log_worksheet
+
+        # Kiểm tra worksheet log có tồn tại không
+        spreadsheet = self.service.spreadsheets().get(
+            spreadsheetId=self.spreadsheet_id
+        ).execute()
+
+        log_exists = any(
+            sheet['properties']['title'] == log_worksheet
+            for sheet in spreadsheet['sheets']
+        )
+
+        if not log_exists:
+            # Tạo worksheet log mới
+            request = {
+                'addSheet': {
+                    'properties': {
+                        'title': log_worksheet
                     }
                 }
+            }
 
-                self.service.spreadsheets().batchUpdate(
-                    spreadsheetId=self.spreadsheet_id,
-                    body={'requests': [request]}
-                ).execute()
+            self.service.spreadsheets().batchUpdate(
+                spreadsheetId=self.spreadsheet_id,
+                body={'requests': [request]}
+            ).execute()
+
+            # Thêm header cho log
+            headers = ['Timestamp', 'User ID', 'Message Type', 'Message Content', 'Status']
+            self._add_log_row(log_worksheet, headers)
 
-                # Thêm header cho log
-                headers = ['Timestamp', 'User ID', 'Message Type', 'Message Content', 'Status']
-                self._add_log_row(log_worksheet, headers)
+        self._log_worksheet_ready = log_worksheet
+        return log_worksheet
+
+    def add_message_log(self, user_id, message_content, message_type='bulk_message', status='sent'):
+        """Ghi log tin nhắn đã gửi"""
+        try:
+            if not self.service:
+                return False
+
+            log_worksheet = self._ensure_log_worksheet()
 
             # Thêm log tin nhắn
             timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
@@ -573,12 +723,45 @@ class GoogleSheetsManager:
             print(f"❌ Lỗi ghi log tin nhắn: {e}")
             return False
 
+    def batch_add_message_logs(self, logs):
+        """Ghi nhiều log tin nhắn trong một request append
+
+        Mỗi phần tử của logs là dict với các key: user_id, message_content,
+        message_type (mặc định 'bulk_message'), status (mặc định 'sent').
+        """
+        try:
+            if not self.service or not logs:
+                return False
+
+            log_worksheet = self._ensure_log_worksheet()
+
+            timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+            rows = [
+                [
+                    timestamp,
+                    str(log.get('user_id')),
+                    log.get('message_type', 'bulk_message'),
+                    log.get('message_content', ''),
+                    log.get('status', 'sent')
+                ]
+                for log in logs
+            ]
+            return self._add_log_rows(log_worksheet, rows)
+
+        except Exception as e:
+            print(f"❌ Lỗi ghi log tin nhắn hàng loạt: {e}")
+            return False
+
     def _add_log_row(self, worksheet_name, row_data):
         """Thêm dòng vào worksheet log"""
+        return self._add_log_rows(worksheet_name, [row_data])
+
+    def _add_log_rows(self, worksheet_name, rows):
+        """Thêm nhiều dòng vào worksheet log"""
         try:
             range_name = f"{worksheet_name}!A:E"
             body = {
-                'values': [row_data]
+                'values': rows
             }
 
             self.service.spreadsheets().values().append(
@@ -3,16 +3,18 @@
 Utils package for ABCDBET Bot
 """
 
-from .rate_limiter import SmartRateLimiter, MessageValidator, smart_rate_limiter, message_validator
-from .cache import SmartCache, FunctionCache, CacheManager, cache_manager, default_cache, user_cache, session_cache
+from .rate_limiter import SmartRateLimiter, AsyncTokenBucket, MessageValidator, smart_rate_limiter, message_validator
+from .cache import SmartCache, TTLDict, FunctionCache, CacheManager, cache_manager, default_cache, user_cache, session_cache
 from .analytics import UserAnalytics, PerformanceAnalytics, user_analytics, performance_analytics
 
 __all__ = [
     'SmartRateLimiter',
+    'AsyncTokenBucket',
     'MessageValidator', 
     'smart_rate_limiter',
     'message_validator',
     'SmartCache',
+    'TTLDict',
     'FunctionCache',
     'CacheManager',
     'cache_manager',
@@ -6,6 +6,7 @@ Smart Cache System for ABCDBET Bot
 import time
 import asyncio
 from collections import OrderedDict
+from collections.abc import MutableMapping
 from typing import Dict, Any, Optional, Callable
 import logging
 
@@ -122,6 +123,46 @@ class SmartCache:
         }
 
 
+class TTLDict(MutableMapping):
+    """Dict với TTL và giới hạn kích thước (LRU), dùng cho state tạm theo user"""
+
+    def __init__(self, max_size: int = 10000, ttl: int = 86400):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict = OrderedDict()  # key -> (expiry_time, value)
+
+    def _purge_expired(self):
+        now = time.monotonic()
+        expired_keys = [key for key, (expiry, _) in self._data.items() if now > expiry]
+        for key in expired_keys:
+            del self._data[key]
+
+    def __getitem__(self, key):
+        expiry, value = self._data[key]
+        if time.monotonic() > expiry:
+            del self._data[key]
+            raise KeyError(key)
+        self._data.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __iter__(self):
+        self._purge_expired()
+        return iter(list(self._data))
+
+    def __len__(self):
+        self._purge_expired()
+        return len(self._data)
+
+
 class FunctionCache:
     """Decorator for caching function results"""
     
@@ -163,6 +163,36 @@ class SmartRateLimiter:
             del self.block_timestamps[user_id]
 
 
+class AsyncTokenBucket:
+    """Token bucket cho asyncio: tối đa `rate` lần gọi trong mỗi `period` giây"""
+
+    def __init__(self, rate: float, period: float = 1.0):
+        self.rate = rate
+        self.period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Chờ đến khi có token rồi lấy một token"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate / self.period)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        return False
+
+
 class MessageValidator:
     """Validator cho nội dung tin nhắn"""
     